@@ -0,0 +1,97 @@
+"""
+Discount engine benchmarks; ``scale`` is the number of active campaigns.
+
+Campaigns are loaded once and served from memory so the numbers isolate the
+pricing logic from ``get_active``, which has its own repository benchmark.
+The cached variant reprices the same basket, so it measures cache hits; the
+incremental one changes one line per run, like a scan.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.harness import Case
+from benchmarks.stores import campaign_store, product_prices
+from core.models.campaign import Campaign
+from core.models.receipt import Receipt, ReceiptItem
+from core.services.discount_service import DiscountService
+from core.services.pricing import IncrementalPricer, PricingCache
+from infra.db.database import Database
+from infra.repositories.campaign_sqlite_repository import SQLiteCampaignRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+BASKET_LINES = 10
+
+
+class _SnapshotCampaignRepository:
+    def __init__(self, campaigns: List[Campaign]) -> None:
+        self.campaigns = campaigns
+
+    def get_active(self) -> List[Campaign]:
+        return self.campaigns
+
+    def version(self) -> int:
+        return 0
+
+
+def apply_discounts(workdir: Path, scale: int, cached: bool = False) -> Case:
+    db_path = campaign_store(workdir, scale)
+    db = Database(str(db_path))
+    campaigns = SQLiteCampaignRepository(db).get_active()
+    service = DiscountService(
+        campaign_repository=_SnapshotCampaignRepository(campaigns),  # type: ignore[arg-type]
+        product_repository=SQLiteProductRepository(db),
+        cache=PricingCache() if cached else None,
+    )
+    basket = product_prices(db_path, BASKET_LINES)
+
+    def fresh_receipt() -> Receipt:
+        receipt = Receipt(
+            shift_id=basket[0][0],
+            products=[
+                ReceiptItem(product_id=product_id, quantity=3, unit_price=price)
+                for product_id, price in basket
+            ],
+        )
+        receipt.recalculate_totals()
+        return receipt
+
+    return Case(run=service.apply_discounts, setup=fresh_receipt)
+
+
+def reprice_one_line(workdir: Path, scale: int) -> Case:
+    db_path = campaign_store(workdir, scale)
+    db = Database(str(db_path))
+    campaigns = SQLiteCampaignRepository(db).get_active()
+    service = DiscountService(
+        campaign_repository=_SnapshotCampaignRepository(campaigns),  # type: ignore[arg-type]
+        product_repository=SQLiteProductRepository(db),
+        pricer=IncrementalPricer(),
+    )
+    basket = product_prices(db_path, BASKET_LINES)
+    receipt = Receipt(
+        shift_id=basket[0][0],
+        products=[
+            ReceiptItem(product_id=product_id, quantity=3, unit_price=price)
+            for product_id, price in basket
+        ],
+    )
+    service.apply_discounts(receipt)
+
+    def scan() -> Receipt:
+        line = receipt.products[0]
+        line.set_quantity(7 - line.quantity)
+        return receipt
+
+    return Case(run=service.apply_discounts, setup=scan)
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Case]] = {
+    "discount_service.apply_discounts": apply_discounts,
+    "discount_service.apply_discounts_cached": lambda workdir, scale: apply_discounts(
+        workdir, scale, cached=True
+    ),
+    "discount_service.apply_discounts_incremental": reprice_one_line,
+}
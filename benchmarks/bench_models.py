@@ -0,0 +1,201 @@
+"""
+Domain model benchmarks: construction time and memory per instance.
+
+The models are slotted dataclasses. To show what that buys, each model is
+compared with an otherwise identical twin that keeps a per-instance
+``__dict__``. ``scale`` is the number of receipts materialized, each shaped
+like a row of a shift report load: five discounted lines and a payment.
+
+``to_minor`` converts ``scale`` stored prices to minor units, as pricing
+does for every line, next to the Decimal rounding it avoids for them.
+
+Usage:
+    python -m benchmarks.bench_models
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+import tracemalloc
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Type
+from uuid import UUID
+
+from benchmarks.harness import Case
+from core.models.campaign import BuyNGetNRule, ComboRule, DiscountRule
+from core.models.ids import uuid7
+from core.models.money import to_major, to_minor
+from core.models.product import Product
+from core.models.receipt import (
+    Currency,
+    Discount,
+    ItemSold,
+    Payment,
+    Receipt,
+    ReceiptItem,
+)
+
+LINES_PER_RECEIPT = 5
+FOOTPRINT_SAMPLE = 10_000
+
+
+def unslotted(cls: Type[Any]) -> Type[Any]:
+    """Rebuild a slotted dataclass as a regular one with the same behavior."""
+    params = cls.__dataclass_params__
+    fields = []
+    for f in dataclasses.fields(cls):
+        options: Dict[str, Any] = {"init": f.init}
+        if f.default is not dataclasses.MISSING:
+            options["default"] = f.default
+        if f.default_factory is not dataclasses.MISSING:
+            options["default_factory"] = f.default_factory
+        fields.append((f.name, f.type, dataclasses.field(**options)))
+
+    methods = {
+        name: value
+        for name, value in vars(cls).items()
+        if callable(value) and not name.startswith("__") or name == "__post_init__"
+    }
+    return dataclasses.make_dataclass(
+        cls.__name__, fields, namespace=methods, frozen=params.frozen
+    )
+
+
+_Models = Tuple[Type[Any], Type[Any], Type[Any], Type[Any]]
+SLOTTED: _Models = (Receipt, ReceiptItem, Discount, Payment)
+UNSLOTTED: _Models = tuple(unslotted(cls) for cls in SLOTTED)  # type: ignore[assignment]
+
+
+def _build_receipts(models: _Models, count: int, ids: List[UUID]) -> List[Any]:
+    receipt_cls, item_cls, discount_cls, payment_cls = models
+    receipts = []
+    for _ in range(count):
+        receipt = receipt_cls(shift_id=ids[0])
+        receipt.products = [
+            item_cls(
+                product_id=ids[line],
+                quantity=2,
+                unit_price=3.5,
+                discounts=[discount_cls(ids[-1], "Promo", 0.7)],
+            )
+            for line in range(LINES_PER_RECEIPT)
+        ]
+        receipt.payments = [
+            payment_cls(
+                receipt_id=receipt.id,
+                payment_amount=40.0,
+                currency=Currency.GEL,
+                total_in_gel=40.0,
+                exchange_rate=1.0,
+            )
+        ]
+        receipts.append(receipt)
+    return receipts
+
+
+def _constructor(models: _Models) -> Callable[[Path, int], Case]:
+    def build(workdir: Path, scale: int) -> Case:
+        ids = [uuid7() for _ in range(LINES_PER_RECEIPT + 1)]
+        return Case(run=lambda _: _build_receipts(models, scale, ids))
+
+    return build
+
+
+def _samples() -> Dict[Type[Any], Tuple[Any, ...]]:
+    """Constructor arguments per model, shared so only the instances count."""
+    shared_id = uuid7()
+    return {
+        Product: (shared_id, "Product", 1.5),
+        Discount: (shared_id, "Promo", 0.5),
+        ReceiptItem: (shared_id, 2, 1.5),
+        Payment: (shared_id, 3.0, Currency.GEL, 3.0, 1.0),
+        Receipt: (shared_id,),
+        ItemSold: (shared_id, 3),
+        DiscountRule: (10.0, "product"),
+        BuyNGetNRule: ("a", 2, "b", 1),
+        ComboRule: ([], "fixed", 5.0),
+    }
+
+
+def footprint(factory: Callable[[], Any], count: int = FOOTPRINT_SAMPLE) -> float:
+    """Average bytes allocated per object built by ``factory``."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the objects is not part of their footprint
+    list_bytes = objects.__sizeof__()
+    return (after - before - list_bytes) / count
+
+
+def construction_time(factory: Callable[[], Any], count: int = 50_000) -> float:
+    started = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return (time.perf_counter() - started) / count
+
+
+def compare_models(
+    sample: int = FOOTPRINT_SAMPLE, timed: int = 50_000
+) -> List[Tuple[str, float, float, float, float]]:
+    """Per model: bytes and seconds per instance, unslotted then slotted."""
+    rows = []
+    for cls, args in _samples().items():
+        twin = unslotted(cls)
+        rows.append(
+            (
+                cls.__name__,
+                footprint(lambda: twin(*args), sample),
+                footprint(lambda: cls(*args), sample),
+                construction_time(lambda: twin(*args), timed),
+                construction_time(lambda: cls(*args), timed),
+            )
+        )
+    return rows
+
+
+def _to_minor(workdir: Path, scale: int) -> Case:
+    """``scale`` prices as stored, whole tetri, converted for pricing."""
+    prices = [to_major(minor) for minor in range(199, 199 + 37 * scale, 37)]
+    return Case(run=lambda _: [to_minor(price) for price in prices])
+
+
+def _to_minor_decimal(workdir: Path, scale: int) -> Case:
+    """The same prices through Decimal rounding, what the fast path skips."""
+    prices = [to_major(minor) for minor in range(199, 199 + 37 * scale, 37)]
+    return Case(
+        run=lambda _: [
+            int(Decimal(repr(price)).scaleb(2).to_integral_value(ROUND_HALF_UP))
+            for price in prices
+        ]
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Case]] = {
+    "models.build_receipts": _constructor(SLOTTED),
+    "models.build_receipts_unslotted": _constructor(UNSLOTTED),
+    "models.to_minor": _to_minor,
+    "models.to_minor_decimal": _to_minor_decimal,
+}
+
+
+def main() -> None:
+    print(
+        f"{'model':<15}{'dict B':>9}{'slots B':>9}{'saved':>8}"
+        f"{'dict us':>10}{'slots us':>10}"
+    )
+    for name, dict_bytes, slot_bytes, dict_s, slot_s in compare_models():
+        print(
+            f"{name:<15}{dict_bytes:>9.0f}{slot_bytes:>9.0f}"
+            f"{1 - slot_bytes / dict_bytes:>8.0%}"
+            f"{dict_s * 1e6:>10.2f}{slot_s * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Repository benchmarks; ``scale`` is the number of receipts, campaigns or
+products stored.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict
+
+from benchmarks.harness import Case
+from benchmarks.stores import (
+    campaign_store,
+    catalog_store,
+    first_row_id,
+    product_prices,
+    sales_store,
+)
+from core.models.receipt import ReceiptItem
+from infra.db.database import Database, serialize_id
+from infra.repositories.campaign_sqlite_repository import SQLiteCampaignRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from infra.repositories.report_sqlite_repository import SQLiteReportRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
+
+BASKET_LINES = 10
+
+
+def _report_repository(db: Database) -> SQLiteReportRepository:
+    return SQLiteReportRepository(
+        db, SQLiteReceiptRepository(db), SQLiteShiftRepository(db)
+    )
+
+
+def receipt_get(workdir: Path, scale: int) -> Case:
+    db_path = sales_store(workdir, scale)
+    repository = SQLiteReceiptRepository(Database(str(db_path)))
+    receipt_id = first_row_id(db_path, "receipts")
+    return Case(run=lambda _: repository.get(receipt_id))
+
+
+def receipt_update(workdir: Path, scale: int) -> Case:
+    db_path = sales_store(workdir, scale)
+    repository = SQLiteReceiptRepository(Database(str(db_path)))
+    receipt = repository.create(first_row_id(db_path, "shifts"))
+    for product_id, price in product_prices(db_path, BASKET_LINES):
+        receipt.products.append(
+            ReceiptItem(product_id=product_id, quantity=2, unit_price=price)
+        )
+    receipt.recalculate_totals()
+    return Case(run=lambda _: repository.update(receipt.id, receipt))
+
+
+def receipts_by_shift(workdir: Path, scale: int) -> Case:
+    db_path = sales_store(workdir, scale)
+    repository = SQLiteReceiptRepository(Database(str(db_path)))
+    shift_id = first_row_id(db_path, "shifts")
+    return Case(run=lambda _: repository.get_receipts_by_shift(shift_id))
+
+
+def campaigns_get_active(workdir: Path, scale: int) -> Case:
+    db_path = campaign_store(workdir, scale)
+    repository = SQLiteCampaignRepository(Database(str(db_path)))
+    return Case(run=lambda _: repository.get_active())
+
+
+def product_search(workdir: Path, scale: int) -> Case:
+    """A typeahead query: two words, the last one partly typed."""
+    repository = SQLiteProductRepository(Database(str(catalog_store(workdir, scale))))
+    return Case(run=lambda _: repository.search("product 0001", 20))
+
+
+def report_sales(workdir: Path, scale: int) -> Case:
+    repository = _report_repository(Database(str(sales_store(workdir, scale))))
+    return Case(run=lambda _: repository.generate_sales_report())
+
+
+def report_shift(workdir: Path, scale: int) -> Case:
+    db_path = sales_store(workdir, scale)
+    repository = _report_repository(Database(str(db_path)))
+    shift_id = first_row_id(db_path, "shifts")
+    return Case(run=lambda _: repository.generate_shift_report(shift_id))
+
+
+def report_z(workdir: Path, scale: int) -> Case:
+    db_path = sales_store(workdir, scale)
+    repository = _report_repository(Database(str(db_path)))
+    shift_id = first_row_id(db_path, "shifts")
+
+    def reopen_shift() -> None:
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE shifts SET status = 'open', closed_at = NULL WHERE id = ?",
+                (serialize_id(shift_id),),
+            )
+
+    return Case(
+        run=lambda _: repository.generate_z_report(shift_id),
+        setup=reopen_shift,
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Case]] = {
+    "receipt_repository.get": receipt_get,
+    "receipt_repository.update": receipt_update,
+    "receipt_repository.get_receipts_by_shift": receipts_by_shift,
+    "campaign_repository.get_active": campaigns_get_active,
+    "product_repository.search": product_search,
+    "report_repository.generate_sales_report": report_sales,
+    "report_repository.generate_shift_report": report_shift,
+    "report_repository.generate_z_report": report_z,
+}
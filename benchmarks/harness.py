@@ -0,0 +1,116 @@
+"""
+Timing, result storage and baseline comparison for the benchmark suite.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import sqlite3
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Case:
+    """A prepared benchmark: ``setup`` runs untimed before every ``run``."""
+
+    run: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    scale: int
+    runs: int
+    min_s: float
+    median_s: float
+    mean_s: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.scale}]"
+
+
+@dataclass
+class Regression:
+    key: str
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s if self.baseline_s else float("inf")
+
+
+def measure(
+    name: str,
+    scale: int,
+    case: Case,
+    min_time: float = 0.2,
+    min_runs: int = 3,
+    max_runs: int = 100,
+) -> BenchmarkResult:
+    """Time ``case`` until ``min_time`` has elapsed and ``min_runs`` are done."""
+    timings: List[float] = []
+    while len(timings) < max_runs and (
+        len(timings) < min_runs or sum(timings) < min_time
+    ):
+        arg = case.setup() if case.setup else None
+        started = time.perf_counter()
+        case.run(arg)
+        timings.append(time.perf_counter() - started)
+
+    return BenchmarkResult(
+        name=name,
+        scale=scale,
+        runs=len(timings),
+        min_s=min(timings),
+        median_s=statistics.median(timings),
+        mean_s=statistics.fmean(timings),
+    )
+
+
+def save_results(path: Path, results: List[BenchmarkResult]) -> None:
+    payload = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+        },
+        "results": {result.key: asdict(result) for result in results},
+    }
+    path.write_text(json.dumps(payload, indent=2))
+
+
+def load_results(path: Path) -> Dict[str, BenchmarkResult]:
+    payload = json.loads(path.read_text())
+    return {key: BenchmarkResult(**value) for key, value in payload["results"].items()}
+
+
+def compare(
+    current: List[BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    tolerance: float,
+) -> List[Regression]:
+    """Return results whose median is slower than baseline by over ``tolerance``."""
+    regressions: List[Regression] = []
+    for result in current:
+        previous = baseline.get(result.key)
+        if previous is None:
+            continue
+        if result.median_s > previous.median_s * (1 + tolerance):
+            regressions.append(
+                Regression(
+                    key=result.key,
+                    baseline_s=previous.median_s,
+                    current_s=result.median_s,
+                )
+            )
+    return regressions
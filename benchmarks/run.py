@@ -0,0 +1,103 @@
+"""
+Benchmark runner.
+
+Runs every benchmark at each requested scale, writes the results as JSON and,
+when a baseline file is given, fails if any benchmark got slower than the
+baseline by more than the tolerance.
+
+Usage:
+    python -m benchmarks.run --output baseline.json
+    python -m benchmarks.run --scales 10,1000,100000 --output current.json \\
+        --baseline baseline.json --tolerance 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks import bench_discounts, bench_models, bench_repositories
+from benchmarks.harness import (
+    BenchmarkResult,
+    Case,
+    compare,
+    load_results,
+    measure,
+    save_results,
+)
+
+BENCHMARKS: Dict[str, Callable[[Path, int], Case]] = {
+    **bench_repositories.BENCHMARKS,
+    **bench_discounts.BENCHMARKS,
+    **bench_models.BENCHMARKS,
+}
+
+
+def run_benchmarks(
+    workdir: Path,
+    scales: Sequence[int],
+    selected: Optional[Sequence[str]] = None,
+    min_time: float = 0.2,
+) -> List[BenchmarkResult]:
+    results: List[BenchmarkResult] = []
+    for name, build in BENCHMARKS.items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        for scale in scales:
+            # Repositories print diagnostics; keep them out of the report.
+            with open(os.devnull, "w") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    result = measure(name, scale, build(workdir, scale), min_time)
+            results.append(result)
+            print(
+                f"{result.key:<55}{result.median_s * 1000:>12.3f} ms"
+                f"{result.runs:>6} runs",
+                flush=True,
+            )
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--scales", default="10,1000")
+    parser.add_argument(
+        "--only", action="append", help="Run benchmarks whose name contains this."
+    )
+    parser.add_argument("--workdir", help="Reuse seeded databases from here.")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare against this JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(logging.WARNING)
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="pos-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    results = run_benchmarks(workdir, scales, args.only, args.min_time)
+    if args.output:
+        save_results(Path(args.output), results)
+
+    if args.baseline:
+        regressions = compare(
+            results, load_results(Path(args.baseline)), args.tolerance
+        )
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.key}: {regression.baseline_s * 1000:.3f} ms"
+                f" -> {regression.current_s * 1000:.3f} ms"
+                f" ({regression.ratio:.2f}x)"
+            )
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Seeded databases shared by the benchmarks, built once per scale.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import List, Tuple
+from uuid import UUID
+
+from core.models.money import to_major
+from infra.db.database import deserialize_id
+from runner.seed import SeedConfig, seed_store
+
+
+def sales_store(workdir: Path, receipts: int) -> Path:
+    """A store with one shift holding ``receipts`` paid receipts."""
+    db_path = workdir / f"sales-{receipts}.db"
+    if not db_path.exists():
+        seed_store(
+            str(db_path),
+            SeedConfig(
+                products=1_000,
+                campaigns=30,
+                days=1,
+                shifts_per_day=1,
+                receipts_per_shift=receipts,
+                seed=receipts,
+            ),
+        )
+    return db_path
+
+
+def campaign_store(workdir: Path, campaigns: int) -> Path:
+    """A store with ``campaigns`` active campaigns and no sales history."""
+    db_path = workdir / f"campaigns-{campaigns}.db"
+    if not db_path.exists():
+        seed_store(
+            str(db_path),
+            SeedConfig(
+                products=max(1_000, campaigns),
+                campaigns=campaigns,
+                active_campaign_ratio=1.0,
+                days=0,
+                seed=campaigns,
+            ),
+        )
+    return db_path
+
+
+def catalog_store(workdir: Path, products: int) -> Path:
+    """A store with ``products`` products and nothing else."""
+    db_path = workdir / f"catalog-{products}.db"
+    if not db_path.exists():
+        seed_store(
+            str(db_path),
+            SeedConfig(products=products, campaigns=0, days=0, seed=products),
+        )
+    return db_path
+
+
+def first_row_id(db_path: Path, table: str) -> UUID:
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(f"SELECT id FROM {table} ORDER BY rowid LIMIT 1").fetchone()
+    return deserialize_id(row[0])
+
+
+def product_prices(db_path: Path, limit: int) -> List[Tuple[UUID, float]]:
+    """Products referenced by the most campaign rules, so baskets hit promotions."""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT p.id, p.price, COUNT(r.product_id) AS hits
+            FROM products p
+            LEFT JOIN (
+                SELECT product_id FROM discount_rule_products
+                UNION ALL SELECT product_id FROM combo_rule_products
+                UNION ALL SELECT buy_product_id FROM buy_n_get_n_rules
+            ) r ON r.product_id = p.id
+            GROUP BY p.id
+            ORDER BY hits DESC, p.rowid
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    return [(deserialize_id(row[0]), to_major(row[1])) for row in rows]
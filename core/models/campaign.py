@@ -1,8 +1,9 @@
-import uuid
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import List, Optional, Union
 
+from core.models.ids import uuid7
+
 
 class CampaignType(Enum):
     DISCOUNT = "discount"
@@ -10,14 +11,14 @@ class CampaignType(Enum):
     COMBO = "combo"
 
 
-@dataclass
+@dataclass(slots=True)
 class Discount:
     campaign_id: str
     campaign_name: str
     discount_amount: float
 
 
-@dataclass
+@dataclass(slots=True)
 class DiscountRule:
     discount_value: float
     applies_to: str
@@ -25,7 +26,7 @@ class DiscountRule:
     min_amount: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BuyNGetNRule:
     buy_product_id: str
     buy_quantity: int
@@ -33,17 +34,17 @@ class BuyNGetNRule:
     get_quantity: int
 
 
-@dataclass
+@dataclass(slots=True)
 class ComboRule:
     product_ids: List[str]
     discount_type: str
     discount_value: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Campaign:
     name: str
     campaign_type: CampaignType
     rules: Union[DiscountRule, BuyNGetNRule, ComboRule]
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: str(uuid7()))
     is_active: bool = True
@@ -21,6 +21,15 @@ class ReceiptNotFoundError(POSException):
         )
 
 
+class ReceiptVersionConflictError(POSException):
+    def __init__(self, receipt_id: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Receipt with ID '{receipt_id}' was changed by another request.",
+            error_code="RECEIPT_VERSION_CONFLICT",
+        )
+
+
 class ReceiptStatusError(POSException):
     def __init__(self, receipt_status: str, action: str) -> None:
         super().__init__(
@@ -39,6 +48,15 @@ class InsufficientPaymentError(POSException):
         )
 
 
+class IdempotencyKeyReusedError(POSException):
+    def __init__(self, key: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Idempotency key '{key}' was already used for another payment.",
+            error_code="IDEMPOTENCY_KEY_REUSED",
+        )
+
+
 class ProductNotFoundError(POSException):
     def __init__(self, product_id: str) -> None:
         super().__init__(
@@ -48,6 +66,33 @@ class ProductNotFoundError(POSException):
         )
 
 
+class ProductCodeNotFoundError(POSException):
+    def __init__(self, code: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No product has the code '{code}'.",
+            error_code="PRODUCT_CODE_NOT_FOUND",
+        )
+
+
+class ProductCodeConflictError(POSException):
+    def __init__(self, code: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Code '{code}' already belongs to another product.",
+            error_code="PRODUCT_CODE_CONFLICT",
+        )
+
+
+class ImportFormatError(POSException):
+    def __init__(self, import_format: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported import format '{import_format}'.",
+            error_code="INVALID_IMPORT_FORMAT",
+        )
+
+
 class ExchangeRateNotFoundError(POSException):
     def __init__(self, from_currency: str, to_currency: str) -> None:
         super().__init__(
@@ -153,6 +198,15 @@ class ShiftReportDoesntExistError(POSException):
         )
 
 
+class ReportTimeoutError(POSException):
+    def __init__(self, report: str, timeout: float) -> None:
+        super().__init__(
+            detail=f"The {report} report did not finish within {timeout:g} seconds",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            error_code="REPORT_TIMEOUT",
+        )
+
+
 class PaymentNotFoundException(HTTPException):
     """Exception raised when a payment is not found."""
 
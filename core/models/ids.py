@@ -0,0 +1,50 @@
+"""
+Time-ordered identifiers.
+
+New rows get UUIDv7 ids (RFC 9562): a 48-bit Unix millisecond timestamp
+followed by random bits, so ids generated later sort later and inserts land
+at the end of the primary key index instead of at random pages.
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+_RANDOM_BITS = 74
+_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+
+def uuid7(
+    unix_ms: Optional[int] = None, random_bits: Optional[int] = None
+) -> uuid.UUID:
+    """
+    Generate a UUIDv7.
+    Without arguments ids are strictly increasing within the process: the
+    random part is incremented when the clock has not moved. Passing both
+    arguments builds the id deterministically, e.g. for seeded test data.
+    """
+    global _last_ms, _last_random
+
+    if unix_ms is None or random_bits is None:
+        with _lock:
+            unix_ms = time.time_ns() // 1_000_000
+            random_bits = int.from_bytes(os.urandom(10)) >> (80 - _RANDOM_BITS)
+            if unix_ms <= _last_ms:
+                unix_ms = _last_ms
+                random_bits = _last_random + 1
+                if random_bits >> _RANDOM_BITS:
+                    unix_ms, random_bits = unix_ms + 1, 0
+            _last_ms, _last_random = unix_ms, random_bits
+
+    value = (
+        (unix_ms & (1 << 48) - 1) << 80
+        | 0x7 << 76
+        | (random_bits >> 62 & 0xFFF) << 64
+        | 0b10 << 62
+        | random_bits & (1 << 62) - 1
+    )
+    return uuid.UUID(int=value)
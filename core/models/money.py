@@ -0,0 +1,65 @@
+"""
+Fixed-point money.
+
+Amounts are stored and computed as integer minor units (tetri, cents); the
+models and the API keep exposing major units. Every currency the system
+handles has two decimal places.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Sequence
+
+MINOR_UNITS = 100
+# Below this a float is off by far less than a minor unit, so one that
+# equals a whole number of minor units converts with float arithmetic
+EXACT_BELOW = 1e12
+
+
+def to_minor(amount: float) -> int:
+    """
+    Convert a major-unit amount to minor units, rounding half away from zero.
+    Rounds the shortest decimal form of the float, so 1.005 becomes 101.
+    Amounts already a whole number of minor units, such as prices read back
+    from storage, skip Decimal; only the rest need rounding decided.
+    """
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    if -EXACT_BELOW < amount < EXACT_BELOW:
+        minor = round(amount * MINOR_UNITS)
+        if minor / MINOR_UNITS == amount:
+            return minor
+    return int(Decimal(repr(amount)).scaleb(2).to_integral_value(ROUND_HALF_UP))
+
+
+def to_major(minor: int) -> float:
+    """Convert minor units back to a major-unit amount."""
+    return minor / MINOR_UNITS
+
+
+def percent_of(minor: int, percent: float) -> int:
+    """
+    Take ``percent`` percent of ``minor``, rounding half up.
+    The percentage is resolved to basis points so the result is exact.
+    """
+    basis_points = round(percent * 100)
+    return (minor * basis_points + 5_000) // 10_000
+
+
+def allocate(total: int, weights: Sequence[int]) -> List[int]:
+    """
+    Split ``total`` proportionally to ``weights``.
+    Uses largest remainders, so the shares always add up to ``total``.
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        return [0] * len(weights)
+
+    shares = [total * weight // weight_sum for weight in weights]
+    by_remainder = sorted(
+        range(len(weights)),
+        key=lambda i: (total * weights[i]) % weight_sum,
+        reverse=True,
+    )
+    for i in by_remainder[: total - sum(shares)]:
+        shares[i] += 1
+    return shares
@@ -2,8 +2,17 @@ from dataclasses import dataclass
 from uuid import UUID
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Product:
     id: UUID
     name: str
     price: float
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """A product as delivered by a catalog sync, keyed by its SKU."""
+
+    sku: str
+    name: str
+    price: float
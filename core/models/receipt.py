@@ -1,7 +1,10 @@
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List
+from typing import Dict, List, Optional
+
+from core.models.ids import uuid7
+from core.models.money import to_major, to_minor
 
 
 class ReceiptStatus(Enum):
@@ -21,14 +24,14 @@ class PaymentStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Discount:
     campaign_id: uuid.UUID
     campaign_name: str
     discount_amount: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiptItem:
     product_id: uuid.UUID
     quantity: int
@@ -38,13 +41,19 @@ class ReceiptItem:
     final_price: float = field(init=False)
 
     def __post_init__(self) -> None:
-        self.total_price = self.unit_price * self.quantity
-        self.final_price = self.total_price - sum(
-            d.discount_amount for d in self.discounts
+        total = to_minor(self.unit_price) * self.quantity
+        self.total_price = to_major(total)
+        self.final_price = to_major(
+            total - sum(to_minor(d.discount_amount) for d in self.discounts)
         )
 
+    def set_quantity(self, quantity: int) -> None:
+        """Change the quantity and reprice the line in minor units."""
+        self.quantity = quantity
+        self.total_price = to_major(to_minor(self.unit_price) * quantity)
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Payment:
     """Represents a payment in the system."""
 
@@ -54,7 +63,7 @@ class Payment:
     total_in_gel: float
     exchange_rate: float
     status: PaymentStatus = PaymentStatus.PENDING
-    id: uuid.UUID = field(default_factory=uuid.uuid4)
+    id: uuid.UUID = field(default_factory=uuid7)
 
     def update_status(self, new_status: PaymentStatus) -> "Payment":
         """Create a new Payment object with an updated status."""
@@ -69,10 +78,10 @@ class Payment:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Receipt:
     shift_id: uuid.UUID
-    id: uuid.UUID = field(default_factory=lambda: uuid.uuid4())
+    id: uuid.UUID = field(default_factory=uuid7)
     status: ReceiptStatus = ReceiptStatus.OPEN
     products: List[ReceiptItem] = field(default_factory=list)
     payments: List[Payment] = field(default_factory=list)
@@ -80,28 +89,118 @@ class Receipt:
     subtotal: float = 0
     discount_amount: float = 0
     total: float = 0
+    # Bumped on every stored change; writes based on an older one are refused
+    version: int = 0
+    # product_id -> position in ``products``; rebuilt when the list changes
+    _line_index: Dict[uuid.UUID, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_lines: Optional[List[ReceiptItem]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    def find_item(self, product_id: uuid.UUID) -> Optional[ReceiptItem]:
+        """
+        Return the line for ``product_id``, or None. Hits are O(1); a miss,
+        or a hit on a line that has since been replaced, rebuilds the index
+        from ``products`` and looks again, so changes made directly to the
+        list are always seen.
+        """
+        rebuilt = self._refresh()
+        item = self._indexed_item(product_id)
+        if item is None and not rebuilt:
+            # The list may have been edited in place since it was indexed
+            self._reindex()
+            item = self._indexed_item(product_id)
+        return item
+
+    def add_item(self, item: ReceiptItem) -> None:
+        """Append a line and index it."""
+        self._refresh()
+        self.products.append(item)
+        self._line_index.setdefault(item.product_id, len(self.products) - 1)
+        self._indexed_count = len(self.products)
+
+    def remove_item(self, product_id: uuid.UUID) -> Optional[ReceiptItem]:
+        """Remove the line for ``product_id`` and return it, or None."""
+        item = self.find_item(product_id)
+        if item is None:
+            return None
+        self.products.pop(self._line_index[product_id])
+        self._reindex()
+        return item
+
+    def _indexed_item(self, product_id: uuid.UUID) -> Optional[ReceiptItem]:
+        """The indexed line for ``product_id``, if it is still that product's."""
+        position = self._line_index.get(product_id)
+        if position is None or position >= len(self.products):
+            return None
+        item = self.products[position]
+        return item if item.product_id == product_id else None
+
+    def _refresh(self) -> bool:
+        """Reindex if ``products`` was replaced or resized; whether it was."""
+        if self._indexed_lines is self.products and self._indexed_count == len(
+            self.products
+        ):
+            return False
+        self._reindex()
+        return True
+
+    def _reindex(self) -> None:
+        self._line_index = {}
+        for position, item in enumerate(self.products):
+            self._line_index.setdefault(item.product_id, position)
+        self._indexed_lines = self.products
+        self._indexed_count = len(self.products)
+
+    def settle(
+        self, amount: float, currency: Currency, exchange_rate: float
+    ) -> Payment:
+        """
+        Record a payment against the total. It completes, and closes the
+        receipt, when it covers the total; otherwise it fails.
+        """
+        covered = round(to_minor(amount) * exchange_rate) >= to_minor(self.total)
+        payment = Payment(
+            receipt_id=self.id,
+            payment_amount=amount,
+            currency=currency,
+            total_in_gel=self.total,
+            exchange_rate=exchange_rate,
+            status=PaymentStatus.COMPLETED if covered else PaymentStatus.FAILED,
+        )
+        self.payments.append(payment)
+        if covered:
+            self.status = ReceiptStatus.CLOSED
+        return payment
 
     def recalculate_totals(self) -> None:
-        self.subtotal = sum(item.total_price for item in self.products)
-        self.discount_amount = sum(
-            sum(d.discount_amount for d in item.discounts) for item in self.products
-        ) + sum(m.discount_amount for m in self.discounts)
-        self.total = self.subtotal - self.discount_amount
-
-
-@dataclass
+        subtotal = sum(to_minor(item.total_price) for item in self.products)
+        discount_amount = sum(
+            to_minor(d.discount_amount)
+            for item in self.products
+            for d in item.discounts
+        ) + sum(to_minor(m.discount_amount) for m in self.discounts)
+        self.subtotal = to_major(subtotal)
+        self.discount_amount = to_major(discount_amount)
+        self.total = to_major(subtotal - discount_amount)
+
+
+@dataclass(slots=True)
 class ItemSold:
     product_id: uuid.UUID
     quantity: int
 
 
-@dataclass
+@dataclass(slots=True)
 class RevenueByCurrency:
     currency: Currency
     amount: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     receipt_id: uuid.UUID
     base_currency: Currency
@@ -5,7 +5,7 @@ from uuid import UUID
 from core.models.receipt import ItemSold, RevenueByCurrency
 
 
-@dataclass
+@dataclass(slots=True)
 class ShiftReport:
     shift_id: UUID
     receipt_count: int
@@ -13,7 +13,7 @@ class ShiftReport:
     revenue_by_currency: List[RevenueByCurrency]
 
 
-@dataclass
+@dataclass(slots=True)
 class SalesReport:
     total_items_sold: int
     total_receipts: int
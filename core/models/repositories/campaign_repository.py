@@ -16,3 +16,5 @@ class CampaignRepository(Protocol):
     def deactivate(self, campaign_id: UUID) -> bool: ...
 
     def get_active(self) -> List[Campaign]: ...
+
+    def version(self) -> int: ...
@@ -1,7 +1,7 @@
-from typing import List, Optional, Protocol
+from typing import Dict, Iterator, List, Mapping, Optional, Protocol, Sequence
 from uuid import UUID
 
-from core.models.product import Product
+from core.models.product import CatalogEntry, Product
 
 
 class ProductRepository(Protocol):
@@ -14,5 +14,35 @@ class ProductRepository(Protocol):
     def get_all(self) -> List[Product]:
         pass
 
+    def get_page(self, after: Optional[UUID], limit: int) -> List[Product]:
+        pass
+
+    def iter_all(self) -> Iterator[Product]:
+        pass
+
+    def search(self, query: str, limit: int) -> List[Product]:
+        pass
+
+    def get_by_code(self, code: str) -> Optional[Product]:
+        pass
+
+    def get_codes(self, product_id: UUID) -> List[str]:
+        pass
+
+    def get_all_codes(self) -> Dict[str, UUID]:
+        pass
+
+    def add_codes(self, product_id: UUID, codes: Sequence[str]) -> None:
+        pass
+
     def update_price(self, product_id: UUID, price: float) -> Optional[Product]:
         pass
+
+    def update_prices(self, prices: Mapping[UUID, float]) -> int:
+        pass
+
+    def upsert_many(self, entries: Sequence[CatalogEntry]) -> None:
+        pass
+
+    def version(self) -> int:
+        pass
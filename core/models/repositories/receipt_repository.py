@@ -1,7 +1,7 @@
-from typing import List, Protocol
+from typing import List, Optional, Protocol, Tuple
 from uuid import UUID
 
-from core.models.receipt import Payment, Receipt, ReceiptStatus
+from core.models.receipt import Currency, Payment, Receipt, ReceiptStatus
 
 
 class ReceiptRepository(Protocol):
@@ -13,12 +13,24 @@ class ReceiptRepository(Protocol):
         """Get receipt by ID"""
         pass
 
-    def update_status(self, receipt_id: UUID, status: ReceiptStatus) -> Receipt:
-        """Update receipt status"""
+    def update_status(
+        self,
+        receipt_id: UUID,
+        status: ReceiptStatus,
+        expected_version: Optional[int] = None,
+    ) -> Receipt:
+        """Update receipt status, if it is still at ``expected_version``"""
         pass
 
-    def add_payment(self, receipt_id: UUID, payment: Payment) -> Receipt:
-        """Add payment to receipt"""
+    def add_payment(
+        self,
+        receipt_id: UUID,
+        amount: float,
+        currency: Currency,
+        exchange_rate: float,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[Tuple[Payment, Receipt]]:
+        """Pay a receipt; None if it is already closed"""
         pass
 
     def get_receipts_by_shift(self, shift_id: UUID) -> List[Receipt]:
@@ -26,4 +38,5 @@ class ReceiptRepository(Protocol):
         pass
 
     def update(self, receipt_id: UUID, updated_receipt: Receipt) -> Receipt:
+        """Store the receipt, if it is still at ``updated_receipt.version``"""
         pass
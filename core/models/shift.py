@@ -11,7 +11,7 @@ class ShiftStatus(str, Enum):
     CLOSED = "closed"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Shift:
     id: UUID
     status: ShiftStatus = ShiftStatus.OPEN
@@ -0,0 +1,100 @@
+"""
+In-process keyed locking.
+
+``KeyedLock`` hands out one asyncio lock per key, so work on the same key runs
+one at a time, in arrival order, while different keys never wait on each
+other. A key's lock exists only while someone holds or waits for it; the
+last one out removes it, so the table stays as small as the number of keys
+in use at that moment. Wait times are recorded for every acquisition.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Hashable
+
+
+@dataclass(frozen=True, slots=True)
+class LockStats:
+    """Counters since start; waits are in seconds."""
+
+    acquisitions: int
+    contended: int
+    total_wait: float
+    max_wait: float
+    active_keys: int
+    waiting: int
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.acquisitions if self.acquisitions else 0.0
+
+
+@dataclass(slots=True)
+class _Entry:
+    lock: asyncio.Lock
+    users: int = 0
+
+
+class KeyedLock:
+    """
+    One lock per key, created on first use and dropped when idle.
+    Must be used from a single event loop; that loop is what makes the
+    bookkeeping safe without a lock of its own.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._acquisitions = 0
+        self._contended = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._waiting = 0
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """Hold the lock for ``key`` for the duration of the block."""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Entry(asyncio.Lock())
+        entry.users += 1
+        contended = entry.lock.locked()
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            self._release_entry(key, entry)
+            raise
+        finally:
+            self._waiting -= 1
+
+        wait = time.perf_counter() - started
+        self._acquisitions += 1
+        self._contended += contended
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        try:
+            yield
+        finally:
+            entry.lock.release()
+            self._release_entry(key, entry)
+
+    def stats(self) -> LockStats:
+        return LockStats(
+            acquisitions=self._acquisitions,
+            contended=self._contended,
+            total_wait=self._total_wait,
+            max_wait=self._max_wait,
+            active_keys=len(self._entries),
+            waiting=self._waiting,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _release_entry(self, key: Hashable, entry: _Entry) -> None:
+        entry.users -= 1
+        if entry.users == 0:
+            del self._entries[key]
@@ -0,0 +1,485 @@
+"""
+Basket pricing.
+
+``price_basket`` is a pure function from basket lines and a snapshot of the
+active campaigns to a priced result. It never changes the lines it is given,
+so pricing the same basket any number of times gives the same answer.
+Amounts are computed in integer minor units.
+
+Because pricing is pure, results can be memoized: ``PricingCache`` keeps the
+most recently used ones keyed by basket fingerprint and campaign version.
+
+Baskets usually change one line at a time. ``IncrementalPricer`` keeps the
+pricing state of recent baskets over a ``CampaignIndex`` and, when a basket
+changes, re-evaluates only the campaigns that mention a changed product. The
+result is the same as pricing the basket from scratch.
+"""
+
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, cast
+from uuid import UUID
+
+from core.models.campaign import (
+    BuyNGetNRule,
+    Campaign,
+    CampaignType,
+    ComboRule,
+    DiscountRule,
+)
+from core.models.money import allocate, percent_of, to_major, to_minor
+from core.models.receipt import Discount, ReceiptItem
+
+
+@dataclass(frozen=True, slots=True)
+class PricedLine:
+    product_id: UUID
+    quantity: int
+    total_price: int
+    discount: Optional[Discount] = None
+
+    @property
+    def final_price(self) -> int:
+        if self.discount is None:
+            return self.total_price
+        return self.total_price - to_minor(self.discount.discount_amount)
+
+
+@dataclass(frozen=True, slots=True)
+class PricedBasket:
+    """Pricing of a basket; amounts are in minor units."""
+
+    lines: Tuple[PricedLine, ...]
+    receipt_discount: Optional[Discount]
+    subtotal: int
+    discount_amount: int
+
+    @property
+    def total(self) -> int:
+        return self.subtotal - self.discount_amount
+
+
+# Discounts offered by campaigns, keyed by campaign position
+_Offers = Dict[int, Discount]
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+def price_basket(
+    lines: Sequence[ReceiptItem], campaigns: Sequence[Campaign]
+) -> PricedBasket:
+    """
+    Price ``lines`` under ``campaigns``.
+    Each line gets the largest discount offered for its product and the
+    basket gets the largest receipt-level discount; on ties the campaign
+    that comes first wins.
+    """
+    by_product = _by_product(lines)
+    subtotal = _subtotal(lines)
+
+    offers: Dict[UUID, _Offers] = {}
+    receipt_offers: _Offers = {}
+    for position, campaign in enumerate(campaigns):
+        for product_id, discount in _product_offers(campaign, by_product):
+            offers.setdefault(product_id, {})[position] = discount
+        receipt_discount = _receipt_offer(campaign, subtotal)
+        if receipt_discount is not None:
+            receipt_offers[position] = receipt_discount
+
+    best = {
+        product_id: _best(product_offers)
+        for product_id, product_offers in offers.items()
+    }
+    return _assemble(lines, best, _best(receipt_offers), subtotal)
+
+
+def basket_fingerprint(lines: Sequence[ReceiptItem]) -> bytes:
+    """Digest of the (product_id, quantity, unit price) lines, in order."""
+    digest = hashlib.blake2b(digest_size=16)
+    for line in lines:
+        digest.update(line.product_id.bytes)
+        digest.update(line.quantity.to_bytes(8, "little", signed=True))
+        digest.update(to_minor(line.unit_price).to_bytes(8, "little", signed=True))
+    return digest.digest()
+
+
+class PricingCache:
+    """Thread-safe LRU cache of priced baskets with hit and miss counters."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Tuple[int, bytes], PricedBasket] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_price(
+        self,
+        lines: Sequence[ReceiptItem],
+        campaign_version: int,
+        price: Callable[[], PricedBasket],
+    ) -> PricedBasket:
+        """
+        Return the cached pricing of ``lines`` under ``campaign_version``.
+        On a miss ``price`` is called and its result kept.
+        """
+        key = (campaign_version, basket_fingerprint(lines))
+        with self._lock:
+            priced = self._entries.get(key)
+            if priced is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return priced
+            self.misses += 1
+
+        # Priced outside the lock; two threads may both price a new basket
+        priced = price()
+        with self._lock:
+            self._entries[key] = priced
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return priced
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+class CampaignIndex:
+    """
+    A campaign snapshot indexed for incremental pricing.
+    Product-level campaigns are listed under every product they mention;
+    receipt-level ones are sorted by threshold so the campaigns a subtotal
+    qualifies for are found by bisection.
+    """
+
+    def __init__(self, campaigns: Sequence[Campaign]) -> None:
+        self.campaigns = tuple(campaigns)
+        self._by_product: Dict[UUID, List[int]] = {}
+        thresholds: List[Tuple[int, int, float]] = []
+        for position, campaign in enumerate(self.campaigns):
+            for product_id in _rule_products(campaign):
+                self._by_product.setdefault(product_id, []).append(position)
+            threshold = _receipt_threshold(campaign)
+            if threshold is not None:
+                rule = cast(DiscountRule, campaign.rules)
+                thresholds.append((threshold, position, rule.discount_value))
+        thresholds.sort()
+        self._thresholds = [threshold for threshold, _, _ in thresholds]
+        self._receipt_rules = [(position, value) for _, position, value in thresholds]
+
+    def rules_for(self, product_id: UUID) -> Sequence[int]:
+        """Positions of the campaigns that mention ``product_id``."""
+        return self._by_product.get(product_id, ())
+
+    def receipt_discount(self, subtotal: int) -> Optional[Discount]:
+        """The best receipt-level discount among those ``subtotal`` qualifies for."""
+        best_position, best_amount = -1, -1
+        for position, value in self._receipt_rules[
+            : bisect_right(self._thresholds, subtotal)
+        ]:
+            amount = min(percent_of(subtotal, value), subtotal)
+            if amount > best_amount or (
+                amount == best_amount and position < best_position
+            ):
+                best_position, best_amount = position, amount
+        if best_position < 0:
+            return None
+        return _offer(self.campaigns[best_position], best_amount)
+
+
+class BasketPricing:
+    """
+    Pricing state of one basket over a campaign index.
+    ``update`` compares the new lines with the last ones and re-evaluates
+    only the campaigns mentioning a product whose line changed.
+    """
+
+    def __init__(self, index: CampaignIndex) -> None:
+        self.index = index
+        self.evaluations = 0
+        self._lines: Dict[UUID, Tuple[int, int]] = {}
+        self._offers: Dict[UUID, _Offers] = {}
+        self._targets: Dict[int, List[UUID]] = {}
+        self._best: Dict[UUID, Optional[Discount]] = {}
+
+    def update(self, lines: Sequence[ReceiptItem]) -> PricedBasket:
+        by_product = _by_product(lines)
+        current = {
+            product_id: (line.quantity, to_minor(line.unit_price))
+            for product_id, line in by_product.items()
+        }
+        changed = {
+            product_id
+            for product_id, line in current.items()
+            if self._lines.get(product_id) != line
+        }
+        changed.update(self._lines.keys() - current.keys())
+        self._lines = current
+
+        affected = {
+            position
+            for product_id in changed
+            for position in self.index.rules_for(product_id)
+        }
+        touched: Set[UUID] = set()
+        for position in affected:
+            touched.update(self._evaluate(position, by_product))
+        for product_id in touched:
+            offers = self._offers.get(product_id)
+            if offers:
+                self._best[product_id] = _best(offers)
+            else:
+                self._offers.pop(product_id, None)
+                self._best.pop(product_id, None)
+
+        subtotal = _subtotal(lines)
+        receipt_discount = self.index.receipt_discount(subtotal)
+        return _assemble(lines, self._best, receipt_discount, subtotal)
+
+    def _evaluate(
+        self, position: int, by_product: Dict[UUID, ReceiptItem]
+    ) -> List[UUID]:
+        """Replace one campaign's offers; returns the products affected."""
+        self.evaluations += 1
+        previous = self._targets.pop(position, [])
+        for product_id in previous:
+            self._offers[product_id].pop(position, None)
+
+        campaign = self.index.campaigns[position]
+        targets = []
+        for product_id, discount in _product_offers(campaign, by_product):
+            self._offers.setdefault(product_id, {})[position] = discount
+            targets.append(product_id)
+        if targets:
+            self._targets[position] = targets
+        return previous + targets
+
+
+class IncrementalPricer:
+    """
+    Prices baskets incrementally, keeping the state of the most recently
+    priced ones. The campaign index is rebuilt, and all state dropped, when
+    the campaign version changes.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._index: Optional[Tuple[int, CampaignIndex]] = None
+        self._baskets: OrderedDict[UUID, BasketPricing] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def price(
+        self,
+        basket_id: UUID,
+        lines: Sequence[ReceiptItem],
+        campaign_version: int,
+        campaigns: Callable[[], Sequence[Campaign]],
+    ) -> PricedBasket:
+        with self._lock:
+            if self._index is None or self._index[0] != campaign_version:
+                self._index = (campaign_version, CampaignIndex(campaigns()))
+                self._baskets.clear()
+
+            state = self._baskets.get(basket_id)
+            if state is None:
+                state = self._baskets[basket_id] = BasketPricing(self._index[1])
+                while len(self._baskets) > self.maxsize:
+                    self._baskets.popitem(last=False)
+            else:
+                self._baskets.move_to_end(basket_id)
+            return state.update(lines)
+
+
+def _by_product(lines: Sequence[ReceiptItem]) -> Dict[UUID, ReceiptItem]:
+    by_product: Dict[UUID, ReceiptItem] = {}
+    for line in lines:
+        by_product.setdefault(line.product_id, line)
+    return by_product
+
+
+def _subtotal(lines: Sequence[ReceiptItem]) -> int:
+    return sum(to_minor(line.unit_price) * line.quantity for line in lines)
+
+
+def _best(offers: _Offers) -> Optional[Discount]:
+    """The largest discount; on ties the earliest campaign's."""
+    if not offers:
+        return None
+    position = max(offers, key=lambda p: (offers[p].discount_amount, -p))
+    return offers[position]
+
+
+def _assemble(
+    lines: Sequence[ReceiptItem],
+    best: Dict[UUID, Optional[Discount]],
+    receipt_discount: Optional[Discount],
+    subtotal: int,
+) -> PricedBasket:
+    priced = tuple(
+        PricedLine(
+            product_id=line.product_id,
+            quantity=line.quantity,
+            total_price=to_minor(line.unit_price) * line.quantity,
+            discount=best.get(line.product_id),
+        )
+        for line in lines
+    )
+    discount_amount = sum(line.total_price - line.final_price for line in priced)
+    if receipt_discount is not None:
+        discount_amount += to_minor(receipt_discount.discount_amount)
+
+    return PricedBasket(
+        lines=priced,
+        receipt_discount=receipt_discount,
+        subtotal=subtotal,
+        discount_amount=discount_amount,
+    )
+
+
+def _product_id(value: str) -> Optional[UUID]:
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+def _line(
+    by_product: Dict[UUID, ReceiptItem], product_id: str
+) -> Optional[ReceiptItem]:
+    """Look up a rule's product id among the basket lines."""
+    key = _product_id(product_id)
+    return None if key is None else by_product.get(key)
+
+
+def _rule_products(campaign: Campaign) -> List[UUID]:
+    """The products whose lines a product-level campaign depends on."""
+    if campaign.campaign_type == CampaignType.DISCOUNT:
+        rule = cast(DiscountRule, campaign.rules)
+        ids = rule.product_ids if rule.applies_to == "product" else []
+    elif campaign.campaign_type == CampaignType.BUY_N_GET_N:
+        bogo = cast(BuyNGetNRule, campaign.rules)
+        ids = [bogo.buy_product_id, bogo.get_product_id]
+    elif campaign.campaign_type == CampaignType.COMBO:
+        ids = cast(ComboRule, campaign.rules).product_ids
+    else:
+        ids = []
+    parsed = (_product_id(product_id) for product_id in dict.fromkeys(ids))
+    return [product_id for product_id in parsed if product_id is not None]
+
+
+def _receipt_threshold(campaign: Campaign) -> Optional[int]:
+    if campaign.campaign_type != CampaignType.DISCOUNT:
+        return None
+    rule = cast(DiscountRule, campaign.rules)
+    if rule.applies_to != "receipt" or rule.min_amount is None:
+        return None
+    return to_minor(rule.min_amount)
+
+
+def _offer(campaign: Campaign, amount: int) -> Discount:
+    return Discount(UUID(campaign.id), campaign.name, to_major(amount))
+
+
+def _receipt_offer(campaign: Campaign, subtotal: int) -> Optional[Discount]:
+    threshold = _receipt_threshold(campaign)
+    if threshold is None or subtotal < threshold:
+        return None
+    rule = cast(DiscountRule, campaign.rules)
+    return _offer(campaign, min(percent_of(subtotal, rule.discount_value), subtotal))
+
+
+def _product_offers(
+    campaign: Campaign, by_product: Dict[UUID, ReceiptItem]
+) -> List[Tuple[UUID, Discount]]:
+    if campaign.campaign_type == CampaignType.DISCOUNT:
+        return _discount_offers(campaign, by_product)
+    if campaign.campaign_type == CampaignType.BUY_N_GET_N:
+        return _buy_n_get_n_offers(campaign, by_product)
+    if campaign.campaign_type == CampaignType.COMBO:
+        return _combo_offers(campaign, by_product)
+    return []
+
+
+def _discount_offers(
+    campaign: Campaign, by_product: Dict[UUID, ReceiptItem]
+) -> List[Tuple[UUID, Discount]]:
+    rule = cast(DiscountRule, campaign.rules)
+    if rule.applies_to != "product":
+        return []
+
+    offers = []
+    for product_id in rule.product_ids:
+        line = _line(by_product, product_id)
+        if line is not None:
+            line_total = to_minor(line.unit_price) * line.quantity
+            amount = percent_of(line_total, rule.discount_value)
+            offers.append((line.product_id, _offer(campaign, amount)))
+    return offers
+
+
+def _buy_n_get_n_offers(
+    campaign: Campaign, by_product: Dict[UUID, ReceiptItem]
+) -> List[Tuple[UUID, Discount]]:
+    """
+    Discount the free units among the ones already scanned.
+    Free units are never added to the basket; when the free product is the
+    bought one, each complete buy-plus-get group earns its free units.
+    """
+    rule = cast(BuyNGetNRule, campaign.rules)
+    buy_line = _line(by_product, rule.buy_product_id)
+    get_line = _line(by_product, rule.get_product_id)
+    if buy_line is None or get_line is None or rule.buy_quantity <= 0:
+        return []
+
+    if buy_line is get_line:
+        group = rule.buy_quantity + rule.get_quantity
+        free_quantity = buy_line.quantity // group * rule.get_quantity
+    else:
+        earned = buy_line.quantity // rule.buy_quantity * rule.get_quantity
+        free_quantity = min(earned, get_line.quantity)
+    if free_quantity <= 0:
+        return []
+
+    amount = to_minor(get_line.unit_price) * free_quantity
+    return [(get_line.product_id, _offer(campaign, amount))]
+
+
+def _combo_offers(
+    campaign: Campaign, by_product: Dict[UUID, ReceiptItem]
+) -> List[Tuple[UUID, Discount]]:
+    rule = cast(ComboRule, campaign.rules)
+    found = [
+        _line(by_product, product_id) for product_id in dict.fromkeys(rule.product_ids)
+    ]
+    if not found or any(line is None for line in found):
+        return []
+
+    combo_lines = cast(List[ReceiptItem], found)
+    line_totals = [to_minor(line.unit_price) * line.quantity for line in combo_lines]
+    if rule.discount_type == "percentage":
+        amounts = [percent_of(total, rule.discount_value) for total in line_totals]
+    elif rule.discount_type == "fixed":
+        # Split the fixed amount by line value; the shares add up to exactly
+        # the combo discount
+        amounts = allocate(to_minor(rule.discount_value), line_totals)
+    else:
+        return []
+
+    return [
+        (line.product_id, _offer(campaign, amount))
+        for line, amount in zip(combo_lines, amounts)
+    ]
@@ -0,0 +1,140 @@
+"""
+Streaming catalog import.
+
+Rows are read one at a time from CSV (with a ``sku,name,price`` header) or
+NDJSON, validated, and upserted by SKU in batches, each in one transaction.
+Memory use does not grow with the size of the input: only the current batch
+is held. The import yields an ``ImportProgress`` after every batch and an
+``ImportRowError`` for every rejected row, so callers can report progress and
+write an error file as they go.
+"""
+
+import csv
+import json
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+
+from core.models.errors import ImportFormatError
+from core.models.product import CatalogEntry
+from core.models.repositories.product_repository import ProductRepository
+
+FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 5_000
+
+
+@dataclass(frozen=True, slots=True)
+class ImportProgress:
+    """Running totals after a batch; the last one is the summary."""
+
+    batches: int
+    rows: int
+    imported: int
+    rejected: int
+    elapsed: float
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRowError:
+    line: int
+    error: str
+    row: Any
+
+
+ImportEvent = Union[ImportProgress, ImportRowError]
+
+
+def import_products(
+    repository: ProductRepository,
+    lines: Iterable[str],
+    import_format: str = "csv",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[ImportEvent]:
+    """
+    Import the catalog in ``lines``; nothing is written until iterated.
+    The format is checked up front, before the import starts.
+    """
+    if import_format not in FORMATS:
+        raise ImportFormatError(import_format)
+    return _import(repository, _records(lines, import_format), batch_size)
+
+
+def _import(
+    repository: ProductRepository,
+    records: Iterator[Tuple[int, Any]],
+    batch_size: int,
+) -> Iterator[ImportEvent]:
+    started = time.perf_counter()
+    batch: List[CatalogEntry] = []
+    batches = rows = imported = rejected = 0
+    reported = 0
+
+    def progress() -> ImportProgress:
+        return ImportProgress(
+            batches, rows, imported, rejected, time.perf_counter() - started
+        )
+
+    for line, record in records:
+        rows += 1
+        try:
+            batch.append(_entry(record))
+        except ValueError as e:
+            rejected += 1
+            yield ImportRowError(line, str(e), record)
+            continue
+
+        if len(batch) >= batch_size:
+            repository.upsert_many(batch)
+            batches, imported, reported = batches + 1, imported + len(batch), rows
+            batch = []
+            yield progress()
+
+    if batch:
+        repository.upsert_many(batch)
+        batches, imported = batches + 1, imported + len(batch)
+    if batch or rows > reported or rows == 0:
+        yield progress()
+
+
+def _records(lines: Iterable[str], import_format: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, record) pairs; NDJSON records are decoded later."""
+    if import_format == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if line.strip():
+            yield number, line.rstrip("\r\n")
+
+
+def _entry(record: Any) -> CatalogEntry:
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            raise ValueError("invalid JSON") from None
+    if not isinstance(record, dict):
+        raise ValueError("row must be an object")
+
+    sku = _text(record, "sku")
+    name = _text(record, "name")
+    raw_price = record.get("price")
+    try:
+        if isinstance(raw_price, bool):
+            raise TypeError
+        price = float(raw_price)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid price {raw_price!r}") from None
+    if not math.isfinite(price) or price < 0:
+        raise ValueError(f"invalid price {raw_price!r}")
+    return CatalogEntry(sku=sku, name=name, price=price)
+
+
+def _text(record: dict[Any, Any], field: str) -> str:
+    value = record.get(field)
+    if not isinstance(value, (str, int)) or not str(value).strip():
+        raise ValueError(f"missing {field}")
+    return str(value).strip()
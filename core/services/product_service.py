@@ -1,8 +1,14 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
 
+from core.models.errors import ProductCodeNotFoundError
 from core.models.product import Product
 from core.models.repositories.product_repository import ProductRepository
+from core.services.product_import import (
+    DEFAULT_BATCH_SIZE,
+    ImportEvent,
+    import_products,
+)
 
 
 class ProductService:
@@ -18,5 +24,47 @@ class ProductService:
     def get_all_products(self) -> List[Product]:
         return self.product_repository.get_all()
 
+    def get_products_page(
+        self, cursor: Optional[UUID], limit: int
+    ) -> Tuple[List[Product], Optional[UUID]]:
+        """A page of products and the cursor for the next one, if any."""
+        products = self.product_repository.get_page(cursor, limit + 1)
+        if len(products) > limit:
+            return products[:limit], products[limit - 1].id
+        return products, None
+
+    def stream_products(self) -> Iterator[Product]:
+        return self.product_repository.iter_all()
+
+    def search_products(self, query: str, limit: int) -> List[Product]:
+        return self.product_repository.search(query, limit)
+
+    def get_product_by_code(self, code: str) -> Product:
+        product = self.product_repository.get_by_code(code)
+        if product is None:
+            raise ProductCodeNotFoundError(code)
+        return product
+
+    def add_product_codes(self, product_id: UUID, codes: Sequence[str]) -> List[str]:
+        """Attach barcodes or SKUs to a product and return all of its codes."""
+        self.product_repository.add_codes(product_id, codes)
+        return self.product_repository.get_codes(product_id)
+
     def update_product_price(self, product_id: UUID, price: float) -> Optional[Product]:
         return self.product_repository.update_price(product_id, price)
+
+    def update_prices(self, prices: Mapping[UUID, float]) -> int:
+        return self.product_repository.update_prices(prices)
+
+    def import_products(
+        self,
+        lines: Iterable[str],
+        import_format: str = "csv",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[ImportEvent]:
+        return import_products(
+            self.product_repository, lines, import_format, batch_size
+        )
+
+    def catalog_version(self) -> int:
+        return self.product_repository.version()
@@ -1,11 +1,15 @@
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from uuid import UUID
 
-from core.models.errors import ShiftNotFoundError
+from core.models.errors import (
+    ProductCodeNotFoundError,
+    ReceiptVersionConflictError,
+    ShiftNotFoundError,
+)
+from core.models.product import Product
 from core.models.receipt import (
     Currency,
     Payment,
-    PaymentStatus,
     Quote,
     Receipt,
     ReceiptItem,
@@ -19,6 +23,9 @@ from core.models.shift import ShiftStatus
 from core.services.discount_service import DiscountService
 from core.services.exchange_rate_service import ExchangeRateService
 
+# Read-modify-write attempts on a receipt before a conflict is reported
+UPDATE_ATTEMPTS = 3
+
 
 class ReceiptService:
     def __init__(
@@ -53,6 +60,13 @@ class ReceiptService:
         self, receipt_id: UUID, product_id: UUID, quantity: int
     ) -> Optional[Receipt]:
         """Add a product to a receipt with automatic discount application."""
+        return self._retrying(
+            lambda: self._add_product(receipt_id, product_id, quantity)
+        )
+
+    def _add_product(
+        self, receipt_id: UUID, product_id: UUID, quantity: int
+    ) -> Optional[Receipt]:
         receipt = self.receipt_repository.get(receipt_id)
         if not receipt or receipt.status == ReceiptStatus.CLOSED:
             return None
@@ -61,17 +75,44 @@ class ReceiptService:
         if not product:
             return None
 
+        return self._add_item(receipt_id, receipt, product_id, product, quantity)
+
+    def scan_product(
+        self, receipt_id: UUID, code: str, quantity: int = 1
+    ) -> Optional[Receipt]:
+        """
+        Add the product a barcode or SKU belongs to; its code and price are
+        resolved together, from the catalog cache when it is warm.
+        """
+        return self._retrying(lambda: self._scan_product(receipt_id, code, quantity))
+
+    def _scan_product(
+        self, receipt_id: UUID, code: str, quantity: int
+    ) -> Optional[Receipt]:
+        receipt = self.receipt_repository.get(receipt_id)
+        if not receipt or receipt.status == ReceiptStatus.CLOSED:
+            return None
+
+        product = self.product_repository.get_by_code(code)
+        if product is None:
+            raise ProductCodeNotFoundError(code)
+
+        return self._add_item(receipt_id, receipt, product.id, product, quantity)
+
+    def _add_item(
+        self,
+        receipt_id: UUID,
+        receipt: Receipt,
+        product_id: UUID,
+        product: Product,
+        quantity: int,
+    ) -> Receipt:
         # Check if product already exists in receipt
-        existing_item = next(
-            (item for item in receipt.products if item.product_id == product_id), None
-        )
+        existing_item = receipt.find_item(product_id)
 
         if existing_item:
             # Update quantity of existing item
-            existing_item.quantity += quantity
-            existing_item.total_price = (
-                existing_item.unit_price * existing_item.quantity
-            )
+            existing_item.set_quantity(existing_item.quantity + quantity)
         else:
             # Create a new receipt item
             new_item = ReceiptItem(
@@ -79,7 +120,7 @@ class ReceiptService:
                 quantity=quantity,
                 unit_price=product.price,
             )
-            receipt.products.append(new_item)
+            receipt.add_item(new_item)
 
         receipt.recalculate_totals()
         # Apply all applicable discounts
@@ -89,35 +130,31 @@ class ReceiptService:
         return self.receipt_repository.update(receipt_id, updated_receipt)
 
     def remove_product(
-        self, receipt_id: UUID, product_id: UUID, quantity: int
+        self, receipt_id: UUID, product_id: UUID, quantity: Optional[int] = None
     ) -> Optional[Receipt]:
         """Remove a product from a receipt and recalculate discounts."""
+        return self._retrying(
+            lambda: self._remove_product(receipt_id, product_id, quantity)
+        )
+
+    def _remove_product(
+        self, receipt_id: UUID, product_id: UUID, quantity: Optional[int] = None
+    ) -> Optional[Receipt]:
         receipt = self.receipt_repository.get(receipt_id)
         if not receipt or receipt.status == ReceiptStatus.CLOSED:
             return None
 
         # Find the product in the receipt
-        item_index = next(
-            (
-                i
-                for i, item in enumerate(receipt.products)
-                if item.product_id == product_id
-            ),
-            None,
-        )
-
-        if item_index is None:
+        item = receipt.find_item(product_id)
+        if item is None:
             return receipt  # Product not in receipt
 
-        item = receipt.products[item_index]
-
         if quantity is None or quantity >= item.quantity:
             # Remove the entire item
-            receipt.products.pop(item_index)
+            receipt.remove_item(product_id)
         else:
             # Reduce the quantity
-            item.quantity -= quantity
-            item.total_price = item.unit_price * item.quantity
+            item.set_quantity(item.quantity - quantity)
 
         # Recalculate discounts
         updated_receipt = self.discount_service.apply_discounts(receipt)
@@ -125,6 +162,19 @@ class ReceiptService:
         # Save the updated receipt
         return self.receipt_repository.update(receipt_id, updated_receipt)
 
+    @staticmethod
+    def _retrying(change: Callable[[], Optional[Receipt]]) -> Optional[Receipt]:
+        """
+        Run a read-modify-write of a receipt, starting again from a fresh
+        read when another request stored a change to it in between.
+        """
+        for _ in range(UPDATE_ATTEMPTS - 1):
+            try:
+                return change()
+            except ReceiptVersionConflictError:
+                continue
+        return change()
+
     def calculate_payment_quote(
         self, receipt_id: UUID, currency: Currency
     ) -> Optional[Quote]:
@@ -140,44 +190,31 @@ class ReceiptService:
         return quote
 
     def add_payment(
-        self, receipt_id: UUID, amount: float, currency_name: str
+        self,
+        receipt_id: UUID,
+        amount: float,
+        currency_name: str,
+        idempotency_key: Optional[str] = None,
     ) -> Optional[Tuple[Payment, Receipt]]:
-        """Add a payment to a receipt and close it if fully paid."""
+        """
+        Pay a receipt and close it if fully paid, in a single transaction.
+        Retrying with the same ``idempotency_key`` returns the first result.
+        """
         # Ensure receipt_id is UUID
         receipt_id = UUID(receipt_id) if isinstance(receipt_id, str) else receipt_id
 
-        receipt = self.receipt_repository.get(receipt_id)
-        if not receipt or receipt.status == ReceiptStatus.CLOSED:
-            return None
-
         try:
             currency = Currency[currency_name]
         except KeyError:
             return None
 
-        # Calculate the payment in GEL
+        # The rate may come from the network; fetch it before taking the lock
         rate = self.exchange_service.get_exchange_rate(currency, Currency.GEL)
 
-        # Create a payment
-        payment = self.payment_repository.create(
-            receipt_id, amount, currency, receipt.total, rate
+        return self.receipt_repository.add_payment(
+            receipt_id, amount, currency, rate, idempotency_key
         )
 
-        updated_receipt = self.receipt_repository.get(receipt_id)
-        if payment.payment_amount * rate > receipt.total:
-            payment = self.payment_repository.update_status(
-                payment.id, PaymentStatus.COMPLETED.value
-            )
-            updated_receipt = self.receipt_repository.update_status(
-                receipt_id, ReceiptStatus.CLOSED
-            )
-        else:
-            payment = self.payment_repository.update_status(
-                payment.id, PaymentStatus.FAILED.value
-            )
-
-        return payment, updated_receipt
-
     def get_receipts_by_shift(
         self, shift_id: UUID, shift: ShiftRepository
     ) -> List[Receipt]:
@@ -1,16 +1,44 @@
+import sqlite3
 from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
 from infra.api.routers.campaign_router import router as campaign_router
 from infra.api.routers.product_router import router as product_router
 from infra.api.routers.receipt_router import router as receipt_router
 from infra.api.routers.report_router import router as report_router
 from infra.api.routers.shift_router import router as shift_router
+from infra.db.contention import is_lock_error
+from infra.db.deadline import QueryTimeoutError, deadline
 from runner.dependencies import AppContainer, get_app_container
 
 app = FastAPI()
 
+# Seconds each class of route may spend in the database per request
+ROUTE_DEADLINES: Dict[str, float] = {
+    "checkout": 5.0,
+    "catalog": 10.0,
+    "reports": 60.0,
+}
+
+
+def request_deadline(route_class: str) -> Callable[[], AsyncIterator[None]]:
+    """
+    A dependency giving each request of ``route_class`` its deadline. The
+    deadline is lifted when the request is done with its dependencies, so
+    requests served one after another from the same task, as under an
+    in-process transport, do not inherit it.
+    """
+    seconds = ROUTE_DEADLINES[route_class]
+
+    async def request_under_deadline() -> AsyncIterator[None]:
+        with deadline(seconds):
+            yield
+
+    return request_under_deadline
+
 
 @lru_cache()
 def create_app_container(db_path: str) -> AppContainer:
@@ -18,9 +46,66 @@ def create_app_container(db_path: str) -> AppContainer:
     return get_app_container(db_path)
 
 
+@app.exception_handler(sqlite3.OperationalError)
+def handle_operational_error(
+    request: Request, exc: sqlite3.OperationalError
+) -> JSONResponse:
+    """Report SQLite lock contention as a retryable 503 instead of a bare 500."""
+    if is_lock_error(exc):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": {"error_code": "DATABASE_LOCKED", "message": str(exc)}},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": {"error_code": "DATABASE_ERROR", "message": str(exc)}},
+    )
+
+
+@app.exception_handler(QueryTimeoutError)
+def handle_query_timeout(request: Request, exc: QueryTimeoutError) -> JSONResponse:
+    """
+    A query stopped at the request's deadline is a 504; one that never got
+    to start before it means the server is overloaded, a retryable 503.
+    """
+    if exc.started:
+        return JSONResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            content={"detail": {"error_code": "QUERY_TIMEOUT", "message": str(exc)}},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": {"error_code": "DEADLINE_EXCEEDED", "message": str(exc)}},
+    )
+
+
 # Include routers with prefixes and tags
-app.include_router(product_router, prefix="/products", tags=["Products"])
-app.include_router(campaign_router, prefix="/campaigns", tags=["Campaigns"])
-app.include_router(shift_router, prefix="/shifts", tags=["Shifts"])
-app.include_router(receipt_router, prefix="/receipts", tags=["Receipts"])
-app.include_router(report_router, tags=["Reports"])
+app.include_router(
+    product_router,
+    prefix="/products",
+    tags=["Products"],
+    dependencies=[Depends(request_deadline("catalog"))],
+)
+app.include_router(
+    campaign_router,
+    prefix="/campaigns",
+    tags=["Campaigns"],
+    dependencies=[Depends(request_deadline("catalog"))],
+)
+app.include_router(
+    shift_router,
+    prefix="/shifts",
+    tags=["Shifts"],
+    dependencies=[Depends(request_deadline("checkout"))],
+)
+app.include_router(
+    receipt_router,
+    prefix="/receipts",
+    tags=["Receipts"],
+    dependencies=[Depends(request_deadline("checkout"))],
+)
+app.include_router(
+    report_router,
+    tags=["Reports"],
+    dependencies=[Depends(request_deadline("reports"))],
+)
@@ -1,3 +1,4 @@
+from dataclasses import asdict
 from typing import Any, Dict, List
 from uuid import UUID
 
@@ -81,6 +82,6 @@ def _campaign_to_response(campaign: Campaign) -> Dict[str, Any]:
         "id": campaign.id,
         "name": campaign.name,
         "campaign_type": campaign.campaign_type.value,
-        "rules": campaign.rules.__dict__,
+        "rules": asdict(campaign.rules),
         "is_active": campaign.is_active,
     }
@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import json
+import tempfile
+from dataclasses import asdict
+from io import TextIOWrapper
+from typing import Any, Iterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from core.models.product import Product
+from core.services.product_import import DEFAULT_BATCH_SIZE, ImportProgress
 from core.services.product_service import ProductService
-from infra.api.schemas.product import ProductCreate, ProductUpdate
+from infra.api.schemas.product import (
+    PriceUpdates,
+    ProductCodes,
+    ProductCreate,
+    ProductUpdate,
+)
+from infra.db.deadline import each_with_deadline
 from runner.dependencies import get_product_service
 
 router = APIRouter()
 
+# Uploads larger than this are spooled to a temporary file
+UPLOAD_SPOOL_BYTES = 1 << 20
+NDJSON = "application/x-ndjson"
+MAX_PAGE_SIZE = 1_000
+MAX_SEARCH_RESULTS = 100
+# Seconds each import batch, or each page fetched for an NDJSON listing, may
+# spend in the database; the streams as a whole run past the route deadline
+STREAM_STEP_DEADLINE = 10.0
+
 
 @router.post("/", response_model=dict, status_code=201)
 def create_product(
@@ -23,10 +45,80 @@ def create_product(
 
 @router.get("/", response_model=dict)
 def list_products(
+    request: Request,
+    response: Response,
+    cursor: UUID | None = None,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    product_service: ProductService = Depends(get_product_service),
+) -> dict[str, Any] | Response:
+    """
+    List products: all at once, a page at a time with ``limit`` and the
+    returned ``next_cursor``, or streamed as NDJSON when that is accepted.
+    """
+    # The catalog version is the entity tag; read it before the products so
+    # a concurrent change can only make the tag older than the body. JSON and
+    # NDJSON bodies share the tag, so caches must tell them apart by Accept
+    etag = f'"catalog-{product_service.catalog_version()}"'
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    if NDJSON in request.headers.get("accept", ""):
+        lines = (
+            json.dumps({"id": str(p.id), "name": p.name, "price": p.price}) + "\n"
+            for p in each_with_deadline(
+                product_service.stream_products(), STREAM_STEP_DEADLINE
+            )
+        )
+        return StreamingResponse(lines, media_type=NDJSON, headers=headers)
+
+    response.headers.update(headers)
+    if limit is None and cursor is None:
+        return {"products": product_service.get_all_products()}
+
+    products, next_cursor = product_service.get_products_page(
+        cursor, limit or MAX_PAGE_SIZE
+    )
+    return {"products": products, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=dict)
+def search_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
     product_service: ProductService = Depends(get_product_service),
 ) -> dict[str, list[Product]]:
-    products = product_service.get_all_products()
-    return {"products": products}
+    """Typeahead lookup by partial name or SKU, best matches first."""
+    return {"products": product_service.search_products(q, limit)}
+
+
+@router.get("/codes/{code}", response_model=dict)
+def get_product_by_code(
+    code: str,
+    product_service: ProductService = Depends(get_product_service),
+) -> dict[str, Product]:
+    return {"product": product_service.get_product_by_code(code)}
+
+
+@router.post("/{product_id}/codes", response_model=dict)
+def add_product_codes(
+    product_id: UUID,
+    body: ProductCodes,
+    product_service: ProductService = Depends(get_product_service),
+) -> dict[str, Any]:
+    codes = product_service.add_product_codes(product_id, body.codes)
+    return {"product_id": product_id, "codes": codes}
+
+
+@router.patch("/", response_model=dict)
+def update_prices(
+    updates: PriceUpdates,
+    product_service: ProductService = Depends(get_product_service),
+) -> dict[str, int]:
+    # One transaction for the batch; a later change to a product wins
+    prices = {change.id: change.price for change in updates.prices}
+    updated = product_service.update_prices(prices)
+    return {"updated": updated, "catalog_version": product_service.catalog_version()}
 
 
 @router.patch("/{product_id}", response_model=dict)
@@ -37,3 +129,37 @@ def update_product(
 ) -> dict[str, Product | None]:
     product = product_service.update_product_price(product_id, product_data.price)
     return {"product": product}
+
+
+@router.post("/import")
+async def import_products(
+    request: Request,
+    import_format: str = Query("csv", alias="format"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=100_000),
+    product_service: ProductService = Depends(get_product_service),
+) -> StreamingResponse:
+    """
+    Import a CSV or NDJSON catalog sent as the request body.
+    Responds with NDJSON: a progress record per batch, an error record per
+    rejected row, and the final totals as the last progress record.
+    """
+    upload = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+    lines = TextIOWrapper(upload, encoding="utf-8", newline="")
+
+    try:
+        events = product_service.import_products(lines, import_format, batch_size)
+    except Exception:
+        lines.close()
+        raise
+
+    def report() -> Iterator[str]:
+        # Runs in the threadpool as the response is streamed
+        with lines:
+            for event in each_with_deadline(events, STREAM_STEP_DEADLINE):
+                kind = "progress" if isinstance(event, ImportProgress) else "error"
+                yield json.dumps({"type": kind, **asdict(event)}) + "\n"
+
+    return StreamingResponse(report(), media_type="application/x-ndjson")
@@ -1,23 +1,27 @@
-from typing import Any, Dict
+import functools
+from typing import Any, Dict, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from starlette import status
 
 from core.models.receipt import Currency, Receipt
+from core.services.keyed_lock import KeyedLock
 from core.services.receipt_service import ReceiptService
 from infra.api.schemas.receipt import (
     PaymentCompleteResponse,
     PaymentRequest,
     PaymentResponse,
     ProductAddRequest,
+    ProductScanRequest,
     QuoteRequest,
     QuoteResponse,
     ReceiptCreate,
     ReceiptPaymentResponse,
     ReceiptResponse,
 )
-from runner.dependencies import get_receipt_service
+from runner.dependencies import get_receipt_locks, get_receipt_service
 
 router = APIRouter()
 
@@ -39,15 +43,40 @@ def create_receipt(
     return {"receipt": new_receipt}
 
 
+@router.get("/locks/stats", response_model=dict)
+def receipt_lock_stats(
+    locks: KeyedLock = Depends(get_receipt_locks),
+) -> dict[str, Any]:
+    """Wait times for the per-receipt locks, in milliseconds."""
+    stats = locks.stats()
+    return {
+        "acquisitions": stats.acquisitions,
+        "contended": stats.contended,
+        "mean_wait_ms": stats.mean_wait * 1000,
+        "max_wait_ms": stats.max_wait * 1000,
+        "active_receipts": stats.active_keys,
+        "waiting": stats.waiting,
+    }
+
+
+# Changes to one receipt are applied one at a time, in arrival order, under
+# its lock; the service runs in the thread pool so other receipts carry on.
+
+
 @router.post("/{receipt_id}/products", response_model=Dict[str, ReceiptResponse])
-def add_product_to_receipt(
+async def add_product_to_receipt(
     receipt_id: UUID,
     product_data: ProductAddRequest,
     receipt_service: ReceiptService = Depends(get_receipt_service),
+    locks: KeyedLock = Depends(get_receipt_locks),
 ) -> dict[str, Receipt]:
-    updated_receipt = receipt_service.add_product(
-        receipt_id, product_data.product_id, product_data.quantity
-    )
+    async with locks.hold(receipt_id):
+        updated_receipt = await run_in_threadpool(
+            receipt_service.add_product,
+            receipt_id,
+            product_data.product_id,
+            product_data.quantity,
+        )
     print(f"Updated receipt: {updated_receipt}")  # Check if products are being added
     if not updated_receipt:
         raise HTTPException(
@@ -58,6 +87,48 @@ def add_product_to_receipt(
     return {"receipt": updated_receipt}
 
 
+@router.post("/{receipt_id}/scans", response_model=Dict[str, ReceiptResponse])
+async def scan_product(
+    receipt_id: UUID,
+    scan: ProductScanRequest,
+    receipt_service: ReceiptService = Depends(get_receipt_service),
+    locks: KeyedLock = Depends(get_receipt_locks),
+) -> dict[str, Receipt]:
+    async with locks.hold(receipt_id):
+        updated_receipt = await run_in_threadpool(
+            receipt_service.scan_product, receipt_id, scan.code, scan.quantity
+        )
+    if not updated_receipt:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot add product. Receipt not found or closed",
+        )
+    return {"receipt": updated_receipt}
+
+
+@router.delete(
+    "/{receipt_id}/products/{product_id}", response_model=Dict[str, ReceiptResponse]
+)
+async def remove_product_from_receipt(
+    receipt_id: UUID,
+    product_id: UUID,
+    quantity: Optional[int] = Query(None, ge=1),
+    receipt_service: ReceiptService = Depends(get_receipt_service),
+    locks: KeyedLock = Depends(get_receipt_locks),
+) -> dict[str, Receipt]:
+    """Remove ``quantity`` units of a product, or the whole line without it."""
+    async with locks.hold(receipt_id):
+        updated_receipt = await run_in_threadpool(
+            receipt_service.remove_product, receipt_id, product_id, quantity
+        )
+    if not updated_receipt:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot remove product. Receipt not found or closed",
+        )
+    return {"receipt": updated_receipt}
+
+
 @router.post("/receipts/{receipt_id}/quotes", response_model=Dict[str, QuoteResponse])
 def calculate_payment_quote(
     receipt_id: UUID,
@@ -92,15 +163,26 @@ def calculate_payment_quote(
 
 
 @router.post("/{receipt_id}/payments", response_model=PaymentCompleteResponse)
-def add_payment(
+async def add_payment(
     receipt_id: UUID,
     payment_data: PaymentRequest,
+    idempotency_key: Optional[str] = Header(
+        None, alias="Idempotency-Key", max_length=255
+    ),
     receipt_service: ReceiptService = Depends(get_receipt_service),
+    locks: KeyedLock = Depends(get_receipt_locks),
 ) -> PaymentCompleteResponse:
     try:
-        result = receipt_service.add_payment(
-            receipt_id, payment_data.amount, payment_data.currency
-        )
+        async with locks.hold(receipt_id):
+            result = await run_in_threadpool(
+                functools.partial(
+                    receipt_service.add_payment,
+                    receipt_id,
+                    payment_data.amount,
+                    payment_data.currency,
+                    idempotency_key=idempotency_key,
+                )
+            )
 
         if not result:
             raise HTTPException(
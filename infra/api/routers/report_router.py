@@ -1,3 +1,6 @@
+import asyncio
+import contextvars
+from concurrent.futures import Executor
 from typing import Dict
 from uuid import UUID
 
@@ -6,17 +9,24 @@ from fastapi import APIRouter, Depends
 from core.models.report import SalesReport, ShiftReport
 from core.services.report_service import ReportService
 from infra.api.schemas.report import SalesReportResponse, XReportResponse
-from runner.dependencies import get_report_service
+from runner.dependencies import get_report_executor, get_report_service
 
 router = APIRouter()
 
 
 @router.get("/x-reports")
-def get_x_report(
+async def get_x_report(
     shift_id: UUID,
     report_service: ReportService = Depends(get_report_service),
+    executor: Executor = Depends(get_report_executor),
 ) -> dict[str, ShiftReport]:
-    report = report_service.generate_shift_report(shift_id)
+    # The copied context carries the request's query deadline along
+    report = await asyncio.get_running_loop().run_in_executor(
+        executor,
+        contextvars.copy_context().run,
+        report_service.generate_shift_report,
+        shift_id,
+    )
     print(report)
     return {"x-report": report}
 
@@ -31,8 +41,11 @@ def get_z_report(
 
 
 @router.get("/sales", response_model=Dict[str, SalesReportResponse])
-def get_sales_report(
+async def get_sales_report(
     report_service: ReportService = Depends(get_report_service),
+    executor: Executor = Depends(get_report_executor),
 ) -> dict[str, SalesReport]:
-    report = report_service.generate_sales_report()
+    report = await asyncio.get_running_loop().run_in_executor(
+        executor, contextvars.copy_context().run, report_service.generate_sales_report
+    )
     return {"sales": report}
@@ -1,7 +1,7 @@
 from typing import List
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProductCreate(BaseModel):
@@ -21,3 +21,16 @@ class ProductsResponse(BaseModel):
 
 class ProductUpdate(BaseModel):
     price: float
+
+
+class PriceChange(BaseModel):
+    id: UUID
+    price: float
+
+
+class PriceUpdates(BaseModel):
+    prices: List[PriceChange]
+
+
+class ProductCodes(BaseModel):
+    codes: List[str] = Field(min_length=1)
@@ -1,7 +1,7 @@
 from typing import List
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from core.models.receipt import Currency
 
@@ -65,6 +65,11 @@ class ProductAddRequest(BaseModel):
     quantity: int
 
 
+class ProductScanRequest(BaseModel):
+    code: str = Field(min_length=1)
+    quantity: int = 1
+
+
 class QuoteRequest(BaseModel):
     currency: Currency
 
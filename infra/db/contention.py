@@ -0,0 +1,79 @@
+"""
+Lock contention handling for SQLite.
+
+A connection that finds the database locked first waits in SQLite's busy
+handler, up to ``busy_timeout``. Some conflicts are not helped by waiting:
+a deferred transaction that read before trying to write is refused at once,
+since waiting for the writer could deadlock. Operations that are safe to run
+again, such as a whole write transaction, are then retried from the start
+after an exponential backoff with full jitter, so retrying writers spread out
+instead of colliding again. Retries and give-ups are counted.
+"""
+
+import random
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+
+def is_lock_error(error: sqlite3.OperationalError) -> bool:
+    """Whether SQLite refused for lock contention rather than a real fault."""
+    message = str(error)
+    return "locked" in message or "busy" in message
+
+
+@dataclass(frozen=True, slots=True)
+class ContentionPolicy:
+    """How long to wait for locks and how to retry; times are in seconds."""
+
+    busy_timeout: float = 5.0
+    retries: int = 3
+    backoff: float = 0.01
+    max_backoff: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.busy_timeout < 0 or self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("contention timings cannot be negative")
+        if self.retries < 0:
+            raise ValueError("retries cannot be negative")
+
+    def delay(self, attempt: int) -> float:
+        """Pause before retry number ``attempt`` (from 0): full jitter."""
+        cap = min(self.max_backoff, self.backoff * 2**attempt)
+        return random.uniform(0, cap)
+
+
+@dataclass(frozen=True, slots=True)
+class ContentionStats:
+    """
+    Counters since start: ``retries`` made, operations that ``recovered``
+    after retrying, and operations that ``gave_up`` with the retries spent.
+    """
+
+    retries: int
+    recovered: int
+    gave_up: int
+
+
+class ContentionCounters:
+    """Thread-safe counters behind ContentionStats."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._retries = self._recovered = self._gave_up = 0
+
+    def retry(self) -> None:
+        with self._lock:
+            self._retries += 1
+
+    def recover(self) -> None:
+        with self._lock:
+            self._recovered += 1
+
+    def give_up(self) -> None:
+        with self._lock:
+            self._gave_up += 1
+
+    def stats(self) -> ContentionStats:
+        with self._lock:
+            return ContentionStats(self._retries, self._recovered, self._gave_up)
@@ -1,43 +1,464 @@
 import json
+import re
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
 from contextlib import contextmanager
-from typing import Any, Generator
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, TypeVar, Union
+from uuid import UUID
+
+from core.models.money import to_minor
+from infra.db.contention import (
+    ContentionCounters,
+    ContentionPolicy,
+    ContentionStats,
+    is_lock_error,
+)
+from infra.db.deadline import (
+    QueryTimeoutError,
+    check_deadline,
+    interrupted,
+    remaining,
+)
+from infra.db.deadline import install as install_deadline
+from infra.db.read_pool import DEFAULT_READERS, ReadOnlyPool, ReadPoolTimeout
+from infra.db.write_queue import DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY, WriteQueue
+
+T = TypeVar("T")
+
+TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+# Columns holding money, stored as INTEGER minor units
+MONEY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "products": ("price",),
+    "receipts": ("subtotal", "discount_amount", "total"),
+    "receipt_items": ("unit_price", "total_price", "final_price"),
+    "payments": ("payment_amount", "total_in_gel"),
+    "receipt_item_discounts": ("discount_amount",),
+    "receipt_discounts": ("discount_amount",),
+}
+
+# Columns holding UUIDs, stored as 16-byte BLOBs
+ID_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "products": ("id",),
+    "product_codes": ("product_id",),
+    "campaigns": ("id",),
+    "discount_rules": ("id", "campaign_id"),
+    "buy_n_get_n_rules": ("id", "campaign_id", "buy_product_id", "get_product_id"),
+    "combo_rules": ("id", "campaign_id"),
+    "combo_rule_products": ("combo_rule_id", "product_id"),
+    "discount_rule_products": ("discount_rule_id", "product_id"),
+    "shifts": ("id",),
+    "receipts": ("id", "shift_id"),
+    "receipt_items": ("id", "receipt_id", "product_id"),
+    "payments": ("id", "receipt_id"),
+    "receipt_item_discounts": ("receipt_item_id", "campaign_id"),
+    "receipt_discounts": ("receipt_id", "campaign_id"),
+}
+
+# Data sets with a version number in data_versions, and the tables whose
+# writes bump it; caches key on the version instead of rereading the data
+VERSIONED_TABLES: Dict[str, Tuple[str, ...]] = {
+    "campaigns": (
+        "campaigns",
+        "discount_rules",
+        "buy_n_get_n_rules",
+        "combo_rules",
+        "combo_rule_products",
+        "discount_rule_products",
+    ),
+    "products": ("products", "product_codes"),
+}
+
+
+def _retype_columns(
+    conn: sqlite3.Connection,
+    columns: Dict[str, Tuple[str, ...]],
+    old_type: str,
+    new_type: str,
+    function: str,
+) -> None:
+    """
+    Change the declared type of ``columns`` and convert their values with
+    the SQL ``function``. SQLite cannot change a column type in place, so
+    each table is rebuilt from its own definition and its rows copied across.
+    """
+    for table, names in columns.items():
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        ).fetchone()
+        if row is None:
+            continue
+
+        create_sql = re.sub(
+            rf"^CREATE TABLE \"?{table}\"?", f"CREATE TABLE {table}_new", row[0]
+        )
+        for column in names:
+            create_sql = re.sub(
+                rf"\b{column}\s+{old_type}\b", f"{column} {new_type}", create_sql
+            )
+        existing = [info[1] for info in conn.execute(f"PRAGMA table_info({table})")]
+        values = [f"{function}({name})" if name in names else name for name in existing]
+
+        conn.execute(create_sql)
+        conn.execute(
+            f"INSERT INTO {table}_new ({', '.join(existing)})"
+            f" SELECT {', '.join(values)} FROM {table}"
+        )
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+def _money_to_minor_units(conn: sqlite3.Connection) -> None:
+    """Convert REAL money columns to INTEGER minor units."""
+    conn.create_function("to_minor", 1, to_minor, deterministic=True)
+    _retype_columns(conn, MONEY_COLUMNS, "REAL", "INTEGER", "to_minor")
+
+
+def _add_product_sku(conn: sqlite3.Connection) -> None:
+    """Add the SKU the catalog import matches products on."""
+    columns = [info[1] for info in conn.execute("PRAGMA table_info(products)")]
+    if columns and "sku" not in columns:
+        conn.execute("ALTER TABLE products ADD COLUMN sku TEXT")
+
+
+def _add_payment_idempotency_key(conn: sqlite3.Connection) -> None:
+    """Add the client key that makes a retried payment a no-op."""
+    columns = [info[1] for info in conn.execute("PRAGMA table_info(payments)")]
+    if columns and "idempotency_key" not in columns:
+        conn.execute("ALTER TABLE payments ADD COLUMN idempotency_key TEXT")
+
+
+def _add_receipt_version(conn: sqlite3.Connection) -> None:
+    """Add the row version receipt writes compare and swap on."""
+    columns = [info[1] for info in conn.execute("PRAGMA table_info(receipts)")]
+    if columns and "version" not in columns:
+        conn.execute(
+            "ALTER TABLE receipts ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+        )
+
+
+def _text_ids_to_blobs(conn: sqlite3.Connection) -> None:
+    """
+    Convert TEXT UUID columns to 16-byte BLOBs.
+    Values that are not UUIDs are kept as they are rather than lost.
+    """
+
+    def to_blob(value: Any) -> Any:
+        try:
+            return UUID(value).bytes
+        except (TypeError, ValueError, AttributeError):
+            return value
+
+    conn.create_function("to_blob", 1, to_blob, deterministic=True)
+    _retype_columns(conn, ID_COLUMNS, "TEXT", "BLOB", "to_blob")
+
+
+# Schema upgrades in order; PRAGMA user_version counts the ones applied
+MIGRATIONS: List[Callable[[sqlite3.Connection], None]] = [
+    _money_to_minor_units,
+    _text_ids_to_blobs,
+    _add_product_sku,
+    _add_payment_idempotency_key,
+    _add_receipt_version,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+class QueryCounter:
+    """Collects the SQL statements executed through a Database."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    def __call__(self, statement: str) -> None:
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        """Number of statements, not counting transaction control."""
+        return sum(
+            1
+            for statement in self.statements
+            if not statement.lstrip().upper().startswith(TRANSACTION_CONTROL)
+        )
 
 
 class Database:
-    def __init__(self, db_path: str = "pos_system.db"):
+    def __init__(
+        self,
+        db_path: str = "pos_system.db",
+        contention: ContentionPolicy = ContentionPolicy(),
+        readers: int = DEFAULT_READERS,
+    ):
         self.db_path = db_path
-        self._create_tables()
+        self.contention = contention
+        self._contention_counters = ContentionCounters()
+        self._counters: List[QueryCounter] = []
+        self._counters_lock = threading.Lock()
+        self.write_queue: Optional[WriteQueue] = None
+        upgraded = self._migrate()
+        self._create_tables(rebuild_search=upgraded)
+        self._use_wal()
+        self.read_pool = ReadOnlyPool(
+            db_path,
+            readers,
+            contention.busy_timeout,
+            configure=self._configure_reader,
+        )
 
     @contextmanager
     def get_connection(self) -> Generator[sqlite3.Connection, Any, None]:
         """
         Yields a SQLite database connection.
         The connection is automatically closed when the context manager exits.
+        Statements past the context's deadline raise QueryTimeoutError.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        check_deadline()
+        conn = self._connect()
         try:
             yield conn
+        except sqlite3.OperationalError as e:
+            if interrupted(e):
+                raise QueryTimeoutError() from e
+            raise
         finally:
             conn.close()
 
-    def _create_tables(self) -> None:
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.contention.busy_timeout)
+        conn.row_factory = sqlite3.Row
+        if self._counters:
+            conn.set_trace_callback(self._trace)
+        install_deadline(conn)
+        return conn
+
+    @contextmanager
+    def read_only(self) -> Generator[sqlite3.Connection, Any, None]:
+        """
+        A connection from the read-only pool, for long reads such as reports
+        that should not hold up writes; waits while the pool is fully in use,
+        but not past the context's deadline.
+        """
+        check_deadline()
+        try:
+            with self.read_pool.connection(timeout=remaining()) as conn:
+                yield conn
+        except ReadPoolTimeout:
+            raise QueryTimeoutError(started=False) from None
+        except sqlite3.OperationalError as e:
+            if interrupted(e):
+                raise QueryTimeoutError() from e
+            raise
+
+    @contextmanager
+    def count_queries(self) -> Generator[QueryCounter, Any, None]:
+        """
+        Counts statements run on connections opened inside the block.
+        Used by tests to hold repositories to a query budget.
+        """
+        counter = QueryCounter()
+        with self._counters_lock:
+            self._counters.append(counter)
+        try:
+            yield counter
+        finally:
+            with self._counters_lock:
+                self._counters.remove(counter)
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection, Any, None]:
+        """
+        A write transaction, holding the write lock from its first statement
+        so that what it reads cannot change before it writes.
+        Commits when the block exits and rolls back if it raises.
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def versioned_write(self, name: str) -> Generator[sqlite3.Connection, Any, None]:
+        """
+        A write transaction that bumps the ``name`` data version once, however
+        many rows it changes; the per-row trigger bumps are folded into one.
+        """
+        with self.transaction() as conn:
+            (version,) = conn.execute(
+                "SELECT version FROM data_versions WHERE name = ?", (name,)
+            ).fetchone()
+            yield conn
+            conn.execute(
+                "UPDATE data_versions SET version = ? WHERE name = ?",
+                (version + 1, name),
+            )
+
+    def start_write_queue(
+        self,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ) -> WriteQueue:
+        """
+        Send ``write`` and ``submit_write`` units through a writer thread
+        that commits them in groups; see ``infra.db.write_queue``.
+        """
+        if self.write_queue is not None:
+            raise RuntimeError("write queue already started")
+        self.write_queue = WriteQueue(
+            self._writer_connection, max_batch, max_delay, self.retrying
+        )
+        return self.write_queue
+
+    def stop_write_queue(self) -> None:
+        """Commit what is queued and go back to a transaction per write."""
+        write_queue, self.write_queue = self.write_queue, None
+        if write_queue is not None:
+            write_queue.close()
+
+    def submit_write(self, work: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """
+        Run ``work`` in a write transaction and return a future of its result.
+        With the write queue started the unit is group-committed on the writer
+        thread; otherwise it runs here, in a transaction of its own, retried
+        while the database is locked. Units must only touch the database.
+        """
+        if self.write_queue is not None:
+            return self.write_queue.submit(work)
+
+        def run() -> T:
+            with self.transaction() as conn:
+                return work(conn)
+
+        future: Future[T] = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            result = self.retrying(run)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        return future
+
+    def write(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """``submit_write`` and wait: the result once it is committed."""
+        return self.submit_write(work).result()
+
+    def retrying(self, operation: Callable[[], T]) -> T:
+        """
+        Run ``operation``, running it again after a backoff when it fails on
+        a locked database, up to the policy's retries. Only for operations
+        that are safe to repeat, such as a transaction that rolls back whole.
+        """
+        attempt = 0
+        while True:
+            try:
+                result = operation()
+            except sqlite3.OperationalError as e:
+                if not is_lock_error(e):
+                    raise
+                if attempt >= self.contention.retries:
+                    self._contention_counters.give_up()
+                    raise
+                self._contention_counters.retry()
+                time.sleep(self.contention.delay(attempt))
+                attempt += 1
+                continue
+            if attempt:
+                self._contention_counters.recover()
+            return result
+
+    def contention_stats(self) -> ContentionStats:
+        return self._contention_counters.stats()
+
+    def _writer_connection(self) -> sqlite3.Connection:
+        # Long-lived, so it is traced from the start; _trace is a no-op
+        # while nothing is counting
+        conn = sqlite3.connect(self.db_path, timeout=self.contention.busy_timeout)
+        conn.row_factory = sqlite3.Row
+        conn.set_trace_callback(self._trace)
+        return conn
+
+    def _trace(self, statement: str) -> None:
+        if not self._counters:
+            return
+        with self._counters_lock:
+            for counter in self._counters:
+                counter(statement)
+
+    def _configure_reader(self, conn: sqlite3.Connection) -> None:
+        conn.set_trace_callback(self._trace)
+        install_deadline(conn)
+
+    def _use_wal(self) -> None:
+        """
+        Switch the database to WAL, where readers work from a snapshot and
+        neither block the writer nor wait for it. The mode is stored in the
+        database file, so this only changes something the first time.
+        """
+        with self.get_connection() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+
+    def _migrate(self) -> bool:
+        """
+        Bring an existing database up to SCHEMA_VERSION.
+        A new database is created at the current version and skips this.
+        Returns whether existing tables were migrated.
+        """
+        with self.get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return False
+
+            tables = conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]
+            conn.execute("BEGIN")
+            if tables == 0:
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            else:
+                for number, migration in enumerate(
+                    MIGRATIONS[version:], start=version + 1
+                ):
+                    migration(conn)
+                    conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+
+            # Rebuilt tables leave free pages behind; give them back
+            if tables:
+                conn.execute("VACUUM")
+            return bool(tables)
+
+    def _create_tables(self, rebuild_search: bool = False) -> None:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS products (
-                id TEXT PRIMARY KEY,
+                id BLOB PRIMARY KEY,
                 name TEXT NOT NULL,
-                price REAL NOT NULL
+                price INTEGER NOT NULL,
+                sku TEXT
             )
             """)
 
+            # Barcodes and SKUs a product is scanned by; a product may have many
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS product_codes (
+                code TEXT PRIMARY KEY,
+                product_id BLOB NOT NULL,
+                FOREIGN KEY (product_id) REFERENCES products (id)
+            ) WITHOUT ROWID
+            """)
+
             cursor.execute("""
             -- Campaigns table
             CREATE TABLE IF NOT EXISTS campaigns (
-                id TEXT PRIMARY KEY,
+                id BLOB PRIMARY KEY,
                 name TEXT NOT NULL,
                 campaign_type TEXT NOT NULL,
                 is_active INTEGER DEFAULT 1
@@ -46,8 +467,8 @@ class Database:
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS discount_rules (
-                id TEXT PRIMARY KEY,
-                campaign_id TEXT NOT NULL,
+                id BLOB PRIMARY KEY,
+                campaign_id BLOB NOT NULL,
                 discount_value REAL NOT NULL,
                 applies_to TEXT NOT NULL,
                 min_amount REAL DEFAULT 0,
@@ -57,11 +478,11 @@ class Database:
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS buy_n_get_n_rules (
-                id TEXT PRIMARY KEY,
-                campaign_id TEXT NOT NULL,
-                buy_product_id TEXT NOT NULL,
+                id BLOB PRIMARY KEY,
+                campaign_id BLOB NOT NULL,
+                buy_product_id BLOB NOT NULL,
                 buy_quantity INTEGER NOT NULL,
-                get_product_id TEXT NOT NULL,
+                get_product_id BLOB NOT NULL,
                 get_quantity INTEGER NOT NULL,
                 FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE
             );
@@ -70,8 +491,8 @@ class Database:
             cursor.execute("""
             -- Combo rules table
             CREATE TABLE IF NOT EXISTS combo_rules (
-                id TEXT PRIMARY KEY,
-                campaign_id TEXT NOT NULL,
+                id BLOB PRIMARY KEY,
+                campaign_id BLOB NOT NULL,
                 discount_type TEXT NOT NULL,
                 discount_value REAL NOT NULL,
                 FOREIGN KEY (campaign_id) REFERENCES campaigns(id) ON DELETE CASCADE
@@ -81,8 +502,8 @@ class Database:
             cursor.execute("""
             -- Products for combo rules (many-to-many relationship)
             CREATE TABLE IF NOT EXISTS combo_rule_products (
-                combo_rule_id TEXT NOT NULL,
-                product_id TEXT NOT NULL,
+                combo_rule_id BLOB NOT NULL,
+                product_id BLOB NOT NULL,
                 PRIMARY KEY (combo_rule_id, product_id),
                 FOREIGN KEY (combo_rule_id) REFERENCES combo_rules(id) ON DELETE CASCADE
             );
@@ -91,8 +512,8 @@ class Database:
             cursor.execute("""
             -- Products for discount rules (when applies_to = 'products')
             CREATE TABLE  IF NOT EXISTS discount_rule_products (
-                discount_rule_id TEXT NOT NULL,
-                product_id TEXT NOT NULL,
+                discount_rule_id BLOB NOT NULL,
+                product_id BLOB NOT NULL,
                 PRIMARY KEY (discount_rule_id, product_id),
                 FOREIGN KEY (discount_rule_id) REFERENCES discount_rules(id)
                  ON DELETE CASCADE
@@ -101,7 +522,7 @@ class Database:
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS shifts (
-                id TEXT PRIMARY KEY,
+                id BLOB PRIMARY KEY,
                 status TEXT NOT NULL,
                 created_at TIMESTAMP NOT NULL,
                 closed_at TIMESTAMP
@@ -110,25 +531,26 @@ class Database:
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS receipts (
-                id TEXT PRIMARY KEY,
-                shift_id TEXT NOT NULL,
+                id BLOB PRIMARY KEY,
+                shift_id BLOB NOT NULL,
                 status TEXT NOT NULL,
-                subtotal REAL NOT NULL DEFAULT 0,
-                discount_amount REAL NOT NULL DEFAULT 0,
-                total REAL NOT NULL DEFAULT 0,
+                subtotal INTEGER NOT NULL DEFAULT 0,
+                discount_amount INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 0,
                 FOREIGN KEY (shift_id) REFERENCES shifts (id)
             )
             """)
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS receipt_items (
-                id TEXT PRIMARY KEY,
-                receipt_id TEXT NOT NULL,
-                product_id TEXT NOT NULL,
+                id BLOB PRIMARY KEY,
+                receipt_id BLOB NOT NULL,
+                product_id BLOB NOT NULL,
                 quantity INTEGER NOT NULL,
-                unit_price REAL NOT NULL,
-                total_price REAL NOT NULL,
-                final_price REAL NOT NULL,
+                unit_price INTEGER NOT NULL,
+                total_price INTEGER NOT NULL,
+                final_price INTEGER NOT NULL,
                 FOREIGN KEY (receipt_id) REFERENCES receipts (id),
                 FOREIGN KEY (product_id) REFERENCES products (id)
             )
@@ -136,13 +558,14 @@ class Database:
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS payments (
-                id TEXT PRIMARY KEY,
-                receipt_id TEXT NOT NULL,
-                payment_amount REAL NOT NULL,
+                id BLOB PRIMARY KEY,
+                receipt_id BLOB NOT NULL,
+                payment_amount INTEGER NOT NULL,
                 currency TEXT NOT NULL,
-                total_in_gel REAL NOT NULL,
+                total_in_gel INTEGER NOT NULL,
                 exchange_rate REAL NOT NULL,
                 status TEXT NOT NULL,
+                idempotency_key TEXT,
                 FOREIGN KEY (receipt_id) REFERENCES receipts (id)
             )
             """)
@@ -150,10 +573,10 @@ class Database:
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS receipt_item_discounts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                receipt_item_id TEXT NOT NULL,
-                campaign_id TEXT NOT NULL,
+                receipt_item_id BLOB NOT NULL,
+                campaign_id BLOB NOT NULL,
                 campaign_name TEXT NOT NULL,
-                discount_amount REAL NOT NULL,
+                discount_amount INTEGER NOT NULL,
                 FOREIGN KEY (receipt_item_id) REFERENCES receipt_items
                  (id) ON DELETE CASCADE,
                 FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
@@ -163,18 +586,137 @@ class Database:
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS receipt_discounts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                receipt_id TEXT NOT NULL,
-                campaign_id TEXT NOT NULL,
+                receipt_id BLOB NOT NULL,
+                campaign_id BLOB NOT NULL,
                 campaign_name TEXT NOT NULL,
-                discount_amount REAL NOT NULL,
+                discount_amount INTEGER NOT NULL,
                 FOREIGN KEY (receipt_id) REFERENCES receipts
                  (id) ON DELETE CASCADE,
                 FOREIGN KEY (campaign_id) REFERENCES campaigns (id)
             );
             """)
 
+            # Foreign keys used for hydration and reporting lookups
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_receipts_shift_id ON receipts (shift_id)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_receipt_items_receipt_id
+             ON receipt_items (receipt_id)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_receipt_item_discounts_item_id
+             ON receipt_item_discounts (receipt_item_id)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_receipt_discounts_receipt_id
+             ON receipt_discounts (receipt_id)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_payments_receipt_id ON payments (receipt_id)
+            """)
+            cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_product_codes_product_id
+            ON product_codes (product_id)
+            """)
+            # A payment retried with the same key finds the first attempt
+            cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_payments_idempotency_key
+            ON payments (idempotency_key)
+            """)
+            # Catalog imports upsert on the SKU; products without one are NULL
+            cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_products_sku ON products (sku)
+            """)
+
+            cursor.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """)
+            for name, tables in VERSIONED_TABLES.items():
+                cursor.execute(
+                    "INSERT OR IGNORE INTO data_versions (name) VALUES (?)", (name,)
+                )
+                for table in tables:
+                    for event in ("INSERT", "UPDATE", "DELETE"):
+                        cursor.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_version
+                        AFTER {event} ON {table}
+                        BEGIN
+                            UPDATE data_versions SET version = version + 1
+                             WHERE name = '{name}';
+                        END
+                        """)
+
+            # Product search: an external-content index over products, so the
+            # text is stored once. It is keyed on the products rowid, which
+            # migrations and VACUUM may renumber, hence the rebuild after them
+            has_search = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+            ).fetchone()
+            cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5 (
+                name,
+                sku,
+                content = 'products',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            )
+            """)
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS products_insert_search
+            AFTER INSERT ON products
+            BEGIN
+                INSERT INTO products_fts (rowid, name, sku)
+                VALUES (new.rowid, new.name, new.sku);
+            END
+            """)
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS products_delete_search
+            AFTER DELETE ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, sku)
+                VALUES ('delete', old.rowid, old.name, old.sku);
+            END
+            """)
+            cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS products_update_search
+            AFTER UPDATE OF name, sku ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, sku)
+                VALUES ('delete', old.rowid, old.name, old.sku);
+                INSERT INTO products_fts (rowid, name, sku)
+                VALUES (new.rowid, new.name, new.sku);
+            END
+            """)
+            if rebuild_search or not has_search:
+                cursor.execute(
+                    "INSERT INTO products_fts (products_fts) VALUES ('rebuild')"
+                )
+
             conn.commit()
 
+    def data_version(self, name: str) -> int:
+        """Current version of a data set listed in VERSIONED_TABLES."""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM data_versions WHERE name = ?", (name,)
+            ).fetchone()
+            return row[0] if row else 0
+
+
+def serialize_id(value: Union[UUID, str]) -> bytes:
+    """UUID (or its string form) to the 16-byte BLOB stored in the database."""
+    if isinstance(value, UUID):
+        return value.bytes
+    return UUID(value).bytes
+
+
+def deserialize_id(blob: bytes) -> UUID:
+    return UUID(bytes=blob)
+
 
 def serialize_json(obj: Any) -> str:
     return json.dumps(obj)
@@ -0,0 +1,108 @@
+"""
+Per-request query deadlines.
+
+A deadline is set for the current context with ``deadline(seconds)`` and
+holds for every query run from it, including ones run on the threads a
+request is handed to, as long as the context is carried along. Database
+connections install a SQLite progress handler that checks the deadline every
+PROGRESS_STEPS virtual machine steps and interrupts the running statement
+once it has passed, so a runaway query ends within moments of its budget
+instead of pinning a thread. Interrupted queries surface as
+QueryTimeoutError.
+
+Bulk and streaming work, whose total time grows with its input, is not held
+to one deadline; ``each_with_deadline`` gives every step of it its own.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Generator, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# SQLite VM steps between deadline checks; a check costs well under a
+# microsecond, the steps between two of them a fraction of a millisecond
+PROGRESS_STEPS = 1_000
+
+_deadline: ContextVar[Optional[float]] = ContextVar("query_deadline", default=None)
+
+
+class QueryTimeoutError(Exception):
+    """
+    A query ran past the deadline. ``started`` is False when the deadline
+    had already passed before the query could start, e.g. while it waited
+    for a connection.
+    """
+
+    def __init__(self, started: bool = True) -> None:
+        self.started = started
+        super().__init__(
+            "Query interrupted at its deadline"
+            if started
+            else "Deadline passed before the query could start"
+        )
+
+
+@contextmanager
+def deadline(seconds: float) -> Generator[None, None, None]:
+    """Run the block under a deadline ``seconds`` from now, or earlier."""
+    token = _deadline.set(_earliest(seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def each_with_deadline(items: Iterator[T], seconds: float) -> Iterator[T]:
+    """
+    Yield from ``items``, the work producing each one under its own
+    deadline ``seconds`` from when it starts. This replaces the current
+    deadline rather than shortening it, so a stream outlasting its
+    request's budget is not cut off part way.
+    """
+    while True:
+        token = _deadline.set(time.monotonic() + seconds)
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        finally:
+            _deadline.reset(token)
+        yield item
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the deadline, if there is one; never negative."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return max(0.0, current - time.monotonic())
+
+
+def check_deadline() -> None:
+    """Refuse to start work when the deadline has already passed."""
+    if remaining() == 0.0:
+        raise QueryTimeoutError(started=False)
+
+
+def install(conn: sqlite3.Connection) -> None:
+    """Interrupt statements on ``conn`` that run past the current deadline."""
+    conn.set_progress_handler(_past_deadline, PROGRESS_STEPS)
+
+
+def interrupted(error: sqlite3.OperationalError) -> bool:
+    """Whether ``error`` is a statement the deadline interrupted."""
+    return "interrupted" in str(error) and remaining() == 0.0
+
+
+def _past_deadline() -> int:
+    current = _deadline.get()
+    return int(current is not None and time.monotonic() > current)
+
+
+def _earliest(seconds: float) -> float:
+    candidate = time.monotonic() + seconds
+    current = _deadline.get()
+    return candidate if current is None else min(current, candidate)
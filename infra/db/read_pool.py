@@ -0,0 +1,107 @@
+"""
+Read-only connections for long reads.
+
+Reports scan whole tables. In WAL mode a reader works from a snapshot and
+neither blocks writers nor is blocked by them, so those scans can run on
+their own connections next to checkout writes. ``ReadOnlyPool`` keeps such
+connections, opened with ``mode=ro`` so they cannot take the write lock even
+by mistake, and bounds how many are in use at once: past the limit callers
+wait for a connection rather than adding more concurrent scans.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Generator, Optional
+
+DEFAULT_READERS = 4
+
+
+class ReadPoolTimeout(TimeoutError):
+    """No connection became free in time."""
+
+
+def read_only_uri(db_path: str) -> str:
+    """``file:`` URI opening ``db_path`` read-only."""
+    return f"{Path(db_path).resolve().as_uri()}?mode=ro"
+
+
+class ReadOnlyPool:
+    """
+    Up to ``size`` read-only connections, opened on demand and reused.
+    ``configure`` is applied to each new connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = DEFAULT_READERS,
+        busy_timeout: float = 5.0,
+        configure: Optional[Callable[[sqlite3.Connection], None]] = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self._uri = read_only_uri(db_path)
+        self._busy_timeout = busy_timeout
+        self._configure = configure
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._closed = False
+
+    @contextmanager
+    def connection(
+        self, timeout: Optional[float] = None
+    ) -> Generator[sqlite3.Connection, None, None]:
+        """
+        A read-only connection, waiting for one if all are in use; past
+        ``timeout`` seconds of waiting, ReadPoolTimeout is raised.
+        """
+        if self._closed:
+            raise RuntimeError("read pool is closed")
+        if not self._slots.acquire(timeout=timeout):
+            raise ReadPoolTimeout("no read-only connection became free")
+        try:
+            conn = self._checkout()
+            try:
+                yield conn
+            finally:
+                self._checkin(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close the idle connections; ones in use close when returned."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _checkout(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        conn = sqlite3.connect(
+            self._uri,
+            uri=True,
+            timeout=self._busy_timeout,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        if self._configure is not None:
+            self._configure(conn)
+        return conn
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        # End the read transaction so the snapshot does not pin the WAL
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
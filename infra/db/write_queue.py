@@ -0,0 +1,196 @@
+"""
+Group commit for SQLite writes.
+
+SQLite has one writer at a time and every commit waits for the disk. Writers
+on separate connections therefore queue on the database lock, retrying and
+timing out with ``database is locked`` once there are enough of them.
+
+``WriteQueue`` gives the writes a single connection on a dedicated thread
+instead. Callers submit a unit of work, a function of the connection, and get
+a future back. The writer takes whatever units are queued, up to
+``max_batch``, optionally waiting ``max_delay`` seconds for more, and runs
+them in one transaction with one commit. Each unit runs in its own savepoint:
+a unit that raises is rolled back alone and its future gets the exception,
+while the rest of the batch still commits. Futures of successful units are
+resolved only once the commit is durable.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+WriteUnit = Callable[[sqlite3.Connection], Any]
+
+DEFAULT_MAX_BATCH = 64
+# Units queue up while the previous commit is on disk, so batches form
+# without waiting; a delay trades single-writer latency for bigger batches
+DEFAULT_MAX_DELAY = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class WriteQueueStats:
+    """Counters since start; ``units`` counts committed units only."""
+
+    units: int
+    batches: int
+    failed_units: int
+    failed_batches: int
+    queued: int
+
+    @property
+    def mean_batch(self) -> float:
+        return self.units / self.batches if self.batches else 0.0
+
+
+class WriteQueue:
+    """
+    A writer thread committing queued units of work in groups.
+    ``connect`` is called once, on the writer thread. ``retrying`` wraps
+    each attempt at a batch, to retry batches refused on a locked database.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        retrying: Optional[Callable[[Callable[[], Any]], Any]] = None,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay cannot be negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._connect = connect
+        self._retrying = retrying or (lambda attempt: attempt())
+        self._queue: "queue.SimpleQueue[Optional[Tuple[WriteUnit, Future[Any]]]]" = (
+            queue.SimpleQueue()
+        )
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._units = self._batches = 0
+        self._failed_units = self._failed_batches = 0
+        self._thread = threading.Thread(
+            target=self._run, name="sqlite-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, work: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """Queue ``work``; the future resolves after its batch commits."""
+        future: Future[T] = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("write queue is closed")
+            self._queue.put((work, future))
+        return future
+
+    def close(self) -> None:
+        """Commit everything already submitted, then stop the writer."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def stats(self) -> WriteQueueStats:
+        return WriteQueueStats(
+            units=self._units,
+            batches=self._batches,
+            failed_units=self._failed_units,
+            failed_batches=self._failed_batches,
+            queued=self._queue.qsize(),
+        )
+
+    def _run(self) -> None:
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                batch, stopping = self._next_batch()
+                if batch:
+                    self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _next_batch(self) -> Tuple[List[Tuple[WriteUnit, "Future[Any]"]], bool]:
+        """Block for one unit, then take more until the batch is full."""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(
+        self, conn: sqlite3.Connection, batch: List[Tuple[WriteUnit, "Future[Any]"]]
+    ) -> None:
+        batch = [
+            (work, future)
+            for work, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        try:
+            done = self._retrying(lambda: self._run_batch(conn, batch))
+        except BaseException as e:
+            # Nothing in the batch was written; fail whatever has not failed
+            self._failed_batches += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._batches += 1
+        self._units += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+    def _run_batch(
+        self, conn: sqlite3.Connection, batch: List[Tuple[WriteUnit, "Future[Any]"]]
+    ) -> List[Tuple["Future[Any]", Any]]:
+        """One attempt at the batch, rolled back whole if it fails."""
+        done: List[Tuple["Future[Any]", Any]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for work, future in batch:
+                if future.done():
+                    # Failed alone in an earlier attempt
+                    continue
+                conn.execute("SAVEPOINT write_unit")
+                try:
+                    result = work(conn)
+                except BaseException as e:
+                    conn.execute("ROLLBACK TO write_unit")
+                    conn.execute("RELEASE write_unit")
+                    self._failed_units += 1
+                    future.set_exception(e)
+                    continue
+                conn.execute("RELEASE write_unit")
+                done.append((future, result))
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        return done
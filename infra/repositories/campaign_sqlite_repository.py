@@ -1,5 +1,5 @@
 from typing import Any, Dict, List, Union, cast
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from core.models.campaign import (
     BuyNGetNRule,
@@ -11,10 +11,24 @@ from core.models.campaign import (
 from core.models.errors import (
     CampaignDatabaseError,
     CampaignNotFoundException,
+    CampaignValidationError,
     InvalidCampaignTypeException,
 )
+from core.models.ids import uuid7
 from core.models.repositories.campaign_repository import CampaignRepository
-from infra.db.database import Database
+from infra.db.database import Database, deserialize_id, serialize_id
+
+
+def _product_key(product_id: str) -> bytes:
+    try:
+        return serialize_id(product_id)
+    except ValueError:
+        raise CampaignValidationError(f"Invalid product ID '{product_id}'")
+
+
+def _product_ref(value: Union[bytes, str]) -> str:
+    """Rule product ids are strings; legacy non-UUID values were kept as text."""
+    return str(deserialize_id(value)) if isinstance(value, bytes) else value
 
 
 class SQLiteCampaignRepository(CampaignRepository):
@@ -51,11 +65,16 @@ class SQLiteCampaignRepository(CampaignRepository):
                 cursor.execute(
                     "INSERT INTO campaigns (id, name, campaign_type, is_active)"
                     " VALUES (?, ?, ?, ?)",
-                    (campaign.id, campaign.name, campaign.campaign_type.value, 1),
+                    (
+                        serialize_id(campaign.id),
+                        campaign.name,
+                        campaign.campaign_type.value,
+                        1,
+                    ),
                 )
 
                 # Insert rule based on campaign type
-                rule_id = str(uuid4())
+                rule_id = serialize_id(uuid7())
 
                 if campaign_type == CampaignType.DISCOUNT.value:
                     discount_rule = cast(DiscountRule, rule_obj)
@@ -65,7 +84,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                         "VALUES (?, ?, ?, ?, ?)",
                         (
                             rule_id,
-                            campaign.id,
+                            serialize_id(campaign.id),
                             discount_rule.discount_value,
                             discount_rule.applies_to,
                             discount_rule.min_amount,
@@ -82,7 +101,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                                 "INSERT INTO discount_rule_products"
                                 " (discount_rule_id,"
                                 " product_id) VALUES (?, ?)",
-                                (rule_id, product_id),
+                                (rule_id, _product_key(product_id)),
                             )
 
                 elif campaign_type == CampaignType.BUY_N_GET_N.value:
@@ -94,10 +113,10 @@ class SQLiteCampaignRepository(CampaignRepository):
                         "VALUES (?, ?, ?, ?, ?, ?)",
                         (
                             rule_id,
-                            campaign.id,
-                            buy_n_get_n_rule.buy_product_id,
+                            serialize_id(campaign.id),
+                            _product_key(buy_n_get_n_rule.buy_product_id),
                             buy_n_get_n_rule.buy_quantity,
-                            buy_n_get_n_rule.get_product_id,
+                            _product_key(buy_n_get_n_rule.get_product_id),
                             buy_n_get_n_rule.get_quantity,
                         ),
                     )
@@ -110,7 +129,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                         " discount_value) VALUES (?, ?, ?, ?)",
                         (
                             rule_id,
-                            campaign.id,
+                            serialize_id(campaign.id),
                             combo_rule.discount_type,
                             combo_rule.discount_value,
                         ),
@@ -122,7 +141,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                             "INSERT INTO combo_rule_products"
                             " (combo_rule_id, product_id)"
                             " VALUES (?, ?)",
-                            (rule_id, product_id),
+                            (rule_id, _product_key(product_id)),
                         )
 
                 # Commit transaction
@@ -130,6 +149,8 @@ class SQLiteCampaignRepository(CampaignRepository):
 
             return campaign
 
+        except CampaignValidationError:
+            raise
         except Exception as e:
             # Catch any exceptions and wrap them
             raise CampaignDatabaseError(f"Failed to create campaign: {str(e)}") from e
@@ -142,7 +163,7 @@ class SQLiteCampaignRepository(CampaignRepository):
 
                 # Get campaign
                 cursor.execute(
-                    "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+                    "SELECT * FROM campaigns WHERE id = ?", (serialize_id(campaign_id),)
                 )
                 campaign_row = cursor.fetchone()
 
@@ -158,7 +179,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                 if campaign_type == CampaignType.DISCOUNT.value:
                     cursor.execute(
                         "SELECT * FROM discount_rules WHERE campaign_id = ?",
-                        (str(campaign_id),),
+                        (serialize_id(campaign_id),),
                     )
                     rule_row = cursor.fetchone()
 
@@ -175,7 +196,9 @@ class SQLiteCampaignRepository(CampaignRepository):
                             " discount_rule_id = ?",
                             (rule_row["id"],),
                         )
-                        product_ids = [row["product_id"] for row in cursor.fetchall()]
+                        product_ids = [
+                            _product_ref(row["product_id"]) for row in cursor.fetchall()
+                        ]
 
                     rule_obj = DiscountRule(
                         discount_value=rule_row["discount_value"],
@@ -187,7 +210,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                 elif campaign_type == CampaignType.BUY_N_GET_N.value:
                     cursor.execute(
                         "SELECT * FROM buy_n_get_n_rules WHERE campaign_id = ?",
-                        (str(campaign_id),),
+                        (serialize_id(campaign_id),),
                     )
                     rule_row = cursor.fetchone()
 
@@ -198,16 +221,16 @@ class SQLiteCampaignRepository(CampaignRepository):
                         )
 
                     rule_obj = BuyNGetNRule(
-                        buy_product_id=rule_row["buy_product_id"],
+                        buy_product_id=_product_ref(rule_row["buy_product_id"]),
                         buy_quantity=rule_row["buy_quantity"],
-                        get_product_id=rule_row["get_product_id"],
+                        get_product_id=_product_ref(rule_row["get_product_id"]),
                         get_quantity=rule_row["get_quantity"],
                     )
 
                 elif campaign_type == CampaignType.COMBO.value:
                     cursor.execute(
                         "SELECT * FROM combo_rules WHERE campaign_id = ?",
-                        (str(campaign_id),),
+                        (serialize_id(campaign_id),),
                     )
                     rule_row = cursor.fetchone()
 
@@ -222,7 +245,9 @@ class SQLiteCampaignRepository(CampaignRepository):
                         "combo_rule_id = ?",
                         (rule_row["id"],),
                     )
-                    product_ids = [row["product_id"] for row in cursor.fetchall()]
+                    product_ids = [
+                        _product_ref(row["product_id"]) for row in cursor.fetchall()
+                    ]
 
                     rule_obj = ComboRule(
                         product_ids=product_ids,
@@ -237,7 +262,7 @@ class SQLiteCampaignRepository(CampaignRepository):
 
                 # Create and return Campaign object
                 return Campaign(
-                    id=campaign_row["id"],
+                    id=str(deserialize_id(campaign_row["id"])),
                     name=campaign_row["name"],
                     campaign_type=CampaignType(campaign_row["campaign_type"]),
                     rules=rule_obj,
@@ -261,7 +286,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                 campaigns: List[Campaign] = []
                 for campaign_row in campaign_rows:
                     # Get the campaign by ID (reuse existing method)
-                    campaign = self.get_by_id(UUID(campaign_row["id"]))
+                    campaign = self.get_by_id(deserialize_id(campaign_row["id"]))
                     campaigns.append(campaign)
 
                 return campaigns
@@ -276,7 +301,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                 cursor = conn.cursor()
                 cursor.execute(
                     "UPDATE campaigns SET is_active = 0 WHERE id = ?",
-                    (str(campaign_id),),
+                    (serialize_id(campaign_id),),
                 )
                 conn.commit()
 
@@ -306,7 +331,7 @@ class SQLiteCampaignRepository(CampaignRepository):
                 campaigns: List[Campaign] = []
                 for campaign_row in campaign_rows:
                     # Get the campaign by ID (reuse existing method)
-                    campaign = self.get_by_id(UUID(campaign_row["id"]))
+                    campaign = self.get_by_id(deserialize_id(campaign_row["id"]))
                     campaigns.append(campaign)
 
                 return campaigns
@@ -316,3 +341,7 @@ class SQLiteCampaignRepository(CampaignRepository):
             raise CampaignDatabaseError(
                 f"Failed to get active campaigns: {str(e)}"
             ) from e
+
+    def version(self) -> int:
+        """Changes whenever a campaign or one of its rules is written."""
+        return self.db.data_version("campaigns")
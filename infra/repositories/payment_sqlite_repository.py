@@ -2,9 +2,10 @@ from typing import List
 from uuid import UUID
 
 from core.models.errors import PaymentUpdateFailedException
+from core.models.money import to_major, to_minor
 from core.models.receipt import Currency, Payment, PaymentStatus
 from core.models.repositories.payment_repository import PaymentRepository
-from infra.db.database import Database
+from infra.db.database import Database, deserialize_id, serialize_id
 
 
 class SQLitePaymentRepository(PaymentRepository):
@@ -35,11 +36,11 @@ class SQLitePaymentRepository(PaymentRepository):
                     currency, total_in_gel, exchange_rate, status) 
                    VALUES (?, ?, ?, ?, ?, ?, ?)""",
                 (
-                    str(payment.id),
-                    str(payment.receipt_id),
-                    payment.payment_amount,
+                    serialize_id(payment.id),
+                    serialize_id(payment.receipt_id),
+                    to_minor(payment.payment_amount),
                     payment.currency.value,
-                    payment.total_in_gel,
+                    to_minor(payment.total_in_gel),
                     payment.exchange_rate,
                     payment.status.value,
                 ),
@@ -52,35 +53,36 @@ class SQLitePaymentRepository(PaymentRepository):
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE payments SET status = ? WHERE id = ?", (status, str(payment_id))
+                "UPDATE payments SET status = ? WHERE id = ?",
+                (status, serialize_id(payment_id)),
             )
             conn.commit()
 
             if cursor.rowcount > 0:
                 cursor.execute(
-                    "SELECT * FROM payments WHERE id = ?", (str(payment_id),)
+                    "SELECT * FROM payments WHERE id = ?", (serialize_id(payment_id),)
                 )
                 row = cursor.fetchone()
 
                 if row:
-                    payment = Payment(
-                        id=UUID(row["id"]),
-                        receipt_id=row["receipt_id"],
-                        payment_amount=row["payment_amount"],
+                    return Payment(
+                        id=deserialize_id(row["id"]),
+                        receipt_id=deserialize_id(row["receipt_id"]),
+                        payment_amount=to_major(row["payment_amount"]),
                         currency=Currency(row["currency"]),
-                        total_in_gel=row["total_in_gel"],
+                        total_in_gel=to_major(row["total_in_gel"]),
                         exchange_rate=row["exchange_rate"],
                         status=PaymentStatus(row["status"]),
                     )
-                raise PaymentUpdateFailedException(payment_id)
-        return payment
+            raise PaymentUpdateFailedException(payment_id)
 
     def get_by_receipt(self, receipt_id: UUID) -> List[Payment]:
         """Retrieve all payments associated with a receipt."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT * FROM payments WHERE receipt_id = ?", (str(receipt_id),)
+                "SELECT * FROM payments WHERE receipt_id = ?",
+                (serialize_id(receipt_id),),
             )
             rows = cursor.fetchall()
 
@@ -89,11 +91,11 @@ class SQLitePaymentRepository(PaymentRepository):
                 try:
                     # Ensure all required fields are present and valid
                     payment = Payment(
-                        id=UUID(row["id"]),
-                        receipt_id=UUID(row["receipt_id"]),
-                        payment_amount=float(row["payment_amount"]),
+                        id=deserialize_id(row["id"]),
+                        receipt_id=deserialize_id(row["receipt_id"]),
+                        payment_amount=to_major(row["payment_amount"]),
                         currency=Currency(row["currency"]),
-                        total_in_gel=float(row["total_in_gel"]),
+                        total_in_gel=to_major(row["total_in_gel"]),
                         exchange_rate=float(row["exchange_rate"]),
                         status=PaymentStatus(row["status"]),
                     )
@@ -0,0 +1,168 @@
+import dataclasses
+import threading
+from contextlib import contextmanager
+from typing import Dict, Generator, Iterator, List, Mapping, Optional, Sequence
+from uuid import UUID
+
+from core.models.product import CatalogEntry, Product
+from core.models.repositories.product_repository import ProductRepository
+
+
+class CachedProductRepository(ProductRepository):
+    """
+    In-process read-through cache in front of another product repository.
+    The catalog is small and read-mostly: ``warm_up`` loads all of it at
+    startup, lookups are then served from memory, and writes made through
+    this repository replace the affected entry. Writes made elsewhere are
+    not seen by lookups until ``invalidate`` is called.
+
+    The catalog version is the database's, never a local count, so it names
+    the same contents in every process. The full listing is reloaded
+    whenever that version has moved since it was loaded.
+
+    Reads that overlap a write do not fill the cache: what they fetched may
+    predate the write and would otherwise stay cached with no expiry.
+    """
+
+    def __init__(self, repository: ProductRepository):
+        self.repository = repository
+        self._products: Dict[UUID, Product] = {}
+        self._codes: Dict[str, UUID] = {}
+        self._complete = False
+        # Database catalog version the full listing was loaded at
+        self._loaded_version: Optional[int] = None
+        # Bumped as each write starts and ends, and on invalidation
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        """Load the whole catalog and its codes, one query each."""
+        while True:
+            writes = self._writes
+            version = self.repository.version()
+            products = self.repository.get_all()
+            codes = self.repository.get_all_codes()
+            with self._lock:
+                if self._writes != writes:
+                    continue  # a write overlapped the load; load again
+                self._products = {product.id: product for product in products}
+                self._codes = codes
+                self._complete = True
+                self._loaded_version = version
+                return
+
+    def invalidate(self, product_id: Optional[UUID] = None) -> None:
+        """Drop one product, or the whole catalog, from the cache."""
+        with self._lock:
+            self._writes += 1
+            if product_id is None:
+                self._products = {}
+                self._codes = {}
+                self._complete = False
+            else:
+                self._products.pop(product_id, None)
+
+    def create(self, name: str, price: float) -> Product:
+        with self._writing():
+            product = self.repository.create(name, price)
+            self._store(product)
+        return product
+
+    def get_by_id(self, product_id: UUID) -> Optional[Product]:
+        product = self._products.get(product_id)
+        if product is None:
+            writes = self._writes
+            product = self.repository.get_by_id(product_id)
+            if product is not None:
+                with self._lock:
+                    if self._writes == writes:
+                        product = self._products.setdefault(product.id, product)
+        return product
+
+    def get_all(self) -> List[Product]:
+        if not self._complete or self.repository.version() != self._loaded_version:
+            self.warm_up()
+        return list(self._products.values())
+
+    def get_page(self, after: Optional[UUID], limit: int) -> List[Product]:
+        # Pages and streams come from the database in key order
+        return self.repository.get_page(after, limit)
+
+    def iter_all(self) -> Iterator[Product]:
+        return self.repository.iter_all()
+
+    def search(self, query: str, limit: int) -> List[Product]:
+        return self.repository.search(query, limit)
+
+    def get_by_code(self, code: str) -> Optional[Product]:
+        code = code.strip()
+        product_id = self._codes.get(code)
+        if product_id is not None:
+            return self.get_by_id(product_id)
+
+        writes = self._writes
+        product = self.repository.get_by_code(code)
+        if product is not None:
+            with self._lock:
+                if self._writes == writes:
+                    self._codes.setdefault(code, product.id)
+                    product = self._products.setdefault(product.id, product)
+        return product
+
+    def get_codes(self, product_id: UUID) -> List[str]:
+        return self.repository.get_codes(product_id)
+
+    def get_all_codes(self) -> Dict[str, UUID]:
+        return self.repository.get_all_codes()
+
+    def add_codes(self, product_id: UUID, codes: Sequence[str]) -> None:
+        with self._writing():
+            self.repository.add_codes(product_id, codes)
+            with self._lock:
+                for code in codes:
+                    self._codes[code.strip()] = product_id
+
+    def update_price(self, product_id: UUID, price: float) -> Optional[Product]:
+        with self._writing():
+            with self._lock:
+                self._products.pop(product_id, None)
+            product = self.repository.update_price(product_id, price)
+            if product is not None:
+                self._store(product)
+        return product
+
+    def update_prices(self, prices: Mapping[UUID, float]) -> int:
+        with self._writing():
+            updated = self.repository.update_prices(prices)
+            with self._lock:
+                for product_id, price in prices.items():
+                    product = self._products.get(product_id)
+                    if product is not None:
+                        self._products[product_id] = dataclasses.replace(
+                            product, price=price
+                        )
+        return updated
+
+    def upsert_many(self, entries: Sequence[CatalogEntry]) -> None:
+        # Imports touch many products; reload the catalog on next use
+        self.repository.upsert_many(entries)
+        self.invalidate()
+
+    def version(self) -> int:
+        """The database's catalog version."""
+        return self.repository.version()
+
+    @contextmanager
+    def _writing(self) -> Generator[None, None, None]:
+        """Mark a write, so reads overlapping it do not fill the cache."""
+        with self._lock:
+            self._writes += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writes += 1
+
+    def _store(self, product: Product) -> None:
+        with self._lock:
+            self._products[product.id] = product
@@ -1,10 +1,36 @@
-from typing import List, Optional
-from uuid import UUID, uuid4
+import re
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from uuid import UUID
 
-from core.models.errors import ProductNotFoundError
-from core.models.product import Product
+from core.models.errors import ProductCodeConflictError, ProductNotFoundError
+from core.models.ids import uuid7
+from core.models.money import to_major, to_minor
+from core.models.product import CatalogEntry, Product
 from core.models.repositories.product_repository import ProductRepository
-from infra.db.database import Database
+from infra.db.database import Database, deserialize_id, serialize_id
+
+# Products per keyset page when streaming the catalog
+STREAM_FETCH_SIZE = 500
+# Searches rank every match, at a few microseconds a row. A query shorter
+# than SHORT_QUERY characters can match most of a large catalog on every
+# keystroke, so it ranks only the first SEARCH_CANDIDATES matches instead
+SHORT_QUERY = 3
+SEARCH_CANDIDATES = 2_000
+
+
+def _product(row: sqlite3.Row) -> Product:
+    return Product(
+        id=deserialize_id(row["id"]), name=row["name"], price=to_major(row["price"])
+    )
+
+
+def _prefix_match(query: str) -> str:
+    """
+    An FTS5 query matching every word of ``query`` as a prefix. Words are
+    quoted, so punctuation and FTS operators typed by a user are plain text.
+    """
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
 
 
 class SQLiteProductRepository(ProductRepository):
@@ -12,13 +38,13 @@ class SQLiteProductRepository(ProductRepository):
         self.db = db
 
     def create(self, name: str, price: float) -> Product:
-        product = Product(id=uuid4(), name=name, price=price)
+        product = Product(id=uuid7(), name=name, price=price)
 
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO products (id, name, price) VALUES (?, ?, ?)",
-                (str(product.id), product.name, product.price),
+                (serialize_id(product.id), product.name, to_minor(product.price)),
             )
             conn.commit()
 
@@ -27,12 +53,18 @@ class SQLiteProductRepository(ProductRepository):
     def get_by_id(self, product_id: UUID) -> Optional[Product]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM products WHERE id = ?", (str(product_id),))
+            cursor.execute(
+                "SELECT * FROM products WHERE id = ?", (serialize_id(product_id),)
+            )
             row = cursor.fetchone()
 
             if row is None:
                 raise ProductNotFoundError(str(product_id))
-            return Product(id=row["id"], name=row["name"], price=row["price"])
+            return Product(
+                id=deserialize_id(row["id"]),
+                name=row["name"],
+                price=to_major(row["price"]),
+            )
 
     def get_all(self) -> List[Product]:
         with self.db.get_connection() as conn:
@@ -41,18 +73,187 @@ class SQLiteProductRepository(ProductRepository):
             rows = cursor.fetchall()
 
             return [
-                Product(id=row["id"], name=row["name"], price=row["price"])
+                Product(
+                    id=deserialize_id(row["id"]),
+                    name=row["name"],
+                    price=to_major(row["price"]),
+                )
                 for row in rows
             ]
 
+    def get_page(self, after: Optional[UUID], limit: int) -> List[Product]:
+        """
+        Up to ``limit`` products in id order, starting after ``after``.
+        Keyset pagination: each page is a range scan of the primary key, so
+        late pages cost the same as the first.
+        """
+        with self.db.get_connection() as conn:
+            if after is None:
+                rows = conn.execute(
+                    "SELECT id, name, price FROM products ORDER BY id LIMIT ?",
+                    (limit,),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT id, name, price FROM products WHERE id > ?"
+                    " ORDER BY id LIMIT ?",
+                    (serialize_id(after), limit),
+                ).fetchall()
+            return [_product(row) for row in rows]
+
+    def iter_all(self) -> Iterator[Product]:
+        """
+        Every product in id order, a keyset page at a time as consumed. Each
+        page has its own connection, opened and closed while it is read, so
+        nothing is held between pages: a streamed response may resume on
+        another thread, or be abandoned, between any two of them.
+        """
+        after: Optional[UUID] = None
+        while page := self.get_page(after, STREAM_FETCH_SIZE):
+            yield from page
+            if len(page) < STREAM_FETCH_SIZE:
+                return
+            after = page[-1].id
+
+    def search(self, query: str, limit: int) -> List[Product]:
+        """
+        Products whose name or SKU has words starting with every word of
+        ``query``, best matches first. Short queries are ranked among their
+        first SEARCH_CANDIDATES matches only.
+        """
+        match = _prefix_match(query)
+        if not match:
+            return []
+        short = len(re.sub(r"\W", "", query)) < SHORT_QUERY
+        # FTS5 ranks and keeps the best ``limit`` itself with ORDER BY rank
+        ranked = "" if short else "ORDER BY rank"
+        with self.db.get_connection() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT p.id, p.name, p.price
+                FROM (
+                    SELECT rowid, rank FROM products_fts
+                    WHERE products_fts MATCH ?
+                    {ranked}
+                    LIMIT ?
+                ) AS hits
+                JOIN products p ON p.rowid = hits.rowid
+                ORDER BY hits.rank
+                LIMIT ?
+                """,
+                (match, SEARCH_CANDIDATES if short else limit, limit),
+            ).fetchall()
+            return [_product(row) for row in rows]
+
+    def get_by_code(self, code: str) -> Optional[Product]:
+        """The product a barcode or SKU belongs to, in one indexed lookup."""
+        with self.db.get_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT p.id, p.name, p.price
+                FROM product_codes c
+                JOIN products p ON p.id = c.product_id
+                WHERE c.code = ?
+                """,
+                (code.strip(),),
+            ).fetchone()
+            return _product(row) if row else None
+
+    def get_codes(self, product_id: UUID) -> List[str]:
+        with self.db.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT code FROM product_codes WHERE product_id = ? ORDER BY code",
+                (serialize_id(product_id),),
+            ).fetchall()
+            return [row["code"] for row in rows]
+
+    def get_all_codes(self) -> Dict[str, UUID]:
+        with self.db.get_connection() as conn:
+            rows = conn.execute("SELECT code, product_id FROM product_codes")
+            return {row["code"]: deserialize_id(row["product_id"]) for row in rows}
+
+    def add_codes(self, product_id: UUID, codes: Sequence[str]) -> None:
+        """
+        Attach codes to a product in one transaction. Codes it already has
+        are kept; a code belonging to another product rejects the batch.
+        """
+        product_key = serialize_id(product_id)
+        with self.db.versioned_write("products") as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM products WHERE id = ?", (product_key,)
+            ).fetchone()
+            if exists is None:
+                raise ProductNotFoundError(str(product_id))
+
+            for code in codes:
+                code = code.strip()
+                cursor = conn.execute(
+                    "INSERT INTO product_codes (code, product_id) VALUES (?, ?)"
+                    " ON CONFLICT (code) DO NOTHING",
+                    (code, product_key),
+                )
+                if cursor.rowcount == 0:
+                    (owner,) = conn.execute(
+                        "SELECT product_id FROM product_codes WHERE code = ?", (code,)
+                    ).fetchone()
+                    if owner != product_key:
+                        raise ProductCodeConflictError(code)
+
     def update_price(self, product_id: UUID, price: float) -> Optional[Product]:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "UPDATE products SET price = ? WHERE id = ?", (price, str(product_id))
+                "UPDATE products SET price = ? WHERE id = ?",
+                (to_minor(price), serialize_id(product_id)),
             )
             conn.commit()
 
             if cursor.rowcount <= 0:
                 raise ProductNotFoundError(str(product_id))
             return self.get_by_id(product_id)
+
+    def upsert_many(self, entries: Sequence[CatalogEntry]) -> None:
+        """Insert or update products by SKU in a single transaction."""
+        with self.db.versioned_write("products") as conn:
+            conn.executemany(
+                "INSERT INTO products (id, sku, name, price) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (sku) DO UPDATE"
+                " SET name = excluded.name, price = excluded.price",
+                [
+                    (uuid7().bytes, entry.sku, entry.name, to_minor(entry.price))
+                    for entry in entries
+                ],
+            )
+
+    def update_prices(self, prices: Mapping[UUID, float]) -> int:
+        """
+        Set many prices in one transaction with one catalog version bump.
+        Nothing is changed if any of the products does not exist.
+        """
+        if not prices:
+            return 0
+        with self.db.versioned_write("products") as conn:
+            cursor = conn.executemany(
+                "UPDATE products SET price = ? WHERE id = ?",
+                [
+                    (to_minor(price), serialize_id(product_id))
+                    for product_id, price in prices.items()
+                ],
+            )
+            if cursor.rowcount != len(prices):
+                raise ProductNotFoundError(str(self._first_missing(conn, prices)))
+            return cursor.rowcount
+
+    @staticmethod
+    def _first_missing(conn: sqlite3.Connection, product_ids: Iterable[UUID]) -> UUID:
+        for product_id in product_ids:
+            found = conn.execute(
+                "SELECT 1 FROM products WHERE id = ?", (serialize_id(product_id),)
+            ).fetchone()
+            if found is None:
+                return product_id
+        raise AssertionError("every product exists")
+
+    def version(self) -> int:
+        """Catalog version; changes whenever a product is written."""
+        return self.db.data_version("products")
@@ -1,8 +1,14 @@
-import uuid
-from typing import List
-from uuid import UUID, uuid4
-
-from core.models.errors import ReceiptNotFoundError
+import sqlite3
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from core.models.errors import (
+    IdempotencyKeyReusedError,
+    ReceiptNotFoundError,
+    ReceiptVersionConflictError,
+)
+from core.models.ids import uuid7
+from core.models.money import to_major, to_minor
 from core.models.receipt import (
     Currency,
     Discount,
@@ -13,7 +19,19 @@ from core.models.receipt import (
     ReceiptStatus,
 )
 from core.models.repositories.receipt_repository import ReceiptRepository
-from infra.db.database import Database
+from infra.db.database import Database, deserialize_id, serialize_id
+
+
+def _payment(row: sqlite3.Row) -> Payment:
+    return Payment(
+        id=deserialize_id(row["id"]),
+        receipt_id=deserialize_id(row["receipt_id"]),
+        payment_amount=to_major(row["payment_amount"]),
+        currency=Currency(row["currency"]),
+        total_in_gel=to_major(row["total_in_gel"]),
+        exchange_rate=row["exchange_rate"],
+        status=PaymentStatus(row["status"]),
+    )
 
 
 class SQLiteReceiptRepository(ReceiptRepository):
@@ -22,151 +40,262 @@ class SQLiteReceiptRepository(ReceiptRepository):
 
     def create(self, shift_id: UUID) -> Receipt:
         """Create a new receipt."""
-        receipt_id = uuid4()
+        receipt_id = uuid7()
 
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        def insert(conn: sqlite3.Connection) -> None:
+            conn.cursor().execute(
                 """
                 INSERT INTO receipts (id, shift_id, status, subtotal, 
                 discount_amount, total)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
                 (
-                    str(receipt_id),
-                    str(shift_id),
+                    serialize_id(receipt_id),
+                    serialize_id(shift_id),
                     ReceiptStatus.OPEN.value,
                     0,
                     0,
                     0,
                 ),
             )
-            conn.commit()
+
+        self.db.write(insert)
 
         return Receipt(shift_id=shift_id, id=receipt_id)
 
     def get(self, receipt_id: UUID) -> Receipt:
         """Get a receipt by ID with all its items, discounts, and payments."""
         with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get receipt basic info
-            cursor.execute(
-                "SELECT * FROM receipts WHERE id = ?",
-                (str(receipt_id),),
-            )
-            receipt_row = cursor.fetchone()
-
-            if not receipt_row:
-                raise ReceiptNotFoundError(str(receipt_id))
-
-            receipt = Receipt(
-                id=UUID(receipt_row["id"]),
-                shift_id=UUID(receipt_row["shift_id"]),
+            return self._load(conn.cursor(), receipt_id)
+
+    def _load(self, cursor: sqlite3.Cursor, receipt_id: UUID) -> Receipt:
+        # Get receipt basic info
+        cursor.execute(
+            "SELECT * FROM receipts WHERE id = ?",
+            (serialize_id(receipt_id),),
+        )
+        receipt_row = cursor.fetchone()
+
+        if not receipt_row:
+            raise ReceiptNotFoundError(str(receipt_id))
+
+        return self._hydrate(
+            cursor, [receipt_row], "receipt_id = ?", (serialize_id(receipt_id),)
+        )[0]
+
+    def _hydrate(
+        self,
+        cursor: sqlite3.Cursor,
+        receipt_rows: Sequence[Any],
+        scope: str,
+        params: Tuple[Any, ...],
+    ) -> List[Receipt]:
+        """
+        Build receipts with their discounts, items and payments.
+        Runs a fixed three queries for any number of receipts and items;
+        ``scope`` is a WHERE clause selecting the rows by ``receipt_id``.
+        """
+        receipts: Dict[str, Receipt] = {}
+        for receipt_row in receipt_rows:
+            receipts[receipt_row["id"]] = Receipt(
+                id=deserialize_id(receipt_row["id"]),
+                shift_id=deserialize_id(receipt_row["shift_id"]),
                 status=ReceiptStatus(receipt_row["status"]),
-                subtotal=receipt_row["subtotal"],
-                discount_amount=receipt_row["discount_amount"],
-                total=receipt_row["total"],
-            )
-
-            # Get receipt-level discounts
-            cursor.execute(
-                "SELECT * FROM receipt_discounts WHERE receipt_id = ?",
-                (str(receipt_id),),
+                subtotal=to_major(receipt_row["subtotal"]),
+                discount_amount=to_major(receipt_row["discount_amount"]),
+                total=to_major(receipt_row["total"]),
+                version=receipt_row["version"],
             )
-            receipt_discount_rows = cursor.fetchall()
 
-            for discount_row in receipt_discount_rows:
-                print(discount_row["campaign_id"])
-                discount = Discount(
-                    campaign_id=UUID(discount_row["campaign_id"]),
+        # Get receipt-level discounts
+        cursor.execute(f"SELECT * FROM receipt_discounts WHERE {scope}", params)
+        for discount_row in cursor.fetchall():
+            receipts[discount_row["receipt_id"]].discounts.append(
+                Discount(
+                    campaign_id=deserialize_id(discount_row["campaign_id"]),
                     campaign_name=discount_row["campaign_name"],
-                    discount_amount=discount_row["discount_amount"],
+                    discount_amount=to_major(discount_row["discount_amount"]),
                 )
-                receipt.discounts.append(discount)
-
-            # Get receipt items
-            cursor.execute(
-                "SELECT * FROM receipt_items WHERE receipt_id = ?",
-                (str(receipt_id),),
             )
-            item_rows = cursor.fetchall()
 
-            for item_row in item_rows:
+        # Get receipt items together with their discounts
+        cursor.execute(
+            "SELECT ri.id AS item_id, ri.receipt_id, ri.product_id, ri.quantity,"
+            " ri.unit_price, ri.total_price, ri.final_price,"
+            " d.campaign_id, d.campaign_name, d.discount_amount"
+            " FROM receipt_items ri"
+            " LEFT JOIN receipt_item_discounts d ON d.receipt_item_id = ri.id"
+            f" WHERE ri.{scope}"
+            " ORDER BY ri.rowid, d.id",
+            params,
+        )
+        item: Optional[ReceiptItem] = None
+        item_id = None
+        for item_row in cursor.fetchall():
+            if item is None or item_row["item_id"] != item_id:
+                item_id = item_row["item_id"]
                 item = ReceiptItem(
-                    product_id=UUID(item_row["product_id"]),
+                    product_id=deserialize_id(item_row["product_id"]),
                     quantity=item_row["quantity"],
-                    unit_price=item_row["unit_price"],
-                )
-                item.total_price = item_row["total_price"]
-                item.final_price = item_row["final_price"]
-
-                # Get discounts for this item
-                cursor.execute(
-                    "SELECT * FROM receipt_item_discounts WHERE receipt_item_id = ?",
-                    (item_row["id"],),
+                    unit_price=to_major(item_row["unit_price"]),
                 )
-                discount_rows = cursor.fetchall()
+                item.total_price = to_major(item_row["total_price"])
+                item.final_price = to_major(item_row["final_price"])
+                receipts[item_row["receipt_id"]].products.append(item)
 
-                for discount_row in discount_rows:
-                    discount = Discount(
-                        campaign_id=UUID(discount_row["campaign_id"]),
-                        campaign_name=discount_row["campaign_name"],
-                        discount_amount=discount_row["discount_amount"],
+            if item_row["campaign_id"] is not None:
+                item.discounts.append(
+                    Discount(
+                        campaign_id=deserialize_id(item_row["campaign_id"]),
+                        campaign_name=item_row["campaign_name"],
+                        discount_amount=to_major(item_row["discount_amount"]),
                     )
-                    item.discounts.append(discount)
-
-                receipt.products.append(item)
-
-            # Get payments
-            cursor.execute(
-                "SELECT * FROM payments WHERE receipt_id = ?",
-                (str(receipt_id),),
-            )
-            payment_rows = cursor.fetchall()
-
-            for payment_row in payment_rows:
-                payment = Payment(
-                    id=UUID(payment_row["id"]),
-                    receipt_id=UUID(payment_row["receipt_id"]),
-                    payment_amount=payment_row["payment_amount"],
-                    currency=Currency(payment_row["currency"]),
-                    total_in_gel=payment_row["total_in_gel"],
-                    exchange_rate=payment_row["exchange_rate"],
-                    status=PaymentStatus(payment_row["status"]),
                 )
-                receipt.payments.append(payment)
-
-            return receipt
 
-    def update_status(self, receipt_id: UUID, status: ReceiptStatus) -> Receipt:
-        """Update the status of a receipt."""
+        # Get payments
+        cursor.execute(f"SELECT * FROM payments WHERE {scope}", params)
+        for payment_row in cursor.fetchall():
+            receipts[payment_row["receipt_id"]].payments.append(_payment(payment_row))
+
+        return list(receipts.values())
+
+    def update_status(
+        self,
+        receipt_id: UUID,
+        status: ReceiptStatus,
+        expected_version: Optional[int] = None,
+    ) -> Receipt:
+        """
+        Update the status of a receipt. With ``expected_version``, only if no
+        other write has changed the receipt since that version was read.
+        """
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE receipts SET status = ? WHERE id = ?",
-                (status.value, str(receipt_id)),
-            )
+            if expected_version is None:
+                cursor.execute(
+                    "UPDATE receipts SET status = ?, version = version + 1"
+                    " WHERE id = ?",
+                    (status.value, serialize_id(receipt_id)),
+                )
+            else:
+                cursor.execute(
+                    "UPDATE receipts SET status = ?, version = version + 1"
+                    " WHERE id = ? AND version = ?",
+                    (status.value, serialize_id(receipt_id), expected_version),
+                )
             conn.commit()
+            if cursor.rowcount == 0:
+                self._refuse(cursor, receipt_id)
 
         return self.get(receipt_id)
 
-    def add_payment(self, receipt_id: UUID, payment: Payment) -> Receipt:
-        """Add a payment to a receipt."""
-
-        return self.get(receipt_id)
+    @staticmethod
+    def _refuse(cursor: sqlite3.Cursor, receipt_id: UUID) -> None:
+        """Raise for a compare-and-swap that matched no row."""
+        cursor.execute(
+            "SELECT 1 FROM receipts WHERE id = ?", (serialize_id(receipt_id),)
+        )
+        if cursor.fetchone() is None:
+            raise ReceiptNotFoundError(str(receipt_id))
+        raise ReceiptVersionConflictError(str(receipt_id))
+
+    def add_payment(
+        self,
+        receipt_id: UUID,
+        amount: float,
+        currency: Currency,
+        exchange_rate: float,
+        idempotency_key: Optional[str] = None,
+    ) -> Optional[Tuple[Payment, Receipt]]:
+        """
+        Pay a receipt in one transaction: read it once, store the payment and
+        close the receipt if the payment covers it. A payment made earlier
+        with the same ``idempotency_key`` is returned as it was stored, so a
+        retried request is not charged twice. None if the receipt is closed.
+        """
+        return self.db.write(
+            lambda conn: self._pay(
+                conn.cursor(),
+                receipt_id,
+                amount,
+                currency,
+                exchange_rate,
+                idempotency_key,
+            )
+        )
+
+    def _pay(
+        self,
+        cursor: sqlite3.Cursor,
+        receipt_id: UUID,
+        amount: float,
+        currency: Currency,
+        exchange_rate: float,
+        idempotency_key: Optional[str],
+    ) -> Optional[Tuple[Payment, Receipt]]:
+        if idempotency_key is not None:
+            cursor.execute(
+                "SELECT * FROM payments WHERE idempotency_key = ?",
+                (idempotency_key,),
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                payment = _payment(row)
+                if (payment.receipt_id, payment.currency) != (
+                    receipt_id,
+                    currency,
+                ) or to_minor(payment.payment_amount) != to_minor(amount):
+                    raise IdempotencyKeyReusedError(idempotency_key)
+                return payment, self._load(cursor, receipt_id)
+
+        receipt = self._load(cursor, receipt_id)
+        if receipt.status == ReceiptStatus.CLOSED:
+            return None
+
+        payment = receipt.settle(amount, currency, exchange_rate)
+        cursor.execute(
+            """INSERT INTO payments
+               (id, receipt_id, payment_amount, currency, total_in_gel,
+                exchange_rate, status, idempotency_key)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                serialize_id(payment.id),
+                serialize_id(receipt_id),
+                to_minor(payment.payment_amount),
+                payment.currency.value,
+                to_minor(payment.total_in_gel),
+                payment.exchange_rate,
+                payment.status.value,
+                idempotency_key,
+            ),
+        )
+        # The write lock is held since the read, so no version check is
+        # needed; the bump tells concurrent editors the receipt changed
+        cursor.execute(
+            "UPDATE receipts SET status = ?, version = version + 1 WHERE id = ?",
+            (receipt.status.value, serialize_id(receipt_id)),
+        )
+        receipt.version += 1
+        return payment, receipt
 
     def get_receipts_by_shift(self, shift_id: UUID) -> List[Receipt]:
         """Get all receipts for a shift."""
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT id FROM receipts WHERE shift_id = ?",
-                (str(shift_id),),
+                "SELECT * FROM receipts WHERE shift_id = ?",
+                (serialize_id(shift_id),),
+            )
+            receipt_rows = cursor.fetchall()
+            if not receipt_rows:
+                return []
+
+            return self._hydrate(
+                cursor,
+                receipt_rows,
+                "receipt_id IN (SELECT id FROM receipts WHERE shift_id = ?)",
+                (serialize_id(shift_id),),
             )
-            receipt_ids = [row["id"] for row in cursor.fetchall()]
-
-        return [self.get(UUID(receipt_id)) for receipt_id in receipt_ids]
 
     def add_receipt_discount(self, receipt_id: UUID, discount: Discount) -> Receipt:
         """Add a receipt-level discount."""
@@ -179,10 +308,10 @@ class SQLiteReceiptRepository(ReceiptRepository):
                 VALUES (?, ?, ?, ?)
                 """,
                 (
-                    str(receipt_id),
-                    str(discount.campaign_id),
+                    serialize_id(receipt_id),
+                    serialize_id(discount.campaign_id),
                     discount.campaign_name,
-                    discount.discount_amount,
+                    to_minor(discount.discount_amount),
                 ),
             )
 
@@ -191,13 +320,14 @@ class SQLiteReceiptRepository(ReceiptRepository):
                 """
                 UPDATE receipts 
                 SET discount_amount = discount_amount + ?,
-                    total = subtotal - (discount_amount + ?)
+                    total = subtotal - (discount_amount + ?),
+                    version = version + 1
                 WHERE id = ?
                 """,
                 (
-                    discount.discount_amount,
-                    discount.discount_amount,
-                    str(receipt_id),
+                    to_minor(discount.discount_amount),
+                    to_minor(discount.discount_amount),
+                    serialize_id(receipt_id),
                 ),
             )
             conn.commit()
@@ -205,220 +335,129 @@ class SQLiteReceiptRepository(ReceiptRepository):
         return self.get(receipt_id)
 
     def update(self, receipt_id: UUID, updated_receipt: Receipt) -> Receipt:
-        with self.db.get_connection() as conn:
-            cursor = conn.cursor()
-
-            # Update the receipt record
-            cursor.execute(
-                """UPDATE receipts 
-                   SET subtotal = ?, discount_amount = ?, total = ?
-                   WHERE id = ?""",
-                (
-                    updated_receipt.subtotal,
-                    updated_receipt.discount_amount,
-                    updated_receipt.total,
-                    str(receipt_id),
-                ),
-            )
-
-            # Handle receipt-level discounts
-            cursor.execute(
-                "DELETE FROM receipt_discounts WHERE receipt_id = ?", (str(receipt_id),)
-            )
-
-            if hasattr(updated_receipt, "discounts") and updated_receipt.discounts:
-                for discount in updated_receipt.discounts:
-                    cursor.execute(
-                        """INSERT INTO receipt_discounts
-                           (receipt_id, campaign_id, campaign_name, discount_amount)
-                           VALUES (?, ?, ?, ?)""",
-                        (
-                            str(receipt_id),
-                            str(discount.campaign_id),
-                            discount.campaign_name,
-                            discount.discount_amount,
-                        ),
-                    )
-
-            # Handle receipt items - first delete existing items
-            cursor.execute(
-                "DELETE FROM receipt_items WHERE receipt_id = ?", (str(receipt_id),)
-            )
-            cursor.execute(
-                "DELETE FROM receipt_item_discounts WHERE receipt_item_id IN "
-                "(SELECT id FROM receipt_items WHERE receipt_id = ?)",
-                (str(receipt_id),),
-            )
-
-            # Insert updated items
-            for item in updated_receipt.products:
-                # Generate a new ID for each item if not present
-                item_id = str(uuid.uuid4()) if not hasattr(item, "id") else str(item.id)
-
+        """
+        Rewrite the receipt, provided it is still at the version it was read
+        at; otherwise another request changed it in between and
+        ReceiptVersionConflictError is raised with nothing written. On
+        success ``updated_receipt`` is moved to the new version.
+        """
+        stored = self.db.write(
+            lambda conn: self._rewrite(conn.cursor(), receipt_id, updated_receipt)
+        )
+        updated_receipt.version = stored.version
+        return stored
+
+    def _rewrite(
+        self, cursor: sqlite3.Cursor, receipt_id: UUID, updated_receipt: Receipt
+    ) -> Receipt:
+        # Update the receipt record
+        cursor.execute(
+            """UPDATE receipts 
+               SET subtotal = ?, discount_amount = ?, total = ?,
+                   version = version + 1
+               WHERE id = ? AND version = ?""",
+            (
+                to_minor(updated_receipt.subtotal),
+                to_minor(updated_receipt.discount_amount),
+                to_minor(updated_receipt.total),
+                serialize_id(receipt_id),
+                updated_receipt.version,
+            ),
+        )
+        if cursor.rowcount == 0:
+            self._refuse(cursor, receipt_id)
+
+        # Handle receipt-level discounts
+        cursor.execute(
+            "DELETE FROM receipt_discounts WHERE receipt_id = ?",
+            (serialize_id(receipt_id),),
+        )
+
+        if hasattr(updated_receipt, "discounts") and updated_receipt.discounts:
+            for discount in updated_receipt.discounts:
                 cursor.execute(
-                    """INSERT INTO receipt_items 
-                       (id, receipt_id, product_id, quantity, unit_price,
-                        total_price, final_price) 
-                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    """INSERT INTO receipt_discounts
+                       (receipt_id, campaign_id, campaign_name, discount_amount)
+                       VALUES (?, ?, ?, ?)""",
                     (
-                        item_id,
-                        str(receipt_id),
-                        str(item.product_id),
-                        item.quantity,
-                        item.unit_price,
-                        item.total_price,
-                        item.final_price,
+                        serialize_id(receipt_id),
+                        serialize_id(discount.campaign_id),
+                        discount.campaign_name,
+                        to_minor(discount.discount_amount),
                     ),
                 )
 
-                # Handle item discounts
-                for discount in item.discounts:
-                    cursor.execute(
-                        """INSERT INTO receipt_item_discounts
-                           (receipt_item_id, campaign_id, campaign_name,
-                            discount_amount)
-                           VALUES (?, ?, ?, ?)""",
-                        (
-                            item_id,
-                            str(discount.campaign_id),
-                            discount.campaign_name,
-                            discount.discount_amount,
-                        ),
-                    )
-
-            # Handle payments if needed
-            if hasattr(updated_receipt, "payments") and updated_receipt.payments:
-                cursor.execute(
-                    "DELETE FROM payments WHERE receipt_id = ?", (str(receipt_id),)
-                )
-
-                for payment in updated_receipt.payments:
-                    payment_id = (
-                        str(uuid.uuid4())
-                        if not hasattr(payment, "id")
-                        else str(payment.id)
-                    )
-                    cursor.execute(
-                        """INSERT INTO payments
-                           (id, receipt_id, payment_amount, currency, total_in_gel,
-                            exchange_rate, status)
-                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            payment_id,
-                            str(receipt_id),
-                            payment.payment_amount,
-                            payment.currency,
-                            payment.total_in_gel,
-                            payment.exchange_rate,
-                            payment.status,
-                        ),
-                    )
-
-            conn.commit()
-
-            # Fetch the updated receipt
-            cursor.execute("SELECT * FROM receipts WHERE id = ?", (str(receipt_id),))
-            receipt_data = cursor.fetchone()
-
-            if not receipt_data:
-                raise ValueError(f"Receipt with id {receipt_id} not found after update")
-
-            # Get receipt-level discounts
-            cursor.execute(
-                "SELECT campaign_id, "
-                "campaign_name, discount_amount"
-                " FROM receipt_discounts "
-                "WHERE receipt_id = ?",
-                (str(receipt_id),),
-            )
-            receipt_discount_data = cursor.fetchall()
+        # Handle receipt items - first delete existing items and their
+        # discounts (discounts first, while the items can still be found)
+        cursor.execute(
+            "DELETE FROM receipt_item_discounts WHERE receipt_item_id IN "
+            "(SELECT id FROM receipt_items WHERE receipt_id = ?)",
+            (serialize_id(receipt_id),),
+        )
+        cursor.execute(
+            "DELETE FROM receipt_items WHERE receipt_id = ?",
+            (serialize_id(receipt_id),),
+        )
+
+        # Insert updated items
+        for item in updated_receipt.products:
+            # Generate a new ID for each item if not present
+            item_id = serialize_id(uuid7() if not hasattr(item, "id") else item.id)
 
-            # Build receipt-level discounts list
-            receipt_discounts = []
-            for disc in receipt_discount_data:
-                receipt_discounts.append(
-                    Discount(
-                        campaign_id=uuid.UUID(disc[0]),
-                        campaign_name=disc[1],
-                        discount_amount=disc[2],
-                    )
-                )
-
-            # Get the items for this receipt
             cursor.execute(
-                "SELECT id, product_id, quantity, unit_price FROM receipt_items"
-                " WHERE receipt_id = ?",
-                (str(receipt_id),),
+                """INSERT INTO receipt_items 
+                   (id, receipt_id, product_id, quantity, unit_price,
+                    total_price, final_price) 
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    item_id,
+                    serialize_id(receipt_id),
+                    serialize_id(item.product_id),
+                    item.quantity,
+                    to_minor(item.unit_price),
+                    to_minor(item.total_price),
+                    to_minor(item.final_price),
+                ),
             )
-            items_data = cursor.fetchall()
 
-            # Rebuild receipt items
-            items = []
-            for item_data in items_data:
-                item_id = item_data[0]
-
-                # Get discounts for this item
+            # Handle item discounts
+            for discount in item.discounts:
                 cursor.execute(
-                    """SELECT campaign_id, campaign_name, discount_amount 
-                       FROM receipt_item_discounts 
-                       WHERE receipt_item_id = ?""",
-                    (item_id,),
+                    """INSERT INTO receipt_item_discounts
+                       (receipt_item_id, campaign_id, campaign_name,
+                        discount_amount)
+                       VALUES (?, ?, ?, ?)""",
+                    (
+                        item_id,
+                        serialize_id(discount.campaign_id),
+                        discount.campaign_name,
+                        to_minor(discount.discount_amount),
+                    ),
                 )
-                discount_data = cursor.fetchall()
-
-                # Build discounts list
-                discounts = []
-                for disc in discount_data:
-                    discounts.append(
-                        Discount(
-                            campaign_id=uuid.UUID(disc[0]),
-                            campaign_name=disc[1],
-                            discount_amount=disc[2],
-                        )
-                    )
 
-                items.append(
-                    ReceiptItem(
-                        product_id=uuid.UUID(item_data[1]),
-                        quantity=item_data[2],
-                        unit_price=item_data[3],
-                        discounts=discounts,
-                    )
+        # Handle payments if needed; stored payments are updated in place
+        # so they keep the idempotency keys they were made with
+        if hasattr(updated_receipt, "payments") and updated_receipt.payments:
+            for payment in updated_receipt.payments:
+                payment_id = serialize_id(
+                    uuid7() if not hasattr(payment, "id") else payment.id
                 )
-
-            # Get payments if any
-            payments = []
-            if hasattr(updated_receipt, "payments"):
                 cursor.execute(
-                    "SELECT id, payment_amount, currency,"
-                    " total_in_gel, exchange_rate, status "
-                    "FROM payments WHERE receipt_id = ?",
-                    (str(receipt_id),),
+                    """INSERT INTO payments
+                       (id, receipt_id, payment_amount, currency, total_in_gel,
+                        exchange_rate, status)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (id) DO UPDATE SET status = excluded.status""",
+                    (
+                        payment_id,
+                        serialize_id(receipt_id),
+                        to_minor(payment.payment_amount),
+                        payment.currency.value,
+                        to_minor(payment.total_in_gel),
+                        payment.exchange_rate,
+                        payment.status.value,
+                    ),
                 )
-                payment_data = cursor.fetchall()
-
-                for pay in payment_data:
-                    payments.append(
-                        Payment(
-                            id=uuid.UUID(pay[0]),
-                            receipt_id=uuid.UUID(pay[1]),
-                            payment_amount=pay[2],
-                            currency=pay[3],
-                            total_in_gel=pay[4],
-                            exchange_rate=pay[5],
-                            status=pay[6],
-                        )
-                    )
 
-            # Construct and return the updated Receipt object
-            return Receipt(
-                id=uuid.UUID(receipt_data[0]),
-                shift_id=uuid.UUID(receipt_data[1]),
-                status=receipt_data[2],
-                subtotal=receipt_data[3],
-                discount_amount=receipt_data[4],
-                total=receipt_data[5],
-                products=items,
-                payments=payments if hasattr(updated_receipt, "payments") else [],
-                discounts=receipt_discounts,
-            )
+        # Fetch the updated receipt
+        return self._load(cursor, receipt_id)
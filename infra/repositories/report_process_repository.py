@@ -0,0 +1,225 @@
+"""
+Report generation in worker processes.
+
+Reports decode and aggregate many rows in Python, holding the GIL while they
+do, which slows every other request served by the same process. The
+``ProcessReportRepository`` runs them in a pool of worker processes instead.
+Each worker opens its own read-only connection once and sends back only the
+aggregated report.
+
+A report can be cancelled, and one that runs past its timeout is cancelled
+for the caller. Cancellation reaches a running worker through a flag in
+shared memory that the worker's SQLite progress handler checks, so the query
+is interrupted in the worker and nothing in the API process is touched; the
+worker stays in the pool for the next report.
+"""
+
+import multiprocessing
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from core.models.errors import ReportTimeoutError
+from core.models.report import SalesReport, ShiftReport
+from core.models.repositories.report_repository import ReportRepository
+from infra.api.schemas.shift import ShiftUpdate
+from infra.db.deadline import remaining
+from infra.db.read_pool import read_only_uri
+from infra.repositories.report_sqlite_repository import sales_report, shift_report
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
+
+DEFAULT_REPORT_PROCESSES = 2
+DEFAULT_REPORT_TIMEOUT = 30.0
+# Reports queued or running at once; one cancellation flag each
+MAX_PENDING_REPORTS = 32
+# SQLite VM steps between cancellation checks
+PROGRESS_STEPS = 10_000
+
+REPORTS: Dict[str, Callable[..., Any]] = {
+    "sales": sales_report,
+    "shift": shift_report,
+}
+
+# Set in each worker process by _start_worker
+_connection: Optional[sqlite3.Connection] = None
+_cancelled: Any = None
+
+
+def _start_worker(db_path: str, cancelled: Any) -> None:
+    global _connection, _cancelled
+    _connection = sqlite3.connect(read_only_uri(db_path), uri=True)
+    _connection.row_factory = sqlite3.Row
+    _cancelled = cancelled
+
+
+def _ready() -> None:
+    pass
+
+
+def _run_report(name: str, slot: int, timeout: float, *args: Any) -> Any:
+    """Run in a worker: the report, interrupted if flagged or out of time."""
+    assert _connection is not None
+    deadline = time.monotonic() + timeout
+
+    def interrupt() -> int:
+        return int(bool(_cancelled[slot]) or time.monotonic() > deadline)
+
+    _connection.set_progress_handler(interrupt, PROGRESS_STEPS)
+    try:
+        return REPORTS[name](_connection, *args)
+    finally:
+        _connection.set_progress_handler(None, 0)
+        if _connection.in_transaction:
+            _connection.rollback()
+
+
+class ReportJob:
+    """
+    A submitted report: wait for its result or cancel it. A job given a
+    ``deadline``, a time.monotonic() value, is due by then; ``budget`` is
+    the seconds it was given, as reported when it runs out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        future: "Future[Any]",
+        interrupt: Callable[[], None],
+        deadline: Optional[float] = None,
+        budget: float = 0.0,
+    ):
+        self.name = name
+        self.future = future
+        self.deadline = deadline
+        self.budget = budget
+        self.cancel_requested = False
+        self._interrupt = interrupt
+
+    def cancel(self) -> None:
+        """Drop the report if queued, or interrupt it if running."""
+        self.cancel_requested = True
+        if not self.future.cancel():
+            self._interrupt()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        The report, waiting up to ``timeout`` seconds for it, by default
+        until the job's deadline. On timeout the report is cancelled and
+        ReportTimeoutError raised; a cancelled report raises CancelledError.
+        """
+        budget = self.budget if timeout is None else timeout
+        if timeout is None and self.deadline is not None:
+            timeout = max(0.0, self.deadline - time.monotonic())
+        try:
+            return self.future.result(timeout)
+        except FutureTimeoutError:
+            self.cancel()
+            raise ReportTimeoutError(self.name, budget) from None
+        except sqlite3.OperationalError as e:
+            if "interrupted" not in str(e):
+                raise
+            if self.cancel_requested:
+                raise CancelledError() from None
+            raise ReportTimeoutError(self.name, budget) from None
+
+
+class ProcessReportRepository(ReportRepository):
+    """
+    Reports from a pool of ``processes`` workers, each allowed ``timeout``
+    seconds. Z-reports still close the shift from this process.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        shift_repository: SQLiteShiftRepository,
+        processes: int = DEFAULT_REPORT_PROCESSES,
+        timeout: float = DEFAULT_REPORT_TIMEOUT,
+    ) -> None:
+        self.shift_repository = shift_repository
+        self.timeout = timeout
+        # Spawned, not forked: the API process runs threads
+        context = multiprocessing.get_context("spawn")
+        self._cancelled = context.RawArray("b", MAX_PENDING_REPORTS)
+        self._slots_lock = threading.Lock()
+        self._free_slots: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        for slot in range(MAX_PENDING_REPORTS):
+            self._free_slots.put(slot)
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context,
+            initializer=_start_worker,
+            initargs=(db_path, self._cancelled),
+        )
+
+    def submit(
+        self, name: str, *args: Any, timeout: Optional[float] = None
+    ) -> ReportJob:
+        """
+        Start report ``name`` from REPORTS, due within ``timeout`` seconds,
+        the repository's timeout by default. Waiting for a free slot while
+        MAX_PENDING_REPORTS are in flight counts against that time; the
+        worker gets what is left.
+        """
+        budget = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + budget
+        try:
+            slot = self._free_slots.get(timeout=budget)
+        except queue.Empty:
+            raise ReportTimeoutError(name, budget) from None
+
+        self._cancelled[slot] = 0
+        left = max(0.0, deadline - time.monotonic())
+        future = self._executor.submit(_run_report, name, slot, left, *args)
+        future.add_done_callback(lambda _: self._release(slot))
+        return ReportJob(
+            name, future, lambda: self._interrupt(future, slot), deadline, budget
+        )
+
+    def warm_up(self) -> None:
+        """Start the workers now rather than on the first reports."""
+        for future in [self._executor.submit(_ready) for _ in range(self.processes)]:
+            future.result()
+
+    def generate_sales_report(self) -> SalesReport:
+        report: SalesReport = self.submit("sales", timeout=self._budget()).result()
+        return report
+
+    def generate_shift_report(self, shift_id: UUID) -> ShiftReport:
+        job = self.submit("shift", shift_id, timeout=self._budget())
+        report: ShiftReport = job.result()
+        return report
+
+    def generate_z_report(self, shift_id: UUID) -> ShiftReport:
+        report = self.generate_shift_report(shift_id)
+        self.shift_repository.update_status(
+            shift_id, ShiftUpdate(status="closed"), datetime.now()
+        )
+        return report
+
+    def close(self) -> None:
+        """Cancel queued reports and stop the workers."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _budget(self) -> float:
+        """The timeout, cut short by the caller's query deadline if sooner."""
+        left = remaining()
+        return self.timeout if left is None else min(self.timeout, left)
+
+    def _interrupt(self, future: "Future[Any]", slot: int) -> None:
+        # Under the lock a running report still owns its slot, so the flag
+        # cannot land on a report submitted after this one finished
+        with self._slots_lock:
+            if not future.done():
+                self._cancelled[slot] = 1
+
+    def _release(self, slot: int) -> None:
+        with self._slots_lock:
+            self._free_slots.put(slot)
@@ -1,16 +1,17 @@
 from datetime import datetime
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from core.models.errors import (
     ShiftNotFoundError,
     ShiftStatusError,
     ShiftStatusValueError,
 )
+from core.models.ids import uuid7
 from core.models.repositories.shift_repository import ShiftRepository
 from core.models.shift import Shift, ShiftStatus
 from infra.api.schemas.shift import ShiftUpdate
-from infra.db.database import Database
+from infra.db.database import Database, deserialize_id, serialize_id
 
 
 class SQLiteShiftRepository(ShiftRepository):
@@ -18,14 +19,19 @@ class SQLiteShiftRepository(ShiftRepository):
         self.db = db
 
     def create(self) -> Shift:
-        shift = Shift(id=uuid4())
+        shift = Shift(id=uuid7())
 
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "INSERT INTO shifts (id, status,"
                 " created_at, closed_at) VALUES (?, ?, ?, ?)",
-                (str(shift.id), shift.status.value, shift.created_at, shift.closed_at),
+                (
+                    serialize_id(shift.id),
+                    shift.status.value,
+                    shift.created_at,
+                    shift.closed_at,
+                ),
             )
             conn.commit()
 
@@ -34,14 +40,16 @@ class SQLiteShiftRepository(ShiftRepository):
     def get_by_id(self, shift_id: UUID) -> Shift:
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM shifts WHERE id = ?", (str(shift_id),))
+            cursor.execute(
+                "SELECT * FROM shifts WHERE id = ?", (serialize_id(shift_id),)
+            )
             row = cursor.fetchone()
 
             if row is None:
                 raise ShiftNotFoundError(str(shift_id))
 
             return Shift(
-                id=UUID(row["id"]),
+                id=deserialize_id(row["id"]),
                 status=ShiftStatus(row["status"]),
                 created_at=datetime.fromisoformat(row["created_at"]),
                 closed_at=datetime.fromisoformat(row["closed_at"])
@@ -68,7 +76,11 @@ class SQLiteShiftRepository(ShiftRepository):
 
             cursor.execute(
                 "UPDATE shifts SET status = ?, closed_at = ? WHERE id = ?",
-                (status_enum.value, closed_at or datetime.now(), str(shift_id)),
+                (
+                    status_enum.value,
+                    closed_at or datetime.now(),
+                    serialize_id(shift_id),
+                ),
             )
             conn.commit()
 
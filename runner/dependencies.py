@@ -2,25 +2,32 @@
 Dependency injection container and provider functions.
 """
 
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import lru_cache
 
 from core.models.repositories.campaign_repository import CampaignRepository
 from core.models.repositories.product_repository import ProductRepository
 from core.models.repositories.receipt_repository import ReceiptRepository
+from core.models.repositories.report_repository import ReportRepository
 from core.models.repositories.shift_repository import ShiftRepository
 from core.services.campaign_service import CampaignService
 from core.services.discount_service import DiscountService
 from core.services.exchange_rate_service import ExchangeRateService
+from core.services.keyed_lock import KeyedLock
+from core.services.pricing import IncrementalPricer, PricingCache
 from core.services.product_service import ProductService
 from core.services.receipt_service import ReceiptService
 from core.services.report_service import ReportService
 from core.services.shift_service import ShiftService
 from infra.db.database import Database
+from infra.db.read_pool import DEFAULT_READERS
 from infra.repositories.campaign_sqlite_repository import SQLiteCampaignRepository
 from infra.repositories.payment_sqlite_repository import SQLitePaymentRepository
+from infra.repositories.product_cached_repository import CachedProductRepository
 from infra.repositories.product_sqlite_repository import SQLiteProductRepository
 from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from infra.repositories.report_process_repository import ProcessReportRepository
 from infra.repositories.report_sqlite_repository import SQLiteReportRepository
 from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
 
@@ -48,23 +55,30 @@ class AppContainer:
 
 
 @lru_cache()
-def get_app_container(db_path: str) -> AppContainer:
+def get_app_container(db_path: str, report_processes: int = 0) -> AppContainer:
     """
     Creates and returns the application container.
-    Uses lru_cache to ensure single instance.
+    Uses lru_cache to ensure single instance. With ``report_processes``,
+    reports are generated in that many worker processes.
     """
     # Initialize database
     database = Database(db_path)
 
     # Initialize repositories
-    product_repository = SQLiteProductRepository(database)
+    product_repository = CachedProductRepository(SQLiteProductRepository(database))
+    product_repository.warm_up()
     receipt_repository = SQLiteReceiptRepository(database)
     campaign_repository = SQLiteCampaignRepository(database)
     shift_repository = SQLiteShiftRepository(database)
     payment_repository = SQLitePaymentRepository(database)
-    report_repository = SQLiteReportRepository(
+    report_repository: ReportRepository = SQLiteReportRepository(
         database, receipt_repository, shift_repository
     )
+    if report_processes:
+        report_repository = ProcessReportRepository(
+            db_path, shift_repository, report_processes
+        )
+        report_repository.warm_up()
 
     # Initialize services
     exchange_service = ExchangeRateService()  # Removed receipt_repository argument
@@ -81,6 +95,8 @@ def get_app_container(db_path: str) -> AppContainer:
     discount_service = DiscountService(
         campaign_repository=campaign_repository,  # Added campaign_repository,
         product_repository=product_repository,
+        cache=PricingCache(),
+        pricer=IncrementalPricer(),
     )
 
     receipt_service = ReceiptService(
@@ -142,3 +158,19 @@ def get_shift_service() -> ShiftService:
 def get_discount_calculation_service() -> DiscountService:
     container = get_app_container(DEFAULT_DB_PATH)
     return container.discount_service
+
+
+@lru_cache()
+def get_receipt_locks() -> KeyedLock:
+    """Per-receipt locks, shared by every request in this process."""
+    return KeyedLock()
+
+
+@lru_cache()
+def get_report_executor() -> Executor:
+    """
+    Threads for report queries, apart from the pool serving other requests,
+    so that queued reports never hold threads checkout requests need. One
+    per read-only connection; more would only wait for a connection.
+    """
+    return ThreadPoolExecutor(max_workers=DEFAULT_READERS, thread_name_prefix="reports")
@@ -0,0 +1,100 @@
+"""
+Bulk catalog import from the command line.
+
+Streams a CSV (``sku,name,price`` header) or NDJSON file into the database,
+upserting products by SKU in batched transactions. Progress is printed after
+every batch and rejected rows are written to an NDJSON error file.
+
+Usage:
+    python -m runner.import_products catalog.csv --db pos.db
+    python -m runner.import_products catalog.ndjson --errors rejected.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional, Sequence, TextIO
+
+from core.services.product_import import (
+    DEFAULT_BATCH_SIZE,
+    FORMATS,
+    ImportProgress,
+    import_products,
+)
+from infra.db.database import Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+def run_import(
+    db_path: str,
+    source: TextIO,
+    import_format: str,
+    errors: TextIO,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    out: TextIO = sys.stdout,
+) -> ImportProgress:
+    """Import ``source`` into the database and return the final totals."""
+    repository = SQLiteProductRepository(Database(db_path))
+    summary = ImportProgress(0, 0, 0, 0, 0.0)
+    for event in import_products(repository, source, import_format, batch_size):
+        if isinstance(event, ImportProgress):
+            summary = event
+            rate = event.rows / event.elapsed if event.elapsed else 0.0
+            print(
+                f"batch {event.batches}: {event.rows} rows read, "
+                f"{event.imported} imported, {event.rejected} rejected "
+                f"({rate:,.0f} rows/s)",
+                file=out,
+                flush=True,
+            )
+        else:
+            errors.write(json.dumps(asdict(event)) + "\n")
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import a product catalog.")
+    parser.add_argument("source", help="CSV or NDJSON file, or - for stdin.")
+    parser.add_argument("--db", default="pos.db")
+    parser.add_argument(
+        "--format", choices=FORMATS, help="Defaults to the file extension."
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument(
+        "--errors", help="Rejected rows go here; defaults to <source>.errors.ndjson"
+    )
+    args = parser.parse_args(argv)
+
+    source_path = Path(args.source)
+    import_format = args.format or (
+        "ndjson" if source_path.suffix in (".ndjson", ".jsonl") else "csv"
+    )
+    errors_path = Path(args.errors or f"{args.source}.errors.ndjson")
+    if args.source == "-" and not args.errors:
+        errors_path = Path("import.errors.ndjson")
+
+    with open(errors_path, "w", encoding="utf-8") as errors:
+        if args.source == "-":
+            summary = run_import(
+                args.db, sys.stdin, import_format, errors, args.batch_size
+            )
+        else:
+            with open(source_path, encoding="utf-8", newline="") as source:
+                summary = run_import(
+                    args.db, source, import_format, errors, args.batch_size
+                )
+
+    print(
+        f"Imported {summary.imported} of {summary.rows} rows into {args.db} "
+        f"in {summary.elapsed:.1f}s"
+    )
+    if summary.rejected:
+        print(f"{summary.rejected} rows rejected, see {errors_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""
+Checkout-flow load generator.
+
+Simulates concurrent cashier lanes running the real checkout flow against the
+API: open a shift, then per receipt create it, scan items, ask for a quote and
+pay, and finally take an X-report and a Z-report. The app is driven in-process
+through an ASGI transport by default, or over HTTP against a running uvicorn
+when ``--base-url`` is given.
+
+Usage:
+    python -m runner.load_test --lanes 8 --receipts 25 --items 6
+    python -m runner.load_test --lanes 8 --group-commit
+    python -m runner.load_test --base-url http://127.0.0.1:8000 --lanes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+from infra.api.app import app
+from runner import dependencies
+
+STEPS = (
+    "open_shift",
+    "create_receipt",
+    "scan",
+    "quote",
+    "pay",
+    "x_report",
+    "z_report",
+)
+LOCK_MARKERS = ("database is locked", "DATABASE_LOCKED")
+CURRENCIES = ("GEL", "USD", "EUR")
+
+
+@dataclass
+class LoadTestConfig:
+    """Workload shape; the same config must be reused to compare runs."""
+
+    lanes: int = 4
+    receipts_per_lane: int = 10
+    items_per_receipt: int = 5
+    catalog_size: int = 100
+    campaign_count: int = 10
+    seed: int = 42
+    base_url: Optional[str] = None
+    db_path: Optional[str] = None
+    group_commit: bool = False
+    report_processes: int = 0
+
+
+@dataclass
+class StepStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    lock_errors: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": len(self.latencies),
+            "errors": self.errors,
+            "lock_errors": self.lock_errors,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+        }
+
+
+@dataclass
+class LoadTestResult:
+    config: LoadTestConfig
+    duration: float
+    checkouts: int
+    steps: Dict[str, StepStats]
+
+    @property
+    def requests(self) -> int:
+        return sum(len(stats.latencies) for stats in self.steps.values())
+
+    @property
+    def lock_errors(self) -> int:
+        return sum(stats.lock_errors for stats in self.steps.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = self.duration or 1e-9
+        return {
+            "config": self.config.__dict__,
+            "duration_s": self.duration,
+            "checkouts": self.checkouts,
+            "checkouts_per_s": self.checkouts / duration,
+            "requests_per_s": self.requests / duration,
+            "lock_errors": self.lock_errors,
+            "steps": {name: stats.summary() for name, stats in self.steps.items()},
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[min(int(rank), len(ordered)) - 1]
+
+
+class _Recorder:
+    """Times every request and classifies failures per step."""
+
+    def __init__(self) -> None:
+        self.steps: Dict[str, StepStats] = {name: StepStats() for name in STEPS}
+
+    async def call(
+        self, step: str, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> Optional[httpx.Response]:
+        stats = self.steps[step]
+        started = time.perf_counter()
+        try:
+            response = await send()
+        except Exception as e:
+            stats.latencies.append(time.perf_counter() - started)
+            stats.errors += 1
+            if any(marker in str(e) for marker in LOCK_MARKERS):
+                stats.lock_errors += 1
+            return None
+
+        stats.latencies.append(time.perf_counter() - started)
+        if response.is_success:
+            return response
+
+        stats.errors += 1
+        if any(marker in response.text for marker in LOCK_MARKERS):
+            stats.lock_errors += 1
+        return None
+
+
+async def _seed_store(
+    client: httpx.AsyncClient, config: LoadTestConfig, rng: random.Random
+) -> List[str]:
+    """Create the catalog and a mix of all campaign types through the API."""
+    product_ids: List[str] = []
+    for index in range(config.catalog_size):
+        response = await client.post(
+            "/products/",
+            json={
+                "name": f"Product {index}",
+                "price": round(rng.uniform(0.5, 50.0), 2),
+            },
+        )
+        response.raise_for_status()
+        product_ids.append(response.json()["product"]["id"])
+
+    for index in range(config.campaign_count):
+        kind = index % 3
+        if kind == 0:
+            rules: Dict[str, Any] = {
+                "discount_value": rng.choice([5, 10, 15, 20]),
+                "applies_to": "product",
+                "product_ids": rng.sample(product_ids, min(3, len(product_ids))),
+            }
+            if index % 2:
+                rules = {
+                    "discount_value": rng.choice([5, 10]),
+                    "applies_to": "receipt",
+                    "min_amount": rng.choice([50, 100, 200]),
+                }
+            campaign_type = "discount"
+        elif kind == 1:
+            rules = {
+                "buy_product_id": rng.choice(product_ids),
+                "buy_quantity": rng.randint(2, 3),
+                "get_product_id": rng.choice(product_ids),
+                "get_quantity": 1,
+            }
+            campaign_type = "buy_n_get_n"
+        else:
+            rules = {
+                "product_ids": rng.sample(product_ids, min(2, len(product_ids))),
+                "discount_type": rng.choice(["percentage", "fixed"]),
+                "discount_value": rng.choice([5, 10]),
+            }
+            campaign_type = "combo"
+
+        response = await client.post(
+            "/campaigns/",
+            json={
+                "name": f"Campaign {index}",
+                "campaign_type": campaign_type,
+                "rules": rules,
+            },
+        )
+        response.raise_for_status()
+
+    return product_ids
+
+
+async def _run_lane(
+    client: httpx.AsyncClient,
+    recorder: _Recorder,
+    config: LoadTestConfig,
+    product_ids: List[str],
+    rng: random.Random,
+) -> int:
+    """Run one cashier lane to completion and return its paid checkouts."""
+    shift = await recorder.call("open_shift", lambda: client.post("/shifts/"))
+    if shift is None:
+        return 0
+    shift_id = shift.json()["shift"]["id"]
+
+    checkouts = 0
+    for _ in range(config.receipts_per_lane):
+        created = await recorder.call(
+            "create_receipt",
+            lambda: client.post("/receipts/", json={"shift_id": shift_id}),
+        )
+        if created is None:
+            continue
+        receipt_id = created.json()["receipt"]["id"]
+
+        for _ in range(config.items_per_receipt):
+            scan = {
+                "product_id": rng.choice(product_ids),
+                "quantity": rng.randint(1, 3),
+            }
+            await recorder.call(
+                "scan",
+                lambda: client.post(f"/receipts/{receipt_id}/products", json=scan),
+            )
+
+        currency = rng.choice(CURRENCIES)
+        quote = await recorder.call(
+            "quote",
+            lambda: client.post(
+                f"/receipts/receipts/{receipt_id}/quotes", json={"currency": currency}
+            ),
+        )
+        if quote is None:
+            continue
+        due = quote.json()["quote"]["total_in_requested_currency"]
+
+        paid = await recorder.call(
+            "pay",
+            lambda: client.post(
+                f"/receipts/{receipt_id}/payments",
+                json={"amount": round(due * 1.01 + 0.01, 2), "currency": currency},
+            ),
+        )
+        if paid is not None:
+            checkouts += 1
+
+    await recorder.call(
+        "x_report", lambda: client.get("/x-reports", params={"shift_id": shift_id})
+    )
+    await recorder.call("z_report", lambda: client.patch(f"/z-report/{shift_id}"))
+    return checkouts
+
+
+async def _drive(client: httpx.AsyncClient, config: LoadTestConfig) -> LoadTestResult:
+    rng = random.Random(config.seed)
+    product_ids = await _seed_store(client, config, rng)
+
+    recorder = _Recorder()
+    lane_rngs = [random.Random(config.seed + lane) for lane in range(config.lanes)]
+    started = time.perf_counter()
+    checkouts = await asyncio.gather(
+        *(
+            _run_lane(client, recorder, config, product_ids, lane_rng)
+            for lane_rng in lane_rngs
+        )
+    )
+    duration = time.perf_counter() - started
+
+    return LoadTestResult(
+        config=config,
+        duration=duration,
+        checkouts=sum(checkouts),
+        steps=recorder.steps,
+    )
+
+
+async def run_load_test(config: LoadTestConfig) -> LoadTestResult:
+    """Run the workload in-process, or against ``config.base_url`` if set."""
+    if config.base_url:
+        async with httpx.AsyncClient(base_url=config.base_url, timeout=60) as client:
+            return await _drive(client, config)
+
+    db_path = config.db_path or os.path.join(tempfile.mkdtemp(), "loadtest.db")
+    container = dependencies.get_app_container(db_path, config.report_processes)
+    overrides = {
+        dependencies.get_receipt_service: lambda: container.receipt_service,
+        dependencies.get_product_service: lambda: container.product_service,
+        dependencies.get_campaign_service: lambda: container.campaign_service,
+        dependencies.get_report_service: lambda: container.report_service,
+        dependencies.get_shift_service: lambda: container.shift_service,
+    }
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides.update(overrides)
+    if config.group_commit:
+        container.db.start_write_queue()
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", timeout=60
+        ) as client:
+            return await _drive(client, config)
+    finally:
+        app.dependency_overrides = previous
+        container.db.stop_write_queue()
+
+
+def format_result(result: LoadTestResult) -> str:
+    data = result.to_dict()
+    lines = [
+        f"{result.config.lanes} lanes, {result.checkouts} checkouts "
+        f"in {result.duration:.2f}s",
+        f"throughput: {data['checkouts_per_s']:.1f} checkouts/s, "
+        f"{data['requests_per_s']:.1f} requests/s, "
+        f"lock errors: {result.lock_errors}",
+        f"{'step':<15}{'count':>7}{'errors':>8}{'locked':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for name, summary in data["steps"].items():
+        lines.append(
+            f"{name:<15}{summary['count']:>7}{summary['errors']:>8}"
+            f"{summary['lock_errors']:>8}{summary['p50_ms']:>10.2f}"
+            f"{summary['p95_ms']:>10.2f}{summary['p99_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Checkout-flow load test.")
+    parser.add_argument("--lanes", type=int, default=LoadTestConfig.lanes)
+    parser.add_argument(
+        "--receipts", type=int, default=LoadTestConfig.receipts_per_lane
+    )
+    parser.add_argument("--items", type=int, default=LoadTestConfig.items_per_receipt)
+    parser.add_argument("--catalog", type=int, default=LoadTestConfig.catalog_size)
+    parser.add_argument("--campaigns", type=int, default=LoadTestConfig.campaign_count)
+    parser.add_argument("--seed", type=int, default=LoadTestConfig.seed)
+    parser.add_argument("--base-url", help="Target a running server instead.")
+    parser.add_argument("--db", help="Database file for in-process runs.")
+    parser.add_argument(
+        "--group-commit",
+        action="store_true",
+        help="Commit receipt writes in groups on a writer thread.",
+    )
+    parser.add_argument(
+        "--report-processes",
+        type=int,
+        default=0,
+        help="Generate reports in this many worker processes.",
+    )
+    parser.add_argument("--json", help="Write the result as JSON to this file.")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(args.log_level)
+    config = LoadTestConfig(
+        lanes=args.lanes,
+        receipts_per_lane=args.receipts,
+        items_per_receipt=args.items,
+        catalog_size=args.catalog,
+        campaign_count=args.campaigns,
+        seed=args.seed,
+        base_url=args.base_url,
+        db_path=args.db,
+        group_commit=args.group_commit,
+        report_processes=args.report_processes,
+    )
+    result = asyncio.run(run_load_test(config))
+    print(format_result(result))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result.to_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Synthetic store generator for scale testing.
+
+Bulk-loads a POS database directly with batched ``executemany`` calls inside
+large transactions, bypassing the repositories. Output is fully determined by
+the seed and the distribution settings, so two runs with the same arguments
+produce byte-identical data.
+
+Usage:
+    python -m runner.seed --db pos.db
+    python -m runner.seed --db small.db --products 1000 --campaigns 50 \\
+        --days 30 --receipts-per-shift 100 --currency-weights GEL=0.5,USD=0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from core.models.campaign import CampaignType
+from core.models.ids import uuid7
+from core.models.money import MINOR_UNITS, percent_of
+from core.models.receipt import Currency, PaymentStatus, ReceiptStatus
+from core.models.shift import ShiftStatus
+from infra.db.database import Database
+
+# GEL -> currency, matching the ExchangeRateService fallback table.
+EXCHANGE_RATES = {Currency.GEL: 1.0, Currency.USD: 0.37, Currency.EUR: 0.34}
+
+
+@dataclass
+class SeedConfig:
+    """Store size and distribution knobs; defaults produce a ~1M receipt store."""
+
+    products: int = 100_000
+    campaigns: int = 3_000
+    active_campaign_ratio: float = 0.5
+    campaign_mix: Dict[CampaignType, float] = field(
+        default_factory=lambda: {
+            CampaignType.DISCOUNT: 0.5,
+            CampaignType.BUY_N_GET_N: 0.25,
+            CampaignType.COMBO: 0.25,
+        }
+    )
+    days: int = 730
+    shifts_per_day: int = 2
+    receipts_per_shift: int = 700
+    mean_items_per_receipt: int = 4
+    popularity_skew: float = 2.0
+    price_mu: float = 1.5
+    price_sigma: float = 0.9
+    item_discount_rate: float = 0.1
+    currency_weights: Dict[Currency, float] = field(
+        default_factory=lambda: {
+            Currency.GEL: 0.7,
+            Currency.USD: 0.2,
+            Currency.EUR: 0.1,
+        }
+    )
+    start: datetime = datetime(2023, 1, 1, 9, 0)
+    batch_size: int = 50_000
+    seed: int = 42
+
+
+@dataclass
+class SeedSummary:
+    products: int = 0
+    campaigns: int = 0
+    shifts: int = 0
+    receipts: int = 0
+    receipt_items: int = 0
+    payments: int = 0
+    duration: float = 0.0
+
+
+class _BatchWriter:
+    """Buffers rows per statement and flushes them with ``executemany``."""
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[Tuple[Any, ...]]] = {}
+
+    def add(self, sql: str, row: Tuple[Any, ...]) -> None:
+        buffer = self.buffers.setdefault(sql, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.conn.executemany(sql, buffer)
+            buffer.clear()
+
+    def flush(self) -> None:
+        for sql, buffer in self.buffers.items():
+            if buffer:
+                self.conn.executemany(sql, buffer)
+                buffer.clear()
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _new_id(rng: random.Random, at: datetime) -> bytes:
+    """A UUIDv7 stamped with the simulated time, in its stored BLOB form."""
+    unix_ms = (at - _EPOCH) // timedelta(milliseconds=1)
+    return uuid7(unix_ms, rng.getrandbits(74)).bytes
+
+
+def _money(amount: float) -> int:
+    """Major units to integer minor units; exact enough for generated data."""
+    return round(amount * MINOR_UNITS)
+
+
+def _weighted(rng: random.Random, weights: Dict[Any, float]) -> Iterator[Any]:
+    """Yield endless weighted picks; cheaper than calling rng.choices per row."""
+    keys = list(weights)
+    values = list(weights.values())
+    while True:
+        yield from rng.choices(keys, values, k=1024)
+
+
+def _seed_products(
+    writer: _BatchWriter, config: SeedConfig, rng: random.Random
+) -> Tuple[List[bytes], List[int]]:
+    ids: List[bytes] = []
+    prices: List[int] = []
+    sql = "INSERT INTO products (id, name, price) VALUES (?, ?, ?)"
+    for index in range(config.products):
+        product_id = _new_id(rng, config.start)
+        price = _money(
+            max(0.05, rng.lognormvariate(config.price_mu, config.price_sigma))
+        )
+        writer.add(sql, (product_id, f"Product {index:06d}", price))
+        ids.append(product_id)
+        prices.append(price)
+    return ids, prices
+
+
+def _seed_campaigns(
+    writer: _BatchWriter,
+    config: SeedConfig,
+    rng: random.Random,
+    product_ids: Sequence[bytes],
+) -> List[bytes]:
+    """Insert campaigns of every type and return the discount campaign ids."""
+    discount_campaigns: List[bytes] = []
+    types = _weighted(rng, config.campaign_mix)
+    for index in range(config.campaigns):
+        campaign_id = _new_id(rng, config.start)
+        rule_id = _new_id(rng, config.start)
+        campaign_type: CampaignType = next(types)
+        is_active = int(rng.random() < config.active_campaign_ratio)
+        writer.add(
+            "INSERT INTO campaigns (id, name, campaign_type, is_active)"
+            " VALUES (?, ?, ?, ?)",
+            (campaign_id, f"Campaign {index:05d}", campaign_type.value, is_active),
+        )
+
+        if campaign_type == CampaignType.DISCOUNT:
+            discount_campaigns.append(campaign_id)
+            applies_to = "receipt" if rng.random() < 0.2 else "product"
+            writer.add(
+                "INSERT INTO discount_rules (id, campaign_id, discount_value,"
+                " applies_to, min_amount) VALUES (?, ?, ?, ?, ?)",
+                (
+                    rule_id,
+                    campaign_id,
+                    float(rng.choice([5, 10, 15, 20, 25])),
+                    applies_to,
+                    float(rng.choice([50, 100, 200])) if applies_to == "receipt" else 0,
+                ),
+            )
+            if applies_to == "product":
+                for product_id in rng.sample(product_ids, min(5, len(product_ids))):
+                    writer.add(
+                        "INSERT INTO discount_rule_products"
+                        " (discount_rule_id, product_id) VALUES (?, ?)",
+                        (rule_id, product_id),
+                    )
+        elif campaign_type == CampaignType.BUY_N_GET_N:
+            writer.add(
+                "INSERT INTO buy_n_get_n_rules (id, campaign_id, buy_product_id,"
+                " buy_quantity, get_product_id, get_quantity)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    rule_id,
+                    campaign_id,
+                    rng.choice(product_ids),
+                    rng.randint(2, 4),
+                    rng.choice(product_ids),
+                    1,
+                ),
+            )
+        else:
+            writer.add(
+                "INSERT INTO combo_rules (id, campaign_id, discount_type,"
+                " discount_value) VALUES (?, ?, ?, ?)",
+                (
+                    rule_id,
+                    campaign_id,
+                    rng.choice(["percentage", "fixed"]),
+                    float(rng.choice([5, 10, 15])),
+                ),
+            )
+            for product_id in rng.sample(product_ids, min(3, len(product_ids))):
+                writer.add(
+                    "INSERT INTO combo_rule_products (combo_rule_id, product_id)"
+                    " VALUES (?, ?)",
+                    (rule_id, product_id),
+                )
+    return discount_campaigns
+
+
+def _seed_sales(
+    writer: _BatchWriter,
+    config: SeedConfig,
+    rng: random.Random,
+    product_ids: Sequence[bytes],
+    prices: Sequence[int],
+    discount_campaigns: Sequence[bytes],
+    summary: SeedSummary,
+) -> None:
+    """Insert closed shifts, each with paid receipts, items and payments."""
+    currencies = _weighted(rng, config.currency_weights)
+    shift_hours = 24 / config.shifts_per_day
+    max_items = max(1, 2 * config.mean_items_per_receipt - 1)
+    catalog = len(product_ids)
+
+    for day in range(config.days):
+        for slot in range(config.shifts_per_day):
+            opened = config.start + timedelta(days=day, hours=slot * shift_hours)
+            shift_id = _new_id(rng, opened)
+            writer.add(
+                "INSERT INTO shifts (id, status, created_at, closed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    shift_id,
+                    ShiftStatus.CLOSED.value,
+                    opened.isoformat(" "),
+                    (opened + timedelta(hours=shift_hours)).isoformat(" "),
+                ),
+            )
+            summary.shifts += 1
+
+            for number in range(config.receipts_per_shift):
+                sold_at = opened + timedelta(
+                    hours=shift_hours * number / config.receipts_per_shift
+                )
+                receipt_id = _new_id(rng, sold_at)
+                subtotal = 0
+                discount_amount = 0
+                for _ in range(rng.randint(1, max_items)):
+                    # Skewed popularity: low catalog indexes sell the most.
+                    index = int(catalog * rng.random() ** config.popularity_skew)
+                    quantity = rng.randint(1, 3)
+                    total_price = prices[index] * quantity
+                    item_id = _new_id(rng, sold_at)
+                    item_discount = 0
+                    if discount_campaigns and rng.random() < config.item_discount_rate:
+                        item_discount = percent_of(total_price, 10)
+                        writer.add(
+                            "INSERT INTO receipt_item_discounts (receipt_item_id,"
+                            " campaign_id, campaign_name, discount_amount)"
+                            " VALUES (?, ?, ?, ?)",
+                            (
+                                item_id,
+                                rng.choice(discount_campaigns),
+                                "Seeded discount",
+                                item_discount,
+                            ),
+                        )
+                    writer.add(
+                        "INSERT INTO receipt_items (id, receipt_id, product_id,"
+                        " quantity, unit_price, total_price, final_price)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            item_id,
+                            receipt_id,
+                            product_ids[index],
+                            quantity,
+                            prices[index],
+                            total_price,
+                            total_price - item_discount,
+                        ),
+                    )
+                    subtotal += total_price
+                    discount_amount += item_discount
+                    summary.receipt_items += 1
+
+                total = subtotal - discount_amount
+                writer.add(
+                    "INSERT INTO receipts (id, shift_id, status, subtotal,"
+                    " discount_amount, total) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        receipt_id,
+                        shift_id,
+                        ReceiptStatus.CLOSED.value,
+                        subtotal,
+                        discount_amount,
+                        total,
+                    ),
+                )
+                summary.receipts += 1
+
+                currency: Currency = next(currencies)
+                rate = EXCHANGE_RATES[currency]
+                writer.add(
+                    "INSERT INTO payments (id, receipt_id, payment_amount, currency,"
+                    " total_in_gel, exchange_rate, status)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        _new_id(rng, sold_at),
+                        receipt_id,
+                        round(total * rate) + 1,
+                        currency.value,
+                        total,
+                        1 / rate,
+                        PaymentStatus.COMPLETED.value,
+                    ),
+                )
+                summary.payments += 1
+
+
+def seed_store(db_path: str, config: SeedConfig) -> SeedSummary:
+    """Create the schema at ``db_path`` and fill it according to ``config``."""
+    started = time.perf_counter()
+    Database(db_path)
+    rng = random.Random(config.seed)
+    summary = SeedSummary(products=config.products, campaigns=config.campaigns)
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("BEGIN")
+        writer = _BatchWriter(conn, config.batch_size)
+
+        product_ids, prices = _seed_products(writer, config, rng)
+        discount_campaigns = _seed_campaigns(writer, config, rng, product_ids)
+        if product_ids:
+            _seed_sales(
+                writer, config, rng, product_ids, prices, discount_campaigns, summary
+            )
+
+        writer.flush()
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    summary.duration = time.perf_counter() - started
+    return summary
+
+
+def _parse_weights(raw: str, kind: Any) -> Dict[Any, float]:
+    """Parse ``A=0.5,B=0.5`` into ``{kind(A): 0.5, kind(B): 0.5}``."""
+    weights: Dict[Any, float] = {}
+    for part in raw.split(","):
+        name, _, value = part.partition("=")
+        weights[kind(name.strip())] = float(value)
+    return weights
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    defaults = SeedConfig()
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic store.")
+    parser.add_argument("--db", default="pos.db")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--products", type=int, default=defaults.products)
+    parser.add_argument("--campaigns", type=int, default=defaults.campaigns)
+    parser.add_argument(
+        "--active-campaign-ratio", type=float, default=defaults.active_campaign_ratio
+    )
+    parser.add_argument(
+        "--campaign-mix",
+        help="Weights per campaign type, e.g. discount=2,buy_n_get_n=1,combo=1",
+    )
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--shifts-per-day", type=int, default=defaults.shifts_per_day)
+    parser.add_argument(
+        "--receipts-per-shift", type=int, default=defaults.receipts_per_shift
+    )
+    parser.add_argument(
+        "--items-per-receipt", type=int, default=defaults.mean_items_per_receipt
+    )
+    parser.add_argument(
+        "--popularity-skew", type=float, default=defaults.popularity_skew
+    )
+    parser.add_argument("--price-mu", type=float, default=defaults.price_mu)
+    parser.add_argument("--price-sigma", type=float, default=defaults.price_sigma)
+    parser.add_argument(
+        "--item-discount-rate", type=float, default=defaults.item_discount_rate
+    )
+    parser.add_argument(
+        "--currency-weights", help="Weights per currency, e.g. GEL=0.7,USD=0.3"
+    )
+    parser.add_argument("--start", default=defaults.start.isoformat())
+    parser.add_argument("--batch-size", type=int, default=defaults.batch_size)
+    args = parser.parse_args(argv)
+
+    config = SeedConfig(
+        products=args.products,
+        campaigns=args.campaigns,
+        active_campaign_ratio=args.active_campaign_ratio,
+        days=args.days,
+        shifts_per_day=args.shifts_per_day,
+        receipts_per_shift=args.receipts_per_shift,
+        mean_items_per_receipt=args.items_per_receipt,
+        popularity_skew=args.popularity_skew,
+        price_mu=args.price_mu,
+        price_sigma=args.price_sigma,
+        item_discount_rate=args.item_discount_rate,
+        start=datetime.fromisoformat(args.start),
+        batch_size=args.batch_size,
+        seed=args.seed,
+    )
+    if args.campaign_mix:
+        config.campaign_mix = _parse_weights(args.campaign_mix, CampaignType)
+    if args.currency_weights:
+        config.currency_weights = _parse_weights(args.currency_weights, Currency)
+
+    summary = seed_store(args.db, config)
+    print(
+        f"Seeded {args.db} in {summary.duration:.1f}s: "
+        f"{summary.products} products, {summary.campaigns} campaigns, "
+        f"{summary.shifts} shifts, {summary.receipts} receipts, "
+        f"{summary.receipt_items} items, {summary.payments} payments"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from dataclasses import asdict
+from uuid import uuid4
+
+from benchmarks.bench_models import compare_models, unslotted
+from core.models.receipt import Discount, ReceiptItem
+
+
+def test_models_have_no_instance_dict() -> None:
+    """Test that domain models are slotted."""
+    # Arrange
+    item = ReceiptItem(uuid4(), 2, 1.5, [Discount(uuid4(), "Promo", 0.5)])
+
+    # Assert
+    assert not hasattr(item, "__dict__")
+    assert item.final_price == 2.5
+
+
+def test_unslotted_twin_behaves_like_model() -> None:
+    """Test that the comparison twin builds equal values with a __dict__."""
+    # Arrange
+    product_id = uuid4()
+    twin = unslotted(ReceiptItem)
+
+    # Act
+    item = twin(product_id, 3, 1.25)
+
+    # Assert
+    assert hasattr(item, "__dict__")
+    assert asdict(item) == asdict(ReceiptItem(product_id, 3, 1.25))
+
+
+def test_compare_models_reports_every_model() -> None:
+    """Test that slotted models are not larger than their twins."""
+    # Act
+    rows = compare_models(sample=1_000, timed=100)
+
+    # Assert
+    assert {row[0] for row in rows} >= {"Receipt", "ReceiptItem", "Product"}
+    assert all(slot_bytes <= dict_bytes for _, dict_bytes, slot_bytes, _, _ in rows)
@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import List
+
+from benchmarks.harness import (
+    BenchmarkResult,
+    Case,
+    compare,
+    load_results,
+    measure,
+    save_results,
+)
+
+
+def _result(name: str, median_s: float) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name, scale=10, runs=5, min_s=median_s, median_s=median_s, mean_s=median_s
+    )
+
+
+def test_measure_runs_setup_before_every_run() -> None:
+    """Test that setup output is passed to each timed run."""
+    # Arrange
+    seen: List[int] = []
+    counter = iter(range(100))
+    case = Case(run=seen.append, setup=lambda: next(counter))
+
+    # Act
+    result = measure("demo", 10, case, min_time=0, min_runs=4)
+
+    # Assert
+    assert result.runs == 4
+    assert seen == [0, 1, 2, 3]
+    assert result.key == "demo[10]"
+
+
+def test_results_round_trip(tmp_path: Path) -> None:
+    """Test that saved results load back unchanged."""
+    # Arrange
+    path = tmp_path / "results.json"
+    results = [_result("a", 0.5), _result("b", 0.25)]
+
+    # Act
+    save_results(path, results)
+    loaded = load_results(path)
+
+    # Assert
+    assert loaded == {result.key: result for result in results}
+
+
+def test_compare_flags_only_regressions_beyond_tolerance() -> None:
+    """Test that compare reports slowdowns larger than the tolerance."""
+    # Arrange
+    baseline = {
+        "fast[10]": _result("fast", 1.0),
+        "slow[10]": _result("slow", 1.0),
+        "noisy[10]": _result("noisy", 1.0),
+    }
+    current = [
+        _result("fast", 0.5),
+        _result("slow", 1.5),
+        _result("noisy", 1.1),
+        _result("new", 9.0),
+    ]
+
+    # Act
+    regressions = compare(current, baseline, tolerance=0.2)
+
+    # Assert
+    assert [regression.key for regression in regressions] == ["slow[10]"]
+    assert regressions[0].ratio == 1.5
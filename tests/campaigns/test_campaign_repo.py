@@ -50,7 +50,7 @@ def test_get_by_id_discount_campaign(
 
     # Mock campaign data
     campaign_row = {
-        "id": str(campaign_id),
+        "id": campaign_id.bytes,
         "name": "Summer Sale",
         "campaign_type": CampaignType.DISCOUNT.value,
         "is_active": 1,
@@ -58,8 +58,8 @@ def test_get_by_id_discount_campaign(
 
     # Mock rule data
     rule_row = {
-        "id": str(rule_id),
-        "campaign_id": str(campaign_id),
+        "id": rule_id.bytes,
+        "campaign_id": campaign_id.bytes,
         "discount_value": 10.0,
         "applies_to": "all",
         "min_amount": 50.0,
@@ -84,10 +84,10 @@ def test_get_by_id_discount_campaign(
 
     # Check DB calls
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+        "SELECT * FROM campaigns WHERE id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM discount_rules WHERE campaign_id = ?", (str(campaign_id),)
+        "SELECT * FROM discount_rules WHERE campaign_id = ?", (campaign_id.bytes,)
     )
 
 
@@ -108,7 +108,7 @@ def test_get_by_id_discount_campaign_with_products(
 
     # Mock campaign data
     campaign_row = {
-        "id": str(campaign_id),
+        "id": campaign_id.bytes,
         "name": "Product Sale",
         "campaign_type": CampaignType.DISCOUNT.value,
         "is_active": 1,
@@ -116,15 +116,18 @@ def test_get_by_id_discount_campaign_with_products(
 
     # Mock rule data
     rule_row = {
-        "id": str(rule_id),
-        "campaign_id": str(campaign_id),
+        "id": rule_id.bytes,
+        "campaign_id": campaign_id.bytes,
         "discount_value": 15.0,
         "applies_to": "product",
         "min_amount": None,
     }
 
     # Mock product IDs data
-    product_rows = [{"product_id": product_id_1}, {"product_id": product_id_2}]
+    product_rows = [
+        {"product_id": uuid.UUID(product_id_1).bytes},
+        {"product_id": uuid.UUID(product_id_2).bytes},
+    ]
 
     # Set up the mock to return the expected data
     mock_cursor.fetchone.side_effect = [campaign_row, rule_row]
@@ -145,14 +148,14 @@ def test_get_by_id_discount_campaign_with_products(
 
     # Check DB calls
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+        "SELECT * FROM campaigns WHERE id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM discount_rules WHERE campaign_id = ?", (str(campaign_id),)
+        "SELECT * FROM discount_rules WHERE campaign_id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
         "SELECT product_id FROM discount_rule_products WHERE discount_rule_id = ?",
-        (str(rule_id),),
+        (rule_id.bytes,),
     )
 
 
@@ -173,7 +176,7 @@ def test_get_by_id_buy_n_get_n_campaign(
 
     # Mock campaign data
     campaign_row = {
-        "id": str(campaign_id),
+        "id": campaign_id.bytes,
         "name": "Buy 2 Get 1 Free",
         "campaign_type": CampaignType.BUY_N_GET_N.value,
         "is_active": 1,
@@ -181,11 +184,11 @@ def test_get_by_id_buy_n_get_n_campaign(
 
     # Mock rule data
     rule_row = {
-        "id": str(rule_id),
-        "campaign_id": str(campaign_id),
-        "buy_product_id": buy_product_id,
+        "id": rule_id.bytes,
+        "campaign_id": campaign_id.bytes,
+        "buy_product_id": uuid.UUID(buy_product_id).bytes,
         "buy_quantity": 2,
-        "get_product_id": get_product_id,
+        "get_product_id": uuid.UUID(get_product_id).bytes,
         "get_quantity": 1,
     }
 
@@ -208,10 +211,10 @@ def test_get_by_id_buy_n_get_n_campaign(
 
     # Check DB calls
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+        "SELECT * FROM campaigns WHERE id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM buy_n_get_n_rules WHERE campaign_id = ?", (str(campaign_id),)
+        "SELECT * FROM buy_n_get_n_rules WHERE campaign_id = ?", (campaign_id.bytes,)
     )
 
 
@@ -233,7 +236,7 @@ def test_get_by_id_combo_campaign(
 
     # Mock campaign data
     campaign_row = {
-        "id": str(campaign_id),
+        "id": campaign_id.bytes,
         "name": "Meal Deal",
         "campaign_type": CampaignType.COMBO.value,
         "is_active": 1,
@@ -241,17 +244,17 @@ def test_get_by_id_combo_campaign(
 
     # Mock rule data
     rule_row = {
-        "id": str(rule_id),
-        "campaign_id": str(campaign_id),
+        "id": rule_id.bytes,
+        "campaign_id": campaign_id.bytes,
         "discount_type": "percentage",
         "discount_value": 20.0,
     }
 
     # Mock product IDs data
     product_rows = [
-        {"product_id": product_id_1},
-        {"product_id": product_id_2},
-        {"product_id": product_id_3},
+        {"product_id": uuid.UUID(product_id_1).bytes},
+        {"product_id": uuid.UUID(product_id_2).bytes},
+        {"product_id": uuid.UUID(product_id_3).bytes},
     ]
 
     # Set up the mock to return the expected data
@@ -273,14 +276,14 @@ def test_get_by_id_combo_campaign(
 
     # Check DB calls
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+        "SELECT * FROM campaigns WHERE id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
-        "SELECT * FROM combo_rules WHERE campaign_id = ?", (str(campaign_id),)
+        "SELECT * FROM combo_rules WHERE campaign_id = ?", (campaign_id.bytes,)
     )
     mock_cursor.execute.assert_any_call(
         "SELECT product_id FROM combo_rule_products WHERE combo_rule_id = ?",
-        (str(rule_id),),
+        (rule_id.bytes,),
     )
 
 
@@ -305,7 +308,7 @@ def test_get_by_id_campaign_not_found(
 
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
-        "SELECT * FROM campaigns WHERE id = ?", (str(campaign_id),)
+        "SELECT * FROM campaigns WHERE id = ?", (campaign_id.bytes,)
     )
 
 
@@ -323,13 +326,13 @@ def test_get_all_campaigns(
     )
     mock_cursor.fetchall.return_value = [
         {
-            "id": str(campaign_id_1),
+            "id": campaign_id_1.bytes,
             "name": "Campaign 1",
             "campaign_type": CampaignType.DISCOUNT.value,
             "is_active": 1,
         },
         {
-            "id": str(campaign_id_2),
+            "id": campaign_id_2.bytes,
             "name": "Campaign 2",
             "campaign_type": CampaignType.BUY_N_GET_N.value,
             "is_active": 1,
@@ -399,7 +402,7 @@ def test_deactivate_campaign(
 
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
-        "UPDATE campaigns SET is_active = 0 WHERE id = ?", (str(campaign_id),)
+        "UPDATE campaigns SET is_active = 0 WHERE id = ?", (campaign_id.bytes,)
     )
 
 
@@ -424,7 +427,7 @@ def test_deactivate_campaign_not_found(
 
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
-        "UPDATE campaigns SET is_active = 0 WHERE id = ?", (str(campaign_id),)
+        "UPDATE campaigns SET is_active = 0 WHERE id = ?", (campaign_id.bytes,)
     )
 
 
@@ -442,13 +445,13 @@ def test_get_active_campaigns(
     )
     mock_cursor.fetchall.return_value = [
         {
-            "id": str(campaign_id_1),
+            "id": campaign_id_1.bytes,
             "name": "Campaign 1",
             "campaign_type": CampaignType.DISCOUNT.value,
             "is_active": 1,
         },
         {
-            "id": str(campaign_id_2),
+            "id": campaign_id_2.bytes,
             "name": "Campaign 2",
             "campaign_type": CampaignType.BUY_N_GET_N.value,
             "is_active": 1,
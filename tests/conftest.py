@@ -1,9 +1,11 @@
+from pathlib import Path
 from typing import Generator
 
 import pytest
 from fastapi.testclient import TestClient
 
 from infra.api.app import app
+from infra.db.database import Database
 
 
 @pytest.fixture
@@ -11,3 +13,9 @@ def client() -> Generator[TestClient, None, None]:
     """Fixture for FastAPI test client."""
     client = TestClient(app)
     yield client
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> Database:
+    """Fixture for a real SQLite database in a temporary directory."""
+    return Database(str(tmp_path / "pos.db"))
@@ -0,0 +1,127 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from infra.db.contention import ContentionPolicy
+from infra.db.database import Database
+
+
+def _insert_shift(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "INSERT INTO shifts (id, status, created_at) VALUES (?, 'open', 'now')",
+        (b"\x00" * 16,),
+    )
+
+
+@pytest.fixture
+def holder(tmp_path: Path) -> Generator[sqlite3.Connection, None, None]:
+    """A second connection to the test database, for holding its write lock."""
+    conn = sqlite3.connect(
+        str(tmp_path / "pos.db"), isolation_level=None, check_same_thread=False
+    )
+    yield conn
+    conn.close()
+
+
+def _database(tmp_path: Path, retries: int) -> Database:
+    # No busy wait, so every lock error goes to the retry loop
+    policy = ContentionPolicy(
+        busy_timeout=0, retries=retries, backoff=0.005, max_backoff=0.01
+    )
+    return Database(str(tmp_path / "pos.db"), contention=policy)
+
+
+def test_backoff_is_jittered_and_capped() -> None:
+    """Test that retry delays stay under the exponential cap."""
+    # Arrange
+    policy = ContentionPolicy(backoff=0.01, max_backoff=0.05)
+
+    # Act
+    delays = [policy.delay(attempt) for attempt in range(8) for _ in range(50)]
+
+    # Assert
+    assert all(0 <= delay <= 0.05 for delay in delays)
+    assert max(policy.delay(0) for _ in range(50)) <= 0.01
+    assert len(set(delays)) > 1
+
+
+def test_invalid_policy() -> None:
+    """Test that negative settings are refused."""
+    with pytest.raises(ValueError):
+        ContentionPolicy(retries=-1)
+    with pytest.raises(ValueError):
+        ContentionPolicy(busy_timeout=-1.0)
+
+
+def test_write_retries_until_lock_is_released(
+    tmp_path: Path, holder: sqlite3.Connection
+) -> None:
+    """Test that a write waits out a held lock instead of failing."""
+    # Arrange
+    db = _database(tmp_path, retries=100)
+    holder.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.05, lambda: holder.execute("COMMIT")).start()
+
+    # Act
+    db.write(_insert_shift)
+
+    # Assert
+    stats = db.contention_stats()
+    assert stats.retries > 0
+    assert (stats.recovered, stats.gave_up) == (1, 0)
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM shifts").fetchone()[0] == 1
+
+
+def test_write_gives_up_after_retries(
+    tmp_path: Path, holder: sqlite3.Connection
+) -> None:
+    """Test that a lock held past every retry is reported and counted."""
+    # Arrange
+    db = _database(tmp_path, retries=2)
+    holder.execute("BEGIN IMMEDIATE")
+
+    # Act
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        db.write(_insert_shift)
+
+    # Assert
+    stats = db.contention_stats()
+    assert (stats.retries, stats.recovered, stats.gave_up) == (2, 0, 1)
+    holder.execute("ROLLBACK")
+
+
+def test_other_errors_are_not_retried(tmp_path: Path) -> None:
+    """Test that only lock contention is retried."""
+    # Arrange
+    db = _database(tmp_path, retries=3)
+
+    # Act
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        db.write(lambda conn: conn.execute("SELECT * FROM missing"))
+
+    # Assert
+    assert db.contention_stats().retries == 0
+
+
+def test_write_queue_retries_locked_batch(
+    tmp_path: Path, holder: sqlite3.Connection
+) -> None:
+    """Test that the group-commit writer retries a batch refused by a lock."""
+    # Arrange
+    db = _database(tmp_path, retries=100)
+    holder.execute("BEGIN IMMEDIATE")
+    threading.Timer(0.05, lambda: holder.execute("COMMIT")).start()
+    db.start_write_queue()
+
+    # Act
+    try:
+        db.write(_insert_shift)
+    finally:
+        db.stop_write_queue()
+
+    # Assert
+    assert db.contention_stats().recovered == 1
@@ -0,0 +1,80 @@
+import sqlite3
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+
+from core.models.errors import CampaignValidationError
+from core.models.ids import uuid7
+from infra.db.database import Database
+from infra.repositories.campaign_sqlite_repository import SQLiteCampaignRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+def test_uuid7_is_time_ordered() -> None:
+    """Test that ids generated later sort later."""
+    # Act
+    ids = [uuid7() for _ in range(1000)]
+
+    # Assert
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(i.version == 7 for i in ids)
+
+
+def test_uuid7_is_deterministic_with_explicit_parts() -> None:
+    """Test building an id from a timestamp and random bits."""
+    # Act
+    value = uuid7(1_700_000_000_000, 0)
+
+    # Assert
+    assert value == uuid7(1_700_000_000_000, 0)
+    assert value.int >> 80 == 1_700_000_000_000
+    assert value.version == 7
+
+
+def test_ids_are_stored_as_blobs(db: Database) -> None:
+    """Test that new rows get 16-byte time-ordered keys."""
+    # Act
+    product = SQLiteProductRepository(db).create("Bread", 1.5)
+
+    # Assert
+    with sqlite3.connect(db.db_path) as conn:
+        row = conn.execute("SELECT id, typeof(id), length(id) FROM products").fetchone()
+    assert row == (product.id.bytes, "blob", 16)
+    assert SQLiteProductRepository(db).get_by_id(product.id) == product
+
+
+def test_campaign_rejects_invalid_product_ids(db: Database) -> None:
+    """Test that rule product ids must be UUIDs."""
+    # Act & Assert
+    with pytest.raises(CampaignValidationError):
+        SQLiteCampaignRepository(db).create(
+            "Combo",
+            "combo",
+            {"product_ids": ["bread"], "discount_type": "fixed", "discount_value": 1},
+        )
+
+
+def test_legacy_text_ids_are_migrated(tmp_path: Path) -> None:
+    """Test that TEXT UUID keys are converted to BLOBs in place."""
+    # Arrange
+    db_path = tmp_path / "legacy.db"
+    product_id = "0190f1a6-2b3c-7d4e-8f60-123456789abc"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE products (id TEXT PRIMARY KEY, name TEXT NOT NULL,"
+            " price REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO products VALUES (?, 'Bread', 1.5)", (product_id,))
+
+    # Act
+    db = Database(str(db_path))
+
+    # Assert
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute("SELECT typeof(id), typeof(price) FROM products").fetchone()
+    assert row == ("blob", "integer")
+    product = SQLiteProductRepository(db).get_by_id(UUID(product_id))
+    assert product is not None
+    assert product.price == 1.5
@@ -0,0 +1,103 @@
+import random
+import sqlite3
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from core.models.money import allocate, percent_of, to_major, to_minor
+from core.models.receipt import Receipt, ReceiptItem
+from infra.db.database import SCHEMA_VERSION, Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+@pytest.mark.parametrize(
+    "amount, minor",
+    [(10.99, 1099), (1.005, 101), (0.1 + 0.2, 30), (-2.675, -268), (3, 300)],
+)
+def test_to_minor_rounds_half_away_from_zero(amount: float, minor: int) -> None:
+    """Test converting major units to minor units."""
+    # Act & Assert
+    assert to_minor(amount) == minor
+    assert to_minor(to_major(minor)) == minor
+
+
+def test_to_minor_fast_path_matches_decimal() -> None:
+    """Test that whole minor-unit amounts convert as Decimal would convert them."""
+    # Arrange
+    rng = random.Random(30)
+    minors = [rng.randrange(-(10**13), 10**13) for _ in range(5_000)]
+    minors += [rng.randrange(-100_000, 100_000) for _ in range(5_000)]
+    amounts = [to_major(minor) for minor in minors] + [
+        rng.uniform(-1_000, 1_000) for _ in range(5_000)
+    ]
+
+    # Act & Assert
+    for amount in amounts:
+        exact = Decimal(repr(amount)).scaleb(2).to_integral_value(ROUND_HALF_UP)
+        assert to_minor(amount) == int(exact)
+
+
+def test_percent_of_rounds_half_up() -> None:
+    """Test integer percentage arithmetic."""
+    # Act & Assert
+    assert percent_of(1999, 10) == 200
+    assert percent_of(1000, 12.5) == 125
+    assert percent_of(1, 50) == 1
+
+
+def test_allocate_shares_add_up_to_total() -> None:
+    """Test that a fixed amount is split without losing a tetri."""
+    # Act
+    shares = allocate(1000, [1, 1, 1])
+
+    # Assert
+    assert shares == [334, 333, 333]
+    assert sum(allocate(500, [1999, 350, 12])) == 500
+
+
+def test_receipt_totals_do_not_drift() -> None:
+    """Test that line and receipt totals are exact to the tetri."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid4())
+    receipt.products = [
+        ReceiptItem(product_id=uuid4(), quantity=3, unit_price=0.1) for _ in range(10)
+    ]
+
+    # Act
+    receipt.recalculate_totals()
+
+    # Assert
+    assert receipt.products[0].total_price == 0.3
+    assert receipt.subtotal == 3.0
+    assert receipt.total == 3.0
+
+
+def test_legacy_database_is_migrated(tmp_path: Path) -> None:
+    """Test that REAL money columns are converted to integer minor units."""
+    # Arrange
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE products (id TEXT PRIMARY KEY, name TEXT NOT NULL,"
+            " price REAL NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO products VALUES ('00000000-0000-0000-0000-000000000001',"
+            " 'Bread', 1.005)"
+        )
+
+    # Act
+    db = Database(str(db_path))
+
+    # Assert
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        row = conn.execute("SELECT price, typeof(price) FROM products").fetchone()
+        assert row == (101, "integer")
+        columns = {
+            info[1]: info[2] for info in conn.execute("PRAGMA table_info(products)")
+        }
+        assert columns["price"] == "INTEGER"
+    assert SQLiteProductRepository(db).get_all()[0].price == 1.01
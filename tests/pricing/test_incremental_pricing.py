@@ -0,0 +1,138 @@
+import random
+import uuid
+from typing import List, Union
+
+import pytest
+
+from core.models.campaign import (
+    BuyNGetNRule,
+    Campaign,
+    CampaignType,
+    ComboRule,
+    DiscountRule,
+)
+from core.models.receipt import ReceiptItem
+from core.services.pricing import (
+    BasketPricing,
+    CampaignIndex,
+    IncrementalPricer,
+    price_basket,
+)
+
+
+def _campaigns(rng: random.Random, products: List[str], count: int) -> List[Campaign]:
+    campaigns = []
+    for index in range(count):
+        kind = rng.choice(["product", "receipt", "bogo", "combo"])
+        rules: Union[DiscountRule, BuyNGetNRule, ComboRule]
+        if kind == "product":
+            campaign_type = CampaignType.DISCOUNT
+            rules = DiscountRule(
+                rng.choice([5.0, 10.0, 12.5]), "product", rng.sample(products, 2)
+            )
+        elif kind == "receipt":
+            campaign_type = CampaignType.DISCOUNT
+            rules = DiscountRule(
+                rng.choice([5.0, 10.0]), "receipt", min_amount=rng.choice([5.0, 20.0])
+            )
+        elif kind == "bogo":
+            campaign_type = CampaignType.BUY_N_GET_N
+            rules = BuyNGetNRule(
+                rng.choice(products), rng.randint(1, 3), rng.choice(products), 1
+            )
+        else:
+            campaign_type = CampaignType.COMBO
+            rules = ComboRule(
+                rng.sample(products, rng.randint(2, 3)),
+                rng.choice(["percentage", "fixed"]),
+                rng.choice([1.0, 10.0]),
+            )
+        campaigns.append(
+            Campaign(
+                name=f"Campaign {index}",
+                campaign_type=campaign_type,
+                rules=rules,
+            )
+        )
+    return campaigns
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_matches_full_reprice(seed: int) -> None:
+    """Test that incremental pricing equals pricing from scratch at every step."""
+    # Arrange
+    rng = random.Random(seed)
+    products = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(8)]
+    campaigns = _campaigns(rng, products, 25)
+    state = BasketPricing(CampaignIndex(campaigns))
+    lines: List[ReceiptItem] = []
+
+    for _ in range(40):
+        # Act: add, change or remove one line
+        product_id = uuid.UUID(rng.choice(products))
+        existing = [line for line in lines if line.product_id == product_id]
+        action = rng.random()
+        if existing and action < 0.3:
+            lines.remove(existing[0])
+        elif existing:
+            existing[0].set_quantity(rng.randint(1, 6))
+        else:
+            price = rng.choice([0.99, 2.5, 7.0])
+            lines.append(ReceiptItem(product_id, rng.randint(1, 6), price))
+
+        # Assert
+        assert state.update(lines) == price_basket(lines, campaigns)
+
+
+def test_single_line_change_evaluates_affected_rules_only() -> None:
+    """Test that a scan only re-evaluates campaigns naming the scanned product."""
+    # Arrange
+    basket = [ReceiptItem(uuid.uuid4(), 1, 1.0) for _ in range(50)]
+    campaigns = [
+        Campaign(
+            name=f"Product {index}",
+            campaign_type=CampaignType.DISCOUNT,
+            rules=DiscountRule(10.0, "product", [str(line.product_id)]),
+        )
+        for index, line in enumerate(basket)
+    ]
+    state = BasketPricing(CampaignIndex(campaigns))
+    state.update(basket)
+    evaluated = state.evaluations
+
+    # Act
+    basket[10].set_quantity(2)
+    priced = state.update(basket)
+
+    # Assert
+    assert state.evaluations - evaluated == 1
+    assert priced == price_basket(basket, campaigns)
+
+
+def test_receipt_threshold_crossing() -> None:
+    """Test that receipt discounts follow the subtotal across thresholds."""
+    # Arrange
+    campaigns = [
+        Campaign(
+            name=name,
+            campaign_type=CampaignType.DISCOUNT,
+            rules=DiscountRule(value, "receipt", min_amount=minimum),
+        )
+        for name, value, minimum in (("Big", 10.0, 50.0), ("Small", 5.0, 10.0))
+    ]
+    item = ReceiptItem(uuid.uuid4(), 1, 10.0)
+    pricer = IncrementalPricer()
+    basket_id = uuid.uuid4()
+
+    # Act
+    names = []
+    for quantity in (1, 5, 4, 0):
+        item.set_quantity(quantity)
+        lines = [item] if quantity else []
+        priced = pricer.price(basket_id, lines, 1, lambda: campaigns)
+        discount = priced.receipt_discount
+        names.append(None if discount is None else discount.campaign_name)
+        assert priced == price_basket(lines, campaigns)
+
+    # Assert
+    assert names == ["Small", "Big", "Small", None]
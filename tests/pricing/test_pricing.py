@@ -0,0 +1,213 @@
+import uuid
+from unittest.mock import Mock
+
+from core.models.campaign import (
+    BuyNGetNRule,
+    Campaign,
+    CampaignType,
+    ComboRule,
+    DiscountRule,
+)
+from core.models.receipt import Receipt, ReceiptItem
+from core.models.repositories.campaign_repository import CampaignRepository
+from core.models.repositories.product_repository import ProductRepository
+from core.services.discount_service import DiscountService
+from core.services.pricing import PricingCache, price_basket
+from infra.db.database import Database
+from infra.repositories.campaign_sqlite_repository import SQLiteCampaignRepository
+
+
+def _receipt(*lines: ReceiptItem) -> Receipt:
+    receipt = Receipt(shift_id=uuid.uuid4(), products=list(lines))
+    receipt.recalculate_totals()
+    return receipt
+
+
+def test_buy_n_get_n_discounts_scanned_units_only() -> None:
+    """Test that free units are discounted, never added to the basket."""
+    # Arrange
+    buy = ReceiptItem(product_id=uuid.uuid4(), quantity=4, unit_price=2.0)
+    get = ReceiptItem(product_id=uuid.uuid4(), quantity=1, unit_price=3.0)
+    campaign = Campaign(
+        name="Buy 2 Get 1",
+        campaign_type=CampaignType.BUY_N_GET_N,
+        rules=BuyNGetNRule(str(buy.product_id), 2, str(get.product_id), 1),
+    )
+
+    # Act
+    priced = price_basket([buy, get], [campaign])
+
+    # Assert: two free units were earned but only one was scanned
+    assert priced.lines[1].discount is not None
+    assert priced.lines[1].discount.discount_amount == 3.0
+    assert priced.total == 800
+    assert (buy.quantity, get.quantity) == (4, 1)
+
+
+def test_buy_n_get_n_same_product_counts_whole_groups() -> None:
+    """Test that buy 2 get 1 on one product frees one unit in three."""
+    # Arrange
+    item = ReceiptItem(product_id=uuid.uuid4(), quantity=7, unit_price=1.5)
+    product_id = str(item.product_id)
+    campaign = Campaign(
+        name="3 for 2",
+        campaign_type=CampaignType.BUY_N_GET_N,
+        rules=BuyNGetNRule(product_id, 2, product_id, 1),
+    )
+
+    # Act
+    priced = price_basket([item], [campaign])
+
+    # Assert
+    assert priced.discount_amount == 300
+    assert item.quantity == 7
+
+
+def test_ties_go_to_the_first_campaign() -> None:
+    """Test that equal discounts are resolved by campaign order."""
+    # Arrange
+    item = ReceiptItem(product_id=uuid.uuid4(), quantity=2, unit_price=5.0)
+    campaigns = [
+        Campaign(
+            name=name,
+            campaign_type=CampaignType.DISCOUNT,
+            rules=DiscountRule(10.0, "product", [str(item.product_id)]),
+        )
+        for name in ("First", "Second")
+    ]
+
+    # Act
+    priced = price_basket([item], campaigns)
+
+    # Assert
+    assert priced.lines[0].discount is not None
+    assert priced.lines[0].discount.campaign_name == "First"
+    assert priced.lines[0].final_price == 900
+
+
+def test_apply_discounts_is_idempotent() -> None:
+    """Test that repricing a receipt leaves its lines and totals unchanged."""
+    # Arrange
+    buy = ReceiptItem(product_id=uuid.uuid4(), quantity=2, unit_price=4.0)
+    get = ReceiptItem(product_id=uuid.uuid4(), quantity=3, unit_price=1.0)
+    campaigns = [
+        Campaign(
+            name="Buy 1 Get 1",
+            campaign_type=CampaignType.BUY_N_GET_N,
+            rules=BuyNGetNRule(str(buy.product_id), 1, str(get.product_id), 1),
+        ),
+        Campaign(
+            name="Combo",
+            campaign_type=CampaignType.COMBO,
+            rules=ComboRule([str(buy.product_id), str(get.product_id)], "fixed", 1.0),
+        ),
+        Campaign(
+            name="Big basket",
+            campaign_type=CampaignType.DISCOUNT,
+            rules=DiscountRule(5.0, "receipt", min_amount=10.0),
+        ),
+    ]
+    campaign_repository = Mock(spec=CampaignRepository)
+    campaign_repository.get_active.return_value = campaigns
+    service = DiscountService(campaign_repository, Mock(spec=ProductRepository))
+    receipt = _receipt(buy, get)
+
+    # Act
+    first = service.apply_discounts(receipt)
+    totals = (first.subtotal, first.discount_amount, first.total)
+    second = service.apply_discounts(first)
+
+    # Assert
+    assert [(i.quantity, i.total_price) for i in second.products] == [
+        (2, 8.0),
+        (3, 3.0),
+    ]
+    assert (second.subtotal, second.discount_amount, second.total) == totals
+    assert totals == (11.0, 3.28, 7.72)
+    assert second.products[1].final_price == 1.0
+
+
+def _discount_campaign(product_id: uuid.UUID) -> Campaign:
+    return Campaign(
+        name="Ten off",
+        campaign_type=CampaignType.DISCOUNT,
+        rules=DiscountRule(10.0, "product", [str(product_id)]),
+    )
+
+
+def test_cache_prices_identical_baskets_once() -> None:
+    """Test that an unchanged basket and campaign set is priced once."""
+    # Arrange
+    item = ReceiptItem(product_id=uuid.uuid4(), quantity=2, unit_price=5.0)
+    campaign_repository = Mock(spec=CampaignRepository)
+    campaign_repository.get_active.return_value = [_discount_campaign(item.product_id)]
+    campaign_repository.version.return_value = 7
+    cache = PricingCache()
+    service = DiscountService(
+        campaign_repository, Mock(spec=ProductRepository), cache=cache
+    )
+
+    # Act
+    first = service.price(_receipt(item))
+    second = service.price(
+        _receipt(ReceiptItem(product_id=item.product_id, quantity=2, unit_price=5.0))
+    )
+
+    # Assert
+    assert second is first
+    campaign_repository.get_active.assert_called_once()
+    assert (cache.hits, cache.misses, cache.hit_ratio) == (1, 1, 0.5)
+
+
+def test_cache_misses_on_new_campaign_version_or_basket() -> None:
+    """Test that a campaign change or a different basket is priced again."""
+    # Arrange
+    item = ReceiptItem(product_id=uuid.uuid4(), quantity=2, unit_price=5.0)
+    campaigns = [_discount_campaign(item.product_id)]
+    cache = PricingCache()
+
+    # Act
+    cache.get_or_price([item], 1, lambda: price_basket([item], campaigns))
+    cache.get_or_price([item], 2, lambda: price_basket([item], campaigns))
+    more = [ReceiptItem(product_id=item.product_id, quantity=3, unit_price=5.0)]
+    cache.get_or_price(more, 2, lambda: price_basket(more, campaigns))
+
+    # Assert
+    assert (cache.hits, cache.misses) == (0, 3)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test that the cache stays bounded and keeps recently used baskets."""
+    # Arrange
+    cache = PricingCache(maxsize=2)
+    baskets = [
+        [ReceiptItem(product_id=uuid.uuid4(), quantity=1, unit_price=1.0)]
+        for _ in range(3)
+    ]
+
+    # Act
+    for basket in (0, 1, 0, 2, 0, 1):
+        cache.get_or_price(
+            baskets[basket], 1, lambda: price_basket(baskets[basket], [])
+        )
+
+    # Assert: basket 1 was the least recently used when basket 2 came in
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+def test_campaign_version_follows_writes(db: Database) -> None:
+    """Test that creating or deactivating a campaign bumps its version."""
+    # Arrange
+    repository = SQLiteCampaignRepository(db)
+    initial = repository.version()
+
+    # Act
+    campaign = repository.create(
+        "Receipt", "discount", {"discount_value": 5.0, "applies_to": "receipt"}
+    )
+    created = repository.version()
+    repository.deactivate(uuid.UUID(campaign.id))
+
+    # Assert
+    assert initial < created < repository.version()
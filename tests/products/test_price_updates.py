@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+
+from core.models.errors import ProductNotFoundError
+from core.models.product import CatalogEntry
+from infra.db.database import Database
+from infra.repositories.product_cached_repository import CachedProductRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+def test_update_prices_in_one_transaction(db: Database) -> None:
+    """Test that a batch of prices is written with one version bump."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    products = [repository.create(f"Product {i}", 1.0) for i in range(100)]
+    version = repository.version()
+    prices = {product.id: 2.0 + i for i, product in enumerate(products)}
+
+    # Act
+    with db.count_queries() as queries:
+        updated = repository.update_prices(prices)
+
+    # Assert
+    assert updated == 100
+    assert repository.version() == version + 1
+    assert queries.statements.count("COMMIT") == 1
+    assert [product.price for product in repository.get_all()] == list(prices.values())
+
+
+def test_update_prices_is_all_or_nothing(db: Database) -> None:
+    """Test that an unknown product rejects the whole batch."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    product = repository.create("Bread", 1.0)
+    missing = uuid.uuid4()
+    version = repository.version()
+
+    # Act
+    with pytest.raises(ProductNotFoundError) as error:
+        repository.update_prices({product.id: 5.0, missing: 2.0})
+
+    # Assert
+    assert str(missing) in str(error.value.detail)
+    assert repository.get_by_id(product.id) == product
+    assert repository.version() == version
+
+
+def test_import_batch_bumps_version_once(db: Database) -> None:
+    """Test that an upserted batch moves the catalog version by one."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    version = repository.version()
+
+    # Act
+    repository.upsert_many([CatalogEntry(f"S{i}", "Item", 1.0) for i in range(50)])
+
+    # Assert
+    assert repository.version() == version + 1
+
+
+def test_cached_prices_are_replaced_once_per_batch(db: Database) -> None:
+    """Test that the cache applies a batch without reading products back."""
+    # Arrange
+    cache = CachedProductRepository(SQLiteProductRepository(db))
+    products = [cache.create(f"Product {i}", 1.0) for i in range(10)]
+    cache.warm_up()
+    version = cache.version()
+
+    # Act
+    with db.count_queries() as queries:
+        cache.update_prices({product.id: 3.5 for product in products})
+
+    # Assert
+    assert queries.statements.count("COMMIT") == 1
+    assert not any("FROM products" in statement for statement in queries.statements)
+    assert cache.version() == version + 1
+    assert {cache.get_by_id(product.id).price for product in products} == {3.5}  # type: ignore[union-attr]
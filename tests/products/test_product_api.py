@@ -1,3 +1,4 @@
+import json
 import uuid
 from unittest.mock import Mock
 
@@ -5,6 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from core.models.product import Product
+from core.services.product_import import ImportProgress, ImportRowError
 from core.services.product_service import ProductService
 from infra.api.routers.product_router import router
 from runner.dependencies import get_product_service
@@ -101,3 +103,167 @@ def test_update_product_not_found(
     # Assert
     assert response.status_code == 200
     assert response.json() == {"product": None}
+
+
+def test_list_products_etag(client: TestClient, mock_product_service: Mock) -> None:
+    """Test that an unchanged catalog is revalidated with 304 Not Modified."""
+    # Arrange
+    mock_product_service.catalog_version.return_value = 12
+    mock_product_service.get_all_products.return_value = []
+
+    # Act
+    first = client.get("/products/")
+    second = client.get("/products/", headers={"If-None-Match": '"catalog-12"'})
+    mock_product_service.catalog_version.return_value = 13
+    third = client.get("/products/", headers={"If-None-Match": '"catalog-12"'})
+
+    # Assert
+    assert first.headers["ETag"] == '"catalog-12"'
+    assert second.status_code == 304
+    assert first.headers["Vary"] == second.headers["Vary"] == "Accept"
+    assert third.status_code == 200
+    assert third.headers["ETag"] == '"catalog-13"'
+    assert mock_product_service.get_all_products.call_count == 2
+
+
+def test_import_products_streams_report(
+    client: TestClient, mock_product_service: Mock
+) -> None:
+    """Test that the import endpoint streams progress and errors as NDJSON."""
+    # Arrange
+    mock_product_service.import_products.return_value = iter(
+        [
+            ImportRowError(3, "missing name", {"sku": "B2"}),
+            ImportProgress(1, 2, 1, 1, 0.5),
+        ]
+    )
+    body = "sku,name,price\nA1,Bread,1.25\nB2,,2\n"
+
+    # Act
+    response = client.post("/products/import?batch_size=100", content=body)
+
+    # Assert
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"type": "error", "line": 3, "error": "missing name", "row": {"sku": "B2"}},
+        {
+            "type": "progress",
+            "batches": 1,
+            "rows": 2,
+            "imported": 1,
+            "rejected": 1,
+            "elapsed": 0.5,
+        },
+    ]
+    lines, import_format, batch_size = (
+        mock_product_service.import_products.call_args.args
+    )
+    assert (import_format, batch_size) == ("csv", 100)
+
+
+def test_update_prices(client: TestClient, mock_product_service: Mock) -> None:
+    """Test applying a batch of price changes via the API."""
+    # Arrange
+    bread, milk = uuid.uuid4(), uuid.uuid4()
+    mock_product_service.update_prices.return_value = 2
+    mock_product_service.catalog_version.return_value = 8
+    changes = [
+        {"id": str(bread), "price": 1.0},
+        {"id": str(milk), "price": 2.0},
+        {"id": str(bread), "price": 1.5},
+    ]
+
+    # Act
+    response = client.patch("/products/", json={"prices": changes})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {"updated": 2, "catalog_version": 8}
+    mock_product_service.update_prices.assert_called_once_with({bread: 1.5, milk: 2.0})
+
+
+def test_list_products_page(client: TestClient, mock_product_service: Mock) -> None:
+    """Test that a limit returns one page and the cursor for the next."""
+    # Arrange
+    product = Product(id=uuid.uuid4(), name="Bread", price=1.5)
+    mock_product_service.get_products_page.return_value = ([product], product.id)
+    after = uuid.uuid4()
+
+    # Act
+    response = client.get("/products/", params={"limit": 1, "cursor": str(after)})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {
+        "products": [{"id": str(product.id), "name": "Bread", "price": 1.5}],
+        "next_cursor": str(product.id),
+    }
+    mock_product_service.get_products_page.assert_called_once_with(after, 1)
+
+
+def test_list_products_ndjson(client: TestClient, mock_product_service: Mock) -> None:
+    """Test that NDJSON clients receive one product per line."""
+    # Arrange
+    products = [
+        Product(id=uuid.uuid4(), name="Bread", price=1.5),
+        Product(id=uuid.uuid4(), name="Milk", price=2.0),
+    ]
+    mock_product_service.stream_products.return_value = iter(products)
+    mock_product_service.catalog_version.return_value = 3
+
+    # Act
+    response = client.get("/products/", headers={"Accept": "application/x-ndjson"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"catalog-3"'
+    assert response.headers["Vary"] == "Accept"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": str(p.id), "name": p.name, "price": p.price} for p in products
+    ]
+    mock_product_service.get_all_products.assert_not_called()
+
+
+def test_search_products(client: TestClient, mock_product_service: Mock) -> None:
+    """Test searching products by partial name via the API."""
+    # Arrange
+    product = Product(id=uuid.uuid4(), name="Chocolate Milk", price=2.5)
+    mock_product_service.search_products.return_value = [product]
+
+    # Act
+    response = client.get("/products/search", params={"q": "choc mi", "limit": 5})
+    rejected = client.get("/products/search", params={"q": "choc", "limit": 500})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json() == {
+        "products": [{"id": str(product.id), "name": "Chocolate Milk", "price": 2.5}]
+    }
+    assert rejected.status_code == 422
+    mock_product_service.search_products.assert_called_once_with("choc mi", 5)
+
+
+def test_product_codes(client: TestClient, mock_product_service: Mock) -> None:
+    """Test attaching codes to a product and looking it up by one."""
+    # Arrange
+    product = Product(id=uuid.uuid4(), name="Water", price=1.2)
+    mock_product_service.add_product_codes.return_value = ["4860001234567", "WAT"]
+    mock_product_service.get_product_by_code.return_value = product
+
+    # Act
+    added = client.post(
+        f"/products/{product.id}/codes", json={"codes": ["4860001234567", "WAT"]}
+    )
+    found = client.get("/products/codes/WAT")
+
+    # Assert
+    assert added.json() == {
+        "product_id": str(product.id),
+        "codes": ["4860001234567", "WAT"],
+    }
+    assert found.json() == {
+        "product": {"id": str(product.id), "name": "Water", "price": 1.2}
+    }
+    mock_product_service.add_product_codes.assert_called_once_with(
+        product.id, ["4860001234567", "WAT"]
+    )
@@ -0,0 +1,143 @@
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+from core.models.errors import ProductNotFoundError
+from core.models.product import Product
+from core.models.repositories.product_repository import ProductRepository
+from infra.db.database import Database
+from infra.repositories.product_cached_repository import CachedProductRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+@pytest.fixture
+def mock_product_repository() -> Mock:
+    """Return a mock product repository holding two products."""
+    repository = Mock(spec=ProductRepository)
+    repository.get_all.return_value = [
+        Product(id=uuid.uuid4(), name="Bread", price=1.5),
+        Product(id=uuid.uuid4(), name="Milk", price=2.0),
+    ]
+    repository.version.return_value = 4
+    return repository
+
+
+def test_warm_up_serves_lookups_from_memory(mock_product_repository: Mock) -> None:
+    """Test that a warmed cache answers without touching the repository."""
+    # Arrange
+    cache = CachedProductRepository(mock_product_repository)
+    bread, milk = mock_product_repository.get_all.return_value
+
+    # Act
+    cache.warm_up()
+
+    # Assert
+    assert cache.get_by_id(milk.id) is milk
+    assert cache.get_all() == [bread, milk]
+    assert cache.version() == 4
+    mock_product_repository.get_all.assert_called_once()
+    mock_product_repository.get_by_id.assert_not_called()
+
+
+def test_update_price_replaces_entry(mock_product_repository: Mock) -> None:
+    """Test that a price change replaces the cached product."""
+    # Arrange
+    cache = CachedProductRepository(mock_product_repository)
+    cache.warm_up()
+    bread = mock_product_repository.get_all.return_value[0]
+    repriced = Product(id=bread.id, name=bread.name, price=1.8)
+    mock_product_repository.update_price.return_value = repriced
+
+    # Act
+    cache.update_price(bread.id, 1.8)
+
+    # Assert
+    assert cache.get_by_id(bread.id) is repriced
+
+
+def test_miss_reads_through(mock_product_repository: Mock) -> None:
+    """Test that unknown products are loaded once and then cached."""
+    # Arrange
+    cache = CachedProductRepository(mock_product_repository)
+    product = Product(id=uuid.uuid4(), name="Eggs", price=3.0)
+    mock_product_repository.get_by_id.return_value = product
+
+    # Act
+    first = cache.get_by_id(product.id)
+    second = cache.get_by_id(product.id)
+
+    # Assert
+    assert first is second is product
+    mock_product_repository.get_by_id.assert_called_once_with(product.id)
+
+
+def test_read_overlapping_a_write_is_not_cached(
+    mock_product_repository: Mock,
+) -> None:
+    """Test that a miss which read before a price change cannot undo it."""
+    # Arrange
+    cache = CachedProductRepository(mock_product_repository)
+    old = Product(id=uuid.uuid4(), name="Tea", price=1.0)
+    repriced = Product(id=old.id, name="Tea", price=1.2)
+    mock_product_repository.update_price.return_value = repriced
+
+    def read_then_reprice(product_id: uuid.UUID) -> Product:
+        # The row is read, then the write lands before the reader stores it
+        cache.update_price(product_id, 1.2)
+        return old
+
+    mock_product_repository.get_by_id.side_effect = read_then_reprice
+    mock_product_repository.get_by_code.side_effect = lambda code: read_then_reprice(
+        old.id
+    )
+
+    # Act
+    by_id = cache.get_by_id(old.id)
+    cache.invalidate()
+    by_code = cache.get_by_code("TEA")
+
+    # Assert
+    assert by_id is old and by_code is old
+    mock_product_repository.get_by_id.side_effect = None
+    mock_product_repository.get_by_id.return_value = repriced
+    assert cache.get_by_id(old.id) is repriced
+
+
+def test_version_is_the_database_version(db: Database) -> None:
+    """Test that only database writes move the version, and the listing too."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    cache = CachedProductRepository(repository)
+    cache.warm_up()
+    version = cache.version()
+
+    # Act
+    cache.invalidate()
+    after_invalidate = cache.version()
+    repository.create("Written elsewhere", 4.0)
+
+    # Assert
+    assert after_invalidate == version
+    assert cache.version() == repository.version() > version
+    assert [p.name for p in cache.get_all()] == ["Written elsewhere"]
+
+
+def test_catalog_version_follows_writes(db: Database) -> None:
+    """Test that the stored catalog version increases with every write."""
+    # Arrange
+    cache = CachedProductRepository(SQLiteProductRepository(db))
+    cache.warm_up()
+    versions = [cache.version()]
+
+    # Act
+    product = cache.create("Coffee", 9.5)
+    versions.append(cache.version())
+    cache.update_price(product.id, 10.0)
+    versions.append(cache.version())
+
+    # Assert
+    assert versions == sorted(set(versions))
+    assert cache.get_by_id(product.id) == Product(product.id, "Coffee", 10.0)
+    with pytest.raises(ProductNotFoundError):
+        cache.get_by_id(uuid.uuid4())
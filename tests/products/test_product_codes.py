@@ -0,0 +1,87 @@
+import pytest
+
+from core.models.errors import ProductCodeConflictError, ProductNotFoundError
+from core.models.ids import uuid7
+from infra.db.database import Database
+from infra.repositories.product_cached_repository import CachedProductRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+def test_product_has_many_codes(db: Database) -> None:
+    """Test that every code of a product resolves to it with its price."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    water = repository.create("Still Water 0.5L", 1.2)
+    repository.create("Sparkling Water 0.5L", 1.4)
+
+    # Act
+    repository.add_codes(water.id, ["4860001234567", " WAT-05 "])
+    repository.add_codes(water.id, ["4860001234567", "04860001234567"])
+
+    # Assert
+    assert repository.get_by_code("4860001234567") == water
+    assert repository.get_by_code("WAT-05") == water
+    assert repository.get_codes(water.id) == [
+        "04860001234567",
+        "4860001234567",
+        "WAT-05",
+    ]
+    assert repository.get_by_code("0000000000000") is None
+
+
+def test_code_of_another_product_rejects_batch(db: Database) -> None:
+    """Test that codes are unique and a conflicting batch changes nothing."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    bread = repository.create("Bread", 1.0)
+    milk = repository.create("Milk", 2.0)
+    repository.add_codes(bread.id, ["111"])
+    version = repository.version()
+
+    # Act
+    with pytest.raises(ProductCodeConflictError):
+        repository.add_codes(milk.id, ["222", "111"])
+    with pytest.raises(ProductNotFoundError):
+        repository.add_codes(uuid7(), ["333"])
+
+    # Assert
+    assert repository.get_codes(milk.id) == []
+    assert repository.get_by_code("111") == bread
+    assert repository.version() == version
+
+
+def test_warm_cache_scans_without_queries(db: Database) -> None:
+    """Test that a warmed catalog cache resolves codes from memory."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    cheese = repository.create("Cheese", 7.5)
+    repository.add_codes(cheese.id, ["4860009999999"])
+    cache = CachedProductRepository(repository)
+    cache.warm_up()
+
+    # Act
+    with db.count_queries() as queries:
+        scanned = cache.get_by_code("4860009999999")
+
+    # Assert
+    assert scanned == cheese
+    assert queries.count == 0
+
+
+def test_cache_learns_new_codes(db: Database) -> None:
+    """Test that codes added through the cache resolve and bump the version."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    cheese = repository.create("Cheese", 7.5)
+    cache = CachedProductRepository(repository)
+    cache.warm_up()
+    version = cache.version()
+
+    # Act
+    cache.add_codes(cheese.id, ["CHS-1"])
+
+    # Assert
+    with db.count_queries() as queries:
+        assert cache.get_by_code("CHS-1") == cheese
+    assert queries.count == 0
+    assert cache.version() > version
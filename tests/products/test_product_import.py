@@ -0,0 +1,157 @@
+import io
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.models.errors import ImportFormatError
+from core.models.product import CatalogEntry
+from core.services.product_import import (
+    ImportProgress,
+    ImportRowError,
+    import_products,
+)
+from core.services.product_service import ProductService
+from infra.api.app import app
+from infra.api.routers import product_router
+from infra.db.database import Database
+from infra.db.deadline import remaining
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+from runner.dependencies import get_product_service
+from runner.import_products import main
+
+
+def _catalog(db: Database) -> dict[str, tuple[str, int]]:
+    with db.get_connection() as conn:
+        rows = conn.execute("SELECT sku, name, price FROM products").fetchall()
+    return {row["sku"]: (row["name"], row["price"]) for row in rows}
+
+
+def test_csv_import_upserts_in_batches(db: Database) -> None:
+    """Test that rows are upserted by SKU batch by batch, bad rows reported."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    list(import_products(repository, ["sku,name,price\n", "A1,Old name,1.00\n"]))
+    source = io.StringIO(
+        "sku,name,price\n"
+        "A1,Bread,1.25\n"
+        "B2,Milk,2.5\n"
+        "C3,Eggs,-1\n"
+        "D4,,3\n"
+        "E5,Butter,4.75\n"
+    )
+
+    # Act
+    events = list(import_products(repository, source, "csv", batch_size=2))
+
+    # Assert
+    errors = [event for event in events if isinstance(event, ImportRowError)]
+    progress = [event for event in events if isinstance(event, ImportProgress)]
+    assert [(error.line, error.error) for error in errors] == [
+        (4, "invalid price '-1'"),
+        (5, "missing name"),
+    ]
+    assert [(p.batches, p.rows, p.imported, p.rejected) for p in progress] == [
+        (1, 2, 2, 0),
+        (2, 5, 3, 2),
+    ]
+    assert _catalog(db) == {
+        "A1": ("Bread", 125),
+        "B2": ("Milk", 250),
+        "E5": ("Butter", 475),
+    }
+
+
+def test_ndjson_import_rejects_malformed_lines(db: Database) -> None:
+    """Test that NDJSON rows are decoded and validated one line at a time."""
+    # Arrange
+    lines = [
+        json.dumps({"sku": "A1", "name": "Bread", "price": 1.25}) + "\n",
+        "{not json\n",
+        "\n",
+        json.dumps(["A2", "Milk", 2]) + "\n",
+        json.dumps({"sku": "A3", "name": "Tea", "price": "free"}) + "\n",
+    ]
+
+    # Act
+    events = list(
+        import_products(SQLiteProductRepository(db), lines, "ndjson", batch_size=10)
+    )
+
+    # Assert
+    assert [(e.line, e.error) for e in events if isinstance(e, ImportRowError)] == [
+        (2, "invalid JSON"),
+        (4, "row must be an object"),
+        (5, "invalid price 'free'"),
+    ]
+    summary = events[-1]
+    assert isinstance(summary, ImportProgress)
+    assert (summary.batches, summary.rows, summary.imported) == (1, 4, 1)
+    assert _catalog(db) == {"A1": ("Bread", 125)}
+
+
+def test_unknown_format_is_rejected(db: Database) -> None:
+    """Test that an unsupported format fails before anything is read."""
+    with pytest.raises(ImportFormatError):
+        import_products(SQLiteProductRepository(db), [], "xml")
+
+
+def test_cli_writes_error_file(tmp_path: Path) -> None:
+    """Test that the CLI imports a file and writes rejected rows aside."""
+    # Arrange
+    db_path = tmp_path / "pos.db"
+    source = tmp_path / "catalog.csv"
+    source.write_text("sku,name,price\nA1,Bread,1.25\nA2,Milk,oops\n")
+
+    # Act
+    main([str(source), "--db", str(db_path)])
+
+    # Assert
+    errors = (tmp_path / "catalog.csv.errors.ndjson").read_text().splitlines()
+    assert [json.loads(line)["line"] for line in errors] == [3]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT sku FROM products").fetchall() == [("A1",)]
+
+
+class _SlowRepository(SQLiteProductRepository):
+    """Takes its time over every batch, noting the deadline it runs under."""
+
+    def __init__(self, db: Database) -> None:
+        super().__init__(db)
+        self.budgets: List[Optional[float]] = []
+
+    def upsert_many(self, entries: Sequence[CatalogEntry]) -> None:
+        time.sleep(0.05)
+        self.budgets.append(remaining())
+        super().upsert_many(entries)
+
+
+def test_long_import_outlasts_the_step_deadline(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an import is bounded per batch, not as a whole."""
+    # Arrange
+    monkeypatch.setattr(product_router, "STREAM_STEP_DEADLINE", 0.2)
+    repository = _SlowRepository(db)
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_product_service] = lambda: ProductService(repository)
+    body = "sku,name,price\n" + "".join(f"S{i},Item {i},1.00\n" for i in range(100))
+
+    # Act
+    started = time.monotonic()
+    try:
+        response = TestClient(app).post("/products/import?batch_size=10", content=body)
+    finally:
+        app.dependency_overrides = previous
+
+    # Assert
+    assert time.monotonic() - started > 0.2
+    assert response.status_code == 200
+    summary = json.loads(response.text.splitlines()[-1])
+    assert (summary["batches"], summary["imported"]) == (10, 100)
+    assert len(_catalog(db)) == 100
+    assert all(b is not None and b <= 0.2 for b in repository.budgets)
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import List
+
+import httpx
+
+from core.models.product import CatalogEntry
+from core.services.product_service import ProductService
+from infra.api.app import app
+from infra.db.database import Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+from runner.dependencies import get_product_service
+
+
+def test_pages_cover_catalog_in_order(db: Database) -> None:
+    """Test that following the cursor visits every product exactly once."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    created = [repository.create(f"Product {i}", 1.0 + i) for i in range(25)]
+    service = ProductService(repository)
+
+    # Act
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = service.get_products_page(cursor, 10)
+        pages.append(page)
+        if cursor is None:
+            break
+
+    # Assert
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [p.id for page in pages for p in page] == [p.id for p in created]
+
+
+def test_last_full_page_has_no_cursor(db: Database) -> None:
+    """Test that a page ending exactly at the catalog end reports no next page."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    for i in range(4):
+        repository.create(f"Product {i}", 1.0)
+    service = ProductService(repository)
+
+    # Act
+    page, cursor = service.get_products_page(None, 4)
+
+    # Assert
+    assert len(page) == 4
+    assert cursor is None
+
+
+def test_iter_all_streams_every_product(db: Database) -> None:
+    """Test that streaming yields the whole catalog in id order."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    created = [repository.create(f"Product {i}", 2.5) for i in range(1_200)]
+
+    # Act
+    streamed = list(repository.iter_all())
+
+    # Assert
+    assert streamed == created
+
+
+def test_concurrent_ndjson_streams(db: Database) -> None:
+    """Test that many NDJSON listings can stream from the database at once."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    repository.upsert_many(
+        [CatalogEntry(f"S{i}", f"Product {i}", 1.0) for i in range(1_200)]
+    )
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_product_service] = lambda: ProductService(repository)
+
+    async def stream() -> List[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://pos") as c:
+            return await asyncio.gather(
+                *(
+                    c.get("/products/", headers={"Accept": "application/x-ndjson"})
+                    for _ in range(16)
+                )
+            )
+
+    # Act
+    try:
+        responses = asyncio.run(stream())
+    finally:
+        app.dependency_overrides = previous
+
+    # Assert
+    for response in responses:
+        lines = response.text.splitlines()
+        assert response.status_code == 200
+        assert len(lines) == 1_200
+        assert json.loads(lines[0])["name"] == "Product 0"
@@ -71,7 +71,7 @@ def test_create_product(
 
     mock_cursor.execute.assert_called_once_with(
         "INSERT INTO products (id, name, price) VALUES (?, ?, ?)",
-        ("00000000-0000-0000-0000-000000000001", name, price),
+        (uuid.UUID("00000000-0000-0000-0000-000000000001").bytes, name, 1099),
     )
     conn = cast(MockConnection, mock_db.get_connection())
     assert conn.committed is True
@@ -84,9 +84,9 @@ def test_get_by_id_found(
     # Arrange
     product_id = uuid.UUID("00000000-0000-0000-0000-000000000001")
     mock_cursor.fetchone.return_value = {
-        "id": product_id,
+        "id": product_id.bytes,
         "name": "Test Product",
-        "price": 10.99,
+        "price": 1099,
     }
 
     # Act
@@ -99,7 +99,7 @@ def test_get_by_id_found(
     assert product.price == 10.99
 
     mock_cursor.execute.assert_called_once_with(
-        "SELECT * FROM products WHERE id = ?", (str(product_id),)
+        "SELECT * FROM products WHERE id = ?", (product_id.bytes,)
     )
 
 
@@ -112,8 +112,8 @@ def test_get_all(
     product_id_2 = uuid.UUID("00000000-0000-0000-0000-000000000002")
 
     mock_cursor.fetchall.return_value = [
-        {"id": product_id_1, "name": "Product 1", "price": 10.99},
-        {"id": product_id_2, "name": "Product 2", "price": 20.99},
+        {"id": product_id_1.bytes, "name": "Product 1", "price": 1099},
+        {"id": product_id_2.bytes, "name": "Product 2", "price": 2099},
     ]
 
     # Act
@@ -158,7 +158,7 @@ def test_update_price_success(
     assert product.price == 15.99
 
     mock_cursor.execute.assert_called_once_with(
-        "UPDATE products SET price = ? WHERE id = ?", (15.99, str(product_id))
+        "UPDATE products SET price = ? WHERE id = ?", (1599, product_id.bytes)
     )
     conn = cast(MockConnection, mock_db.get_connection())
     assert conn.committed is True
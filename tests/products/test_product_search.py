@@ -0,0 +1,112 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from core.models.product import CatalogEntry
+from infra.db.database import Database
+from infra.repositories import product_sqlite_repository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+
+
+def test_search_matches_word_prefixes(db: Database) -> None:
+    """Test that every query word must start a word of the name."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    for name in ["Dark Chocolate Bar", "Chocolate Milk", "Milk Bread", "Chips"]:
+        repository.create(name, 1.0)
+
+    # Act
+    chocolate = repository.search("choc", 10)
+    chocolate_milk = repository.search("mil cho", 10)
+
+    # Assert
+    assert {p.name for p in chocolate} == {"Dark Chocolate Bar", "Chocolate Milk"}
+    assert [p.name for p in chocolate_milk] == ["Chocolate Milk"]
+
+
+def test_search_ranks_and_limits(db: Database) -> None:
+    """Test that closer matches come first and the limit is applied."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    repository.create("Apple Juice With Added Pulp And Extra Vitamins", 3.0)
+    repository.create("Apple", 0.5)
+    repository.create("Apple Pie", 4.0)
+
+    # Act
+    results = repository.search("apple", 2)
+
+    # Assert
+    assert [p.name for p in results] == ["Apple", "Apple Pie"]
+
+
+def test_best_match_beyond_the_candidates_comes_first(
+    db: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a full query ranks every match, not just the first few."""
+    # Arrange
+    monkeypatch.setattr(product_sqlite_repository, "SEARCH_CANDIDATES", 2)
+    repository = SQLiteProductRepository(db)
+    repository.upsert_many(
+        [
+            CatalogEntry(f"A{i}", f"Apple Juice With Pulp And Vitamins {i}", 3.0)
+            for i in range(5)
+        ]
+    )
+    repository.create("Apple", 0.5)
+
+    # Act
+    results = repository.search("apple", 1)
+
+    # Assert
+    assert [p.name for p in results] == ["Apple"]
+
+
+def test_search_follows_catalog_changes(db: Database) -> None:
+    """Test that the index is kept in sync with inserts and renames."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    repository.upsert_many([CatalogEntry(sku="YG-1", name="Yogurt", price=1.0)])
+
+    # Act
+    repository.upsert_many([CatalogEntry(sku="YG-1", name="Kefir", price=1.2)])
+
+    # Assert
+    assert repository.search("yog", 10) == []
+    assert [p.name for p in repository.search("kef", 10)] == ["Kefir"]
+    assert [p.name for p in repository.search("yg", 10)] == ["Kefir"]
+
+
+def test_search_treats_operators_as_text(db: Database) -> None:
+    """Test that quotes, stars and FTS keywords in a query are not syntax."""
+    # Arrange
+    repository = SQLiteProductRepository(db)
+    repository.create("Salt OR Pepper", 1.0)
+
+    # Act
+    results = repository.search('salt "OR* pep-', 10)
+
+    # Assert
+    assert [p.name for p in results] == ["Salt OR Pepper"]
+    assert repository.search("  ** ", 10) == []
+
+
+def test_existing_catalog_is_indexed(tmp_path: Path) -> None:
+    """Test that products stored before the index existed are searchable."""
+    # Arrange
+    db_path = tmp_path / "catalog.db"
+    Database(str(db_path))
+    with sqlite3.connect(db_path) as conn:
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER products_{event}_search")
+        conn.execute("DROP TABLE products_fts")
+        conn.execute(
+            "INSERT INTO products (id, name, price) VALUES (?, 'Sourdough', 350)",
+            (b"\x01" * 16,),
+        )
+
+    # Act
+    repository = SQLiteProductRepository(Database(str(db_path)))
+
+    # Assert
+    assert [p.name for p in repository.search("sour", 10)] == ["Sourdough"]
@@ -0,0 +1,114 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator
+from uuid import uuid4
+
+import pytest
+
+from core.models.errors import ReceiptVersionConflictError
+from core.models.receipt import Currency, ReceiptStatus
+from infra.db.database import Database
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+
+
+def _insert_receipt(conn: sqlite3.Connection) -> bytes:
+    receipt_id = uuid4().bytes
+    conn.execute(
+        "INSERT INTO receipts (id, shift_id, status, subtotal, discount_amount,"
+        " total) VALUES (?, ?, 'open', 0, 0, 0)",
+        (receipt_id, uuid4().bytes),
+    )
+    return receipt_id
+
+
+def _receipt_count(db: Database) -> int:
+    with db.get_connection() as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0])
+
+
+@pytest.fixture
+def queued_db(db: Database) -> Generator[Database, None, None]:
+    """The test database with writes going through the write queue."""
+    db.start_write_queue(max_batch=100, max_delay=0.05)
+    yield db
+    db.stop_write_queue()
+
+
+def test_concurrent_writes_share_commits(queued_db: Database) -> None:
+    """Test that writes submitted together are committed in one transaction."""
+    # Arrange
+    units = 40
+
+    # Act
+    with queued_db.count_queries() as queries:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            ids = list(
+                pool.map(lambda _: queued_db.write(_insert_receipt), range(units))
+            )
+
+    # Assert
+    stats = queued_db.write_queue.stats()  # type: ignore[union-attr]
+    commits = [s for s in queries.statements if s.upper().startswith("COMMIT")]
+    assert len(set(ids)) == units
+    assert _receipt_count(queued_db) == units
+    assert stats.units == units
+    assert len(commits) == stats.batches < units
+
+
+def test_failed_unit_is_rolled_back_alone(queued_db: Database) -> None:
+    """Test that a unit that raises does not take its batch down with it."""
+
+    # Arrange
+    def fail(conn: sqlite3.Connection) -> None:
+        _insert_receipt(conn)
+        raise ValueError("rejected")
+
+    # Act
+    first = queued_db.submit_write(_insert_receipt)
+    failed = queued_db.submit_write(fail)
+    last = queued_db.submit_write(_insert_receipt)
+
+    # Assert
+    with pytest.raises(ValueError, match="rejected"):
+        failed.result()
+    assert first.result() != last.result()
+    assert _receipt_count(queued_db) == 2
+    stats = queued_db.write_queue.stats()  # type: ignore[union-attr]
+    assert (stats.units, stats.failed_units) == (2, 1)
+
+
+def test_stop_commits_queued_writes(db: Database) -> None:
+    """Test that stopping the queue commits what was already submitted."""
+    # Arrange
+    db.start_write_queue(max_delay=1.0)
+    futures = [db.submit_write(_insert_receipt) for _ in range(3)]
+
+    # Act
+    db.stop_write_queue()
+
+    # Assert
+    assert all(future.done() for future in futures)
+    assert _receipt_count(db) == 3
+    assert db.write_queue is None
+    db.write(_insert_receipt)
+    assert _receipt_count(db) == 4
+
+
+def test_receipt_repository_through_queue(queued_db: Database) -> None:
+    """Test the receipt write path end to end with group commit on."""
+    # Arrange
+    repository = SQLiteReceiptRepository(queued_db)
+    receipt = repository.create(uuid4())
+    stale = repository.get(receipt.id)
+    receipt.subtotal = receipt.total = 10.0
+
+    # Act
+    repository.update(receipt.id, receipt)
+    with pytest.raises(ReceiptVersionConflictError):
+        repository.update(receipt.id, stale)
+    paid = repository.add_payment(receipt.id, 10.0, Currency.GEL, 1.0)
+
+    # Assert
+    assert paid is not None
+    assert repository.get(receipt.id).status == ReceiptStatus.CLOSED
+    assert repository.get(receipt.id).version == 2
@@ -0,0 +1,113 @@
+import pytest
+
+from core.models.errors import IdempotencyKeyReusedError
+from core.models.receipt import (
+    Currency,
+    PaymentStatus,
+    Receipt,
+    ReceiptItem,
+    ReceiptStatus,
+)
+from infra.db.database import Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
+
+
+@pytest.fixture
+def receipt_repository(db: Database) -> SQLiteReceiptRepository:
+    """Return a receipt repository on the test database."""
+    return SQLiteReceiptRepository(db)
+
+
+def _open_receipt(db: Database, total: float) -> Receipt:
+    """Store an open receipt holding one line worth ``total``."""
+    shift = SQLiteShiftRepository(db).create()
+    product = SQLiteProductRepository(db).create("Coffee", total)
+    repository = SQLiteReceiptRepository(db)
+    receipt = repository.create(shift.id)
+    item = ReceiptItem(product_id=product.id, quantity=1, unit_price=total)
+    receipt.add_item(item)
+    receipt.recalculate_totals()
+    return repository.update(receipt.id, receipt)
+
+
+def test_payment_is_one_transaction(
+    db: Database, receipt_repository: SQLiteReceiptRepository
+) -> None:
+    """Test that paying reads the receipt once and commits once."""
+    # Arrange
+    receipt = _open_receipt(db, 12.5)
+
+    # Act
+    with db.count_queries() as queries:
+        result = receipt_repository.add_payment(receipt.id, 12.5, Currency.GEL, 1.0)
+
+    # Assert
+    assert result is not None
+    payment, paid = result
+    assert payment.status == PaymentStatus.COMPLETED
+    assert paid.status == ReceiptStatus.CLOSED
+    assert queries.statements.count("COMMIT") == 1
+    assert sum("FROM receipts WHERE" in s for s in queries.statements) == 1
+    stored = receipt_repository.get(receipt.id)
+    assert stored.status == ReceiptStatus.CLOSED
+    assert [p.id for p in stored.payments] == [payment.id]
+
+
+def test_retry_with_same_key_returns_first_payment(
+    db: Database, receipt_repository: SQLiteReceiptRepository
+) -> None:
+    """Test that a retried payment is not recorded twice."""
+    # Arrange
+    receipt = _open_receipt(db, 30.0)
+    first = receipt_repository.add_payment(
+        receipt.id, 20.0, Currency.GEL, 1.0, "lane-1-42"
+    )
+
+    # Act
+    retry = receipt_repository.add_payment(
+        receipt.id, 20.0, Currency.GEL, 1.0, "lane-1-42"
+    )
+
+    # Assert
+    assert first is not None and retry is not None
+    assert retry[0] == first[0]
+    assert retry[0].status == PaymentStatus.FAILED
+    assert len(receipt_repository.get(receipt.id).payments) == 1
+
+
+def test_retry_after_closing_payment_is_replayed(
+    db: Database, receipt_repository: SQLiteReceiptRepository
+) -> None:
+    """Test that a retry still succeeds once its first attempt closed the receipt."""
+    # Arrange
+    receipt = _open_receipt(db, 30.0)
+    first = receipt_repository.add_payment(
+        receipt.id, 11.5, Currency.USD, 2.7, "lane-2-7"
+    )
+
+    # Act
+    retry = receipt_repository.add_payment(
+        receipt.id, 11.5, Currency.USD, 2.7, "lane-2-7"
+    )
+    other = receipt_repository.add_payment(receipt.id, 30.0, Currency.GEL, 1.0)
+
+    # Assert
+    assert first is not None and retry is not None
+    assert retry[0] == first[0]
+    assert retry[1].status == ReceiptStatus.CLOSED
+    assert other is None
+
+
+def test_key_reused_for_different_payment(
+    db: Database, receipt_repository: SQLiteReceiptRepository
+) -> None:
+    """Test that a key cannot be replayed with a different amount."""
+    # Arrange
+    receipt = _open_receipt(db, 30.0)
+    receipt_repository.add_payment(receipt.id, 10.0, Currency.GEL, 1.0, "k-1")
+
+    # Act / Assert
+    with pytest.raises(IdempotencyKeyReusedError):
+        receipt_repository.add_payment(receipt.id, 15.0, Currency.GEL, 1.0, "k-1")
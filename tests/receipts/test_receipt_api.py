@@ -282,7 +282,9 @@ def test_add_payment(client: TestClient, mock_receipt_service: Mock) -> None:
     assert receipt_response["status"] == "closed"
 
     # Check service calls
-    mock_receipt_service.add_payment.assert_called_once_with(receipt_id, 100.0, "GEL")
+    mock_receipt_service.add_payment.assert_called_once_with(
+        receipt_id, 100.0, "GEL", idempotency_key=None
+    )
 
 
 def test_add_payment_receipt_not_found(
@@ -307,7 +309,9 @@ def test_add_payment_receipt_not_found(
     assert f"Receipt with ID '{receipt_id}'" in data["detail"]
 
     # Check service calls
-    mock_receipt_service.add_payment.assert_called_once_with(receipt_id, 100.0, "GEL")
+    mock_receipt_service.add_payment.assert_called_once_with(
+        receipt_id, 100.0, "GEL", idempotency_key=None
+    )
 
 
 def test_add_payment_invalid_currency(
@@ -334,7 +338,7 @@ def test_add_payment_invalid_currency(
 
     # Check service calls
     mock_receipt_service.add_payment.assert_called_once_with(
-        receipt_id, 100.0, "INVALID"
+        receipt_id, 100.0, "INVALID", idempotency_key=None
     )
 
 
@@ -404,3 +408,87 @@ def test_get_receipt_not_found(client: TestClient, mock_receipt_service: Mock) -
 
     # Check service calls
     mock_receipt_service.get_receipt.assert_called_once_with(receipt_id)
+
+
+def test_scan_product(client: TestClient, mock_receipt_service: Mock) -> None:
+    """Test scanning a barcode onto a receipt via the API."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    mock_receipt_service.scan_product.return_value = receipt
+
+    # Act
+    response = client.post(
+        f"/receipts/{receipt.id}/scans", json={"code": "4860001234567"}
+    )
+    empty = client.post(f"/receipts/{receipt.id}/scans", json={"code": ""})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["receipt"]["id"] == str(receipt.id)
+    assert empty.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    mock_receipt_service.scan_product.assert_called_once_with(
+        receipt.id, "4860001234567", 1
+    )
+
+
+def test_add_payment_idempotency_key(
+    client: TestClient, mock_receipt_service: Mock
+) -> None:
+    """Test that the Idempotency-Key header is passed to the service."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    payment = receipt.settle(5.0, Currency.GEL, 1.0)
+    mock_receipt_service.add_payment.return_value = (payment, receipt)
+
+    # Act
+    response = client.post(
+        f"/receipts/{receipt.id}/payments",
+        json={"amount": 5.0, "currency": "GEL"},
+        headers={"Idempotency-Key": "lane-4-0193"},
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["payment"]["id"] == str(payment.id)
+    mock_receipt_service.add_payment.assert_called_once_with(
+        receipt.id, 5.0, "GEL", idempotency_key="lane-4-0193"
+    )
+
+
+def test_remove_product_from_receipt(
+    client: TestClient, mock_receipt_service: Mock
+) -> None:
+    """Test removing a product from a receipt via the API."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    product_id = uuid.uuid4()
+    mock_receipt_service.remove_product.return_value = receipt
+
+    # Act
+    response = client.delete(
+        f"/receipts/{receipt.id}/products/{product_id}", params={"quantity": 2}
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["receipt"]["id"] == str(receipt.id)
+    mock_receipt_service.remove_product.assert_called_once_with(
+        receipt.id, product_id, 2
+    )
+
+
+def test_receipt_lock_stats(client: TestClient, mock_receipt_service: Mock) -> None:
+    """Test that receipt mutations are counted in the lock stats."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    mock_receipt_service.scan_product.return_value = receipt
+    before = client.get("/receipts/locks/stats").json()
+
+    # Act
+    client.post(f"/receipts/{receipt.id}/scans", json={"code": "4860001234567"})
+    after = client.get("/receipts/locks/stats").json()
+
+    # Assert
+    assert after["acquisitions"] == before["acquisitions"] + 1
+    assert after["active_receipts"] == 0
+    assert after["waiting"] == 0
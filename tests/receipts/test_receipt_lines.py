@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+from core.models.receipt import Receipt, ReceiptItem
+
+
+def _receipt(lines: int) -> Receipt:
+    receipt = Receipt(shift_id=uuid4())
+    for _ in range(lines):
+        receipt.add_item(ReceiptItem(product_id=uuid4(), quantity=1, unit_price=1.0))
+    return receipt
+
+
+def test_find_item_by_product() -> None:
+    """Test that lines are found by product id."""
+    # Arrange
+    receipt = _receipt(300)
+    wanted = receipt.products[150]
+
+    # Act & Assert
+    assert receipt.find_item(wanted.product_id) is wanted
+    assert receipt.find_item(uuid4()) is None
+
+
+def test_remove_item_keeps_order_and_index() -> None:
+    """Test that removing a line keeps the rest in order and findable."""
+    # Arrange
+    receipt = _receipt(5)
+    removed_id = receipt.products[1].product_id
+    remaining = [receipt.products[i] for i in (0, 2, 3, 4)]
+
+    # Act
+    removed = receipt.remove_item(removed_id)
+
+    # Assert
+    assert removed is not None and removed.product_id == removed_id
+    assert receipt.products == remaining
+    assert receipt.find_item(removed_id) is None
+    assert all(receipt.find_item(item.product_id) is item for item in remaining)
+
+
+def test_index_follows_direct_list_changes() -> None:
+    """Test that edits made straight to the products list are picked up."""
+    # Arrange
+    receipt = _receipt(3)
+    appended = ReceiptItem(product_id=uuid4(), quantity=1, unit_price=2.0)
+    replacement = ReceiptItem(product_id=uuid4(), quantity=1, unit_price=3.0)
+    replaced_id = receipt.products[0].product_id
+
+    # Act
+    receipt.products.append(appended)
+    receipt.products[0] = replacement
+
+    # Assert
+    assert receipt.find_item(appended.product_id) is appended
+    assert receipt.find_item(replaced_id) is None
+    assert receipt.find_item(replacement.product_id) is replacement
+
+    # Act
+    receipt.products = []
+
+    # Assert
+    assert receipt.find_item(appended.product_id) is None
+
+
+def test_index_follows_in_place_replacement() -> None:
+    """Test that a line replaced in place is found, and the old one is not."""
+    # Arrange
+    receipt = _receipt(3)
+    replaced_id = receipt.products[1].product_id
+    receipt.find_item(replaced_id)
+    replacement = ReceiptItem(product_id=uuid4(), quantity=2, unit_price=4.0)
+
+    # Act
+    receipt.products[1] = replacement
+
+    # Assert
+    assert receipt.find_item(replacement.product_id) is replacement
+    assert receipt.find_item(replaced_id) is None
+    assert receipt.remove_item(replaced_id) is None
+    assert receipt.remove_item(replacement.product_id) is replacement
+    assert len(receipt.products) == 2
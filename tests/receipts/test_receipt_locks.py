@@ -0,0 +1,104 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from core.services.keyed_lock import KeyedLock
+
+
+async def _record(
+    locks: KeyedLock, key: str, label: str, events: List[str], pause: float
+) -> None:
+    async with locks.hold(key):
+        events.append(f"{label} start")
+        await asyncio.sleep(pause)
+        events.append(f"{label} end")
+
+
+def test_same_key_runs_in_arrival_order() -> None:
+    """Test that work on one key never overlaps and keeps its order."""
+    # Arrange
+    locks = KeyedLock()
+    events: List[str] = []
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            *(_record(locks, "r1", str(n), events, 0.01) for n in range(3))
+        )
+
+    # Act
+    asyncio.run(scenario())
+
+    # Assert
+    assert events == ["0 start", "0 end", "1 start", "1 end", "2 start", "2 end"]
+    stats = locks.stats()
+    assert stats.acquisitions == 3
+    assert stats.contended == 2
+    assert stats.max_wait > 0
+    assert stats.mean_wait > 0
+
+
+def test_different_keys_run_in_parallel() -> None:
+    """Test that holding one key does not block another."""
+    # Arrange
+    locks = KeyedLock()
+    events: List[str] = []
+
+    async def scenario() -> None:
+        await asyncio.gather(
+            _record(locks, "r1", "a", events, 0.02),
+            _record(locks, "r2", "b", events, 0.0),
+        )
+
+    # Act
+    asyncio.run(scenario())
+
+    # Assert
+    assert events == ["a start", "b start", "b end", "a end"]
+    assert locks.stats().contended == 0
+
+
+def test_idle_locks_are_dropped() -> None:
+    """Test that a key's lock is removed once nobody holds or waits for it."""
+    # Arrange
+    locks = KeyedLock()
+    sizes: List[int] = []
+
+    async def scenario() -> None:
+        async with locks.hold("r1"):
+            sizes.append(len(locks))
+            waiter = asyncio.create_task(_record(locks, "r1", "w", [], 0))
+            await asyncio.sleep(0)
+            sizes.append(locks.stats().waiting)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        sizes.append(len(locks))
+
+    # Act
+    asyncio.run(scenario())
+
+    # Assert
+    assert sizes == [1, 1, 0]
+    assert locks.stats().waiting == 0
+    assert locks.stats().acquisitions == 1
+
+
+def test_lock_is_released_on_error() -> None:
+    """Test that an exception inside the block releases the key."""
+    # Arrange
+    locks = KeyedLock()
+
+    async def scenario() -> None:
+        with pytest.raises(RuntimeError):
+            async with locks.hold("r1"):
+                raise RuntimeError("boom")
+        async with locks.hold("r1"):
+            pass
+
+    # Act
+    asyncio.run(scenario())
+
+    # Assert
+    assert len(locks) == 0
+    assert locks.stats().acquisitions == 2
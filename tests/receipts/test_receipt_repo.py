@@ -1,3 +1,4 @@
+from typing import Any, Callable
 from unittest.mock import MagicMock, Mock, patch
 from uuid import UUID, uuid4
 
@@ -6,12 +7,16 @@ import pytest
 from core.models.errors import ReceiptNotFoundError
 from core.models.receipt import (
     Currency,
+    Discount,
     PaymentStatus,
     Receipt,
+    ReceiptItem,
     ReceiptStatus,
 )
 from infra.db.database import Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
 from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
 
 
 @pytest.fixture
@@ -23,6 +28,13 @@ def mock_db() -> Mock:
     mock_connection.__enter__.return_value = mock_connection
     mock_connection.cursor.return_value = mock_cursor
     mock_db.get_connection.return_value = mock_connection
+
+    def write(work: Callable[[Any], Any]) -> Any:
+        result = work(mock_connection)
+        mock_connection.commit()
+        return result
+
+    mock_db.write.side_effect = write
     return mock_db
 
 
@@ -66,8 +78,8 @@ def test_create_receipt(
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
         (
-            "00000000-0000-0000-0000-000000000001",
-            str(shift_id),
+            UUID("00000000-0000-0000-0000-000000000001").bytes,
+            shift_id.bytes,
             ReceiptStatus.OPEN.value,
             0,
             0,
@@ -92,21 +104,23 @@ def test_get_receipt_with_discounts(
 
     # Mock receipt basic info
     receipt_row = {
-        "id": str(receipt_id),
-        "shift_id": str(shift_id),
+        "id": receipt_id.bytes,
+        "shift_id": shift_id.bytes,
         "status": ReceiptStatus.OPEN.value,
-        "subtotal": 150.0,
-        "discount_amount": 25.0,
-        "total": 125.0,
+        "subtotal": 15000,
+        "discount_amount": 2500,
+        "total": 12500,
+        "version": 0,
     }
 
     # Mock receipt-level discounts
     campaign_id_receipt = uuid4()
     receipt_discount_rows = [
         {
-            "campaign_id": str(campaign_id_receipt),
+            "receipt_id": receipt_id.bytes,
+            "campaign_id": campaign_id_receipt.bytes,
             "campaign_name": "Weekend Special",
-            "discount_amount": 15.0,
+            "discount_amount": 1500,
         }
     ]
 
@@ -116,56 +130,47 @@ def test_get_receipt_with_discounts(
     product_id_1 = uuid4()
     product_id_2 = uuid4()
 
+    # Mock item discount data for both items
+    campaign_id_1 = uuid4()
+    campaign_id_2 = uuid4()
+
+    # Items come back joined with their discounts, one row per discount
     item_rows = [
         {
-            "id": str(item_id_1),
-            "receipt_id": str(receipt_id),
-            "product_id": str(product_id_1),
+            "item_id": item_id_1.bytes,
+            "receipt_id": receipt_id.bytes,
+            "product_id": product_id_1.bytes,
             "quantity": 2,
-            "unit_price": 45.0,
-            "total_price": 90.0,
-            "final_price": 85.0,
+            "unit_price": 4500,
+            "total_price": 9000,
+            "final_price": 8500,
+            "campaign_id": campaign_id_1.bytes,
+            "campaign_name": "First Item Discount",
+            "discount_amount": 500,
         },
         {
-            "id": str(item_id_2),
-            "receipt_id": str(receipt_id),
-            "product_id": str(product_id_2),
+            "item_id": item_id_2.bytes,
+            "receipt_id": receipt_id.bytes,
+            "product_id": product_id_2.bytes,
             "quantity": 3,
-            "unit_price": 20.0,
-            "total_price": 60.0,
-            "final_price": 55.0,
-        },
-    ]
-
-    # Mock item discount data for first item
-    campaign_id_1 = uuid4()
-    discount_rows_1 = [
-        {
-            "campaign_id": str(campaign_id_1),
-            "campaign_name": "First Item Discount",
-            "discount_amount": 5.0,
-        }
-    ]
-
-    # Mock item discount data for second item
-    campaign_id_2 = uuid4()
-    discount_rows_2 = [
-        {
-            "campaign_id": str(campaign_id_2),
+            "unit_price": 2000,
+            "total_price": 6000,
+            "final_price": 5500,
+            "campaign_id": campaign_id_2.bytes,
             "campaign_name": "Bulk Purchase",
-            "discount_amount": 5.0,
-        }
+            "discount_amount": 500,
+        },
     ]
 
     # Mock payment data
     payment_id = uuid4()
     payment_rows = [
         {
-            "id": str(payment_id),
-            "receipt_id": str(receipt_id),
-            "payment_amount": 125.0,
+            "id": payment_id.bytes,
+            "receipt_id": receipt_id.bytes,
+            "payment_amount": 12500,
             "currency": Currency.GEL.value,
-            "total_in_gel": 125.0,
+            "total_in_gel": 12500,
             "exchange_rate": 1.0,
             "status": PaymentStatus.COMPLETED.value,
         }
@@ -178,9 +183,7 @@ def test_get_receipt_with_discounts(
     ]  # For receipt and potential non-existing receipt
     mock_cursor.fetchall.side_effect = [
         receipt_discount_rows,  # For receipt-level discounts
-        item_rows,  # For receipt items
-        discount_rows_1,  # For first item discounts
-        discount_rows_2,  # For second item discounts
+        item_rows,  # For receipt items and their discounts
         payment_rows,  # For payments
     ]
 
@@ -243,30 +246,19 @@ def test_get_receipt_with_discounts(
     # Check DB calls
     mock_cursor.execute.assert_any_call(
         "SELECT * FROM receipts WHERE id = ?",
-        (str(receipt_id),),
+        (receipt_id.bytes,),
     )
     mock_cursor.execute.assert_any_call(
         "SELECT * FROM receipt_discounts WHERE receipt_id = ?",
-        (str(receipt_id),),
-    )
-    mock_cursor.execute.assert_any_call(
-        "SELECT * FROM receipt_items WHERE receipt_id = ?",
-        (str(receipt_id),),
+        (receipt_id.bytes,),
     )
 
-    # Check that item discount queries were made with correct item IDs
-    mock_cursor.execute.assert_any_call(
-        "SELECT * FROM receipt_item_discounts WHERE receipt_item_id = ?",
-        (str(item_id_1),),
-    )
-    mock_cursor.execute.assert_any_call(
-        "SELECT * FROM receipt_item_discounts WHERE receipt_item_id = ?",
-        (str(item_id_2),),
-    )
+    # Item discounts are loaded with the items, not with one query per item
+    assert mock_cursor.execute.call_count == 4
 
     mock_cursor.execute.assert_any_call(
         "SELECT * FROM payments WHERE receipt_id = ?",
-        (str(receipt_id),),
+        (receipt_id.bytes,),
     )
 
 
@@ -292,7 +284,7 @@ def test_get_receipt_not_found(
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
         "SELECT * FROM receipts WHERE id = ?",
-        (str(receipt_id),),
+        (receipt_id.bytes,),
     )
 
 
@@ -319,8 +311,8 @@ def test_update_status(
 
     # Check DB calls
     mock_db.get_connection.return_value.__enter__.return_value.cursor.return_value.execute.assert_called_once_with(
-        "UPDATE receipts SET status = ? WHERE id = ?",
-        (new_status.value, str(receipt_id)),
+        "UPDATE receipts SET status = ?, version = version + 1 WHERE id = ?",
+        (new_status.value, receipt_id.bytes),
     )
     mock_db.get_connection.return_value.__enter__.return_value.commit.assert_called_once()
 
@@ -338,29 +330,99 @@ def test_get_receipts_by_shift(
     mock_cursor = (
         mock_db.get_connection.return_value.__enter__.return_value.cursor.return_value
     )
-    mock_cursor.fetchall.return_value = [
-        {"id": str(receipt_id_1)},
-        {"id": str(receipt_id_2)},
+    mock_cursor.fetchall.side_effect = [
+        [
+            {
+                "id": receipt_id_1.bytes,
+                "shift_id": shift_id.bytes,
+                "status": ReceiptStatus.OPEN.value,
+                "subtotal": 0.0,
+                "discount_amount": 0.0,
+                "total": 0.0,
+                "version": 0,
+            },
+            {
+                "id": receipt_id_2.bytes,
+                "shift_id": shift_id.bytes,
+                "status": ReceiptStatus.CLOSED.value,
+                "subtotal": 0.0,
+                "discount_amount": 0.0,
+                "total": 0.0,
+                "version": 0,
+            },
+        ],
+        [],  # Receipt-level discounts
+        [],  # Items
+        [],  # Payments
     ]
 
-    # Mock receipt objects to be returned by get method
-    receipt_1 = Receipt(id=receipt_id_1, shift_id=shift_id, status=ReceiptStatus.OPEN)
-    receipt_2 = Receipt(id=receipt_id_2, shift_id=shift_id, status=ReceiptStatus.CLOSED)
-
-    # Set up mock for the get method
-    with patch.object(
-        SQLiteReceiptRepository, "get", side_effect=[receipt_1, receipt_2]
-    ):
-        # Act
-        receipts = receipt_repository.get_receipts_by_shift(shift_id)
+    # Act
+    receipts = receipt_repository.get_receipts_by_shift(shift_id)
 
     # Assert
     assert len(receipts) == 2
     assert receipts[0].id == receipt_id_1
     assert receipts[1].id == receipt_id_2
+    assert receipts[1].status == ReceiptStatus.CLOSED
 
-    # Check DB calls
-    mock_cursor.execute.assert_called_once_with(
-        "SELECT id FROM receipts WHERE shift_id = ?",
-        (str(shift_id),),
+    # Check DB calls: the shift's receipts are hydrated in one batch
+    mock_cursor.execute.assert_any_call(
+        "SELECT * FROM receipts WHERE shift_id = ?",
+        (shift_id.bytes,),
     )
+    assert mock_cursor.execute.call_count == 4
+
+
+def _store_receipt(db: Database, shift_id: UUID, item_count: int) -> UUID:
+    """Persist a receipt with ``item_count`` discounted lines."""
+    products = SQLiteProductRepository(db)
+    receipts = SQLiteReceiptRepository(db)
+    receipt = receipts.create(shift_id)
+    for index in range(item_count):
+        product = products.create(f"Product {index}", 2.0)
+        receipt.products.append(
+            ReceiptItem(
+                product_id=product.id,
+                quantity=1,
+                unit_price=product.price,
+                discounts=[Discount(uuid4(), "Promo", 0.5)],
+            )
+        )
+    receipt.recalculate_totals()
+    receipts.update(receipt.id, receipt)
+    return receipt.id
+
+
+@pytest.mark.parametrize("item_count", [1, 25])
+def test_get_receipt_query_budget(db: Database, item_count: int) -> None:
+    """Test that loading a receipt takes 4 queries regardless of item count."""
+    # Arrange
+    shift_id = SQLiteShiftRepository(db).create().id
+    receipt_id = _store_receipt(db, shift_id, item_count)
+
+    # Act
+    with db.count_queries() as queries:
+        receipt = SQLiteReceiptRepository(db).get(receipt_id)
+
+    # Assert
+    assert len(receipt.products) == item_count
+    assert all(len(item.discounts) == 1 for item in receipt.products)
+    assert queries.count <= 4
+
+
+@pytest.mark.parametrize("receipt_count", [1, 10])
+def test_get_receipts_by_shift_query_budget(db: Database, receipt_count: int) -> None:
+    """Test that loading a shift's receipts does not issue queries per receipt."""
+    # Arrange
+    shift_id = SQLiteShiftRepository(db).create().id
+    for _ in range(receipt_count):
+        _store_receipt(db, shift_id, 3)
+
+    # Act
+    with db.count_queries() as queries:
+        receipts = SQLiteReceiptRepository(db).get_receipts_by_shift(shift_id)
+
+    # Assert
+    assert len(receipts) == receipt_count
+    assert all(len(receipt.products) == 3 for receipt in receipts)
+    assert queries.count <= 4
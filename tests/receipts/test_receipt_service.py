@@ -3,10 +3,10 @@ from unittest.mock import Mock
 
 import pytest
 
-from core.models.errors import ShiftNotFoundError
+from core.models.errors import ProductCodeNotFoundError, ShiftNotFoundError
+from core.models.product import Product
 from core.models.receipt import (
     Currency,
-    Payment,
     PaymentStatus,
     Quote,
     Receipt,
@@ -473,183 +473,76 @@ def test_calculate_payment_quote_receipt_not_found(
 def test_add_payment_success(
     receipt_service: ReceiptService,
     mock_receipt_repository: Mock,
-    mock_payment_repository: Mock,
     mock_exchange_service: Mock,
 ) -> None:
-    """Test successfully adding a payment to a receipt."""
+    """Test that a payment is converted and recorded in one repository call."""
     # Arrange
     receipt_id = uuid.uuid4()
-    amount = 100.0
-    currency_name = "GEL"
-
-    # Mock receipt before payment
-    receipt = Receipt(
-        shift_id=uuid.uuid4(),
-        id=receipt_id,
-        status=ReceiptStatus.OPEN,
-        total=100.0,
-    )
-    mock_receipt_repository.get.return_value = receipt
-
-    # Mock exchange rate
-    mock_exchange_service.get_exchange_rate.return_value = 1.0  # 1:1 for GEL
-
-    # Mock payment creation
-    payment_id = uuid.uuid4()
-    payment = Payment(
-        id=payment_id,
-        receipt_id=receipt_id,
-        payment_amount=amount,
-        currency=Currency.GEL,
-        total_in_gel=100.0,
-        exchange_rate=1.0,
-        status=PaymentStatus.COMPLETED,
-    )
-    mock_payment_repository.create.return_value = payment
-
-    # Mock updated receipt after payment
-    updated_receipt = Receipt(
-        shift_id=receipt.shift_id,
-        id=receipt_id,
-        status=ReceiptStatus.CLOSED,  # Closed because fully paid
-        total=100.0,
-        payments=[payment],
-    )
-    mock_receipt_repository.get.side_effect = [receipt, updated_receipt]
-    mock_receipt_repository.update_status.return_value = updated_receipt
+    receipt = Receipt(shift_id=uuid.uuid4(), id=receipt_id, total=100.0)
+    payment = receipt.settle(40.0, Currency.USD, 2.7)
+    mock_exchange_service.get_exchange_rate.return_value = 2.7
+    mock_receipt_repository.add_payment.return_value = (payment, receipt)
 
     # Act
-    result = receipt_service.add_payment(receipt_id, amount, currency_name)
+    result = receipt_service.add_payment(receipt_id, 40.0, "USD", "lane-3-0001")
 
     # Assert
-    assert result is not None
-    payment_result, receipt_result = result
-
-    assert receipt_result == updated_receipt
-    assert receipt_result.status == ReceiptStatus.CLOSED
-
-    mock_receipt_repository.get.assert_called_with(receipt_id)
-    mock_exchange_service.get_exchange_rate.assert_called_with(
-        Currency.GEL, Currency.GEL
+    assert result == (payment, receipt)
+    assert payment.status == PaymentStatus.COMPLETED
+    assert receipt.status == ReceiptStatus.CLOSED
+    mock_exchange_service.get_exchange_rate.assert_called_once_with(
+        Currency.USD, Currency.GEL
     )
-    mock_payment_repository.create.assert_called_once_with(
-        receipt_id, amount, Currency.GEL, receipt.total, 1.0
+    mock_receipt_repository.add_payment.assert_called_once_with(
+        receipt_id, 40.0, Currency.USD, 2.7, "lane-3-0001"
     )
+    mock_receipt_repository.get.assert_not_called()
 
 
-def test_add_payment_partial_payment(
-    receipt_service: ReceiptService,
-    mock_receipt_repository: Mock,
-    mock_payment_repository: Mock,
-    mock_exchange_service: Mock,
-) -> None:
-    """Test adding a partial payment (not enough to close the receipt)."""
+def test_add_payment_partial_payment() -> None:
+    """Test that a payment short of the total fails and leaves the receipt open."""
     # Arrange
-    receipt_id = uuid.uuid4()
-    amount = 50.0  # Partial payment
-    currency_name = "GEL"
-
-    # Mock receipt before payment
-    receipt = Receipt(
-        shift_id=uuid.uuid4(),
-        id=receipt_id,
-        status=ReceiptStatus.OPEN,
-        total=100.0,
-    )
-    mock_receipt_repository.get.return_value = receipt
-
-    # Mock exchange rate
-    mock_exchange_service.get_exchange_rate.return_value = 1.0  # 1:1 for GEL
-
-    # Mock payment creation
-    payment_id = uuid.uuid4()
-    payment = Payment(
-        id=payment_id,
-        receipt_id=receipt_id,
-        payment_amount=amount,
-        currency=Currency.GEL,
-        total_in_gel=50.0,
-        exchange_rate=1.0,
-        status=PaymentStatus.FAILED,
-    )
-    mock_payment_repository.create.return_value = payment
-
-    # Mock updated receipt after payment (still open)
-    updated_receipt = Receipt(
-        shift_id=receipt.shift_id,
-        id=receipt_id,
-        status=ReceiptStatus.OPEN,  # Still open because not fully paid
-        total=100.0,
-        payments=[payment],
-    )
-    mock_receipt_repository.get.side_effect = [receipt, updated_receipt]
+    receipt = Receipt(shift_id=uuid.uuid4(), total=100.0)
 
     # Act
-    result = receipt_service.add_payment(receipt_id, amount, currency_name)
+    payment = receipt.settle(99.99, Currency.GEL, 1.0)
 
     # Assert
-    assert result is not None
-    payment_result, receipt_result = result
-
-    assert receipt_result == updated_receipt
-    assert receipt_result.status == ReceiptStatus.OPEN  # Still open
-
-    mock_receipt_repository.get.assert_called_with(receipt_id)
-    mock_exchange_service.get_exchange_rate.assert_called_with(
-        Currency.GEL, Currency.GEL
-    )
-    mock_payment_repository.create.assert_called_once_with(
-        receipt_id, amount, Currency.GEL, receipt.total, 1.0
-    )
-    # Status update not called because not fully paid
-    mock_receipt_repository.update_status.assert_not_called()
+    assert payment.status == PaymentStatus.FAILED
+    assert payment.total_in_gel == 100.0
+    assert receipt.status == ReceiptStatus.OPEN
+    assert receipt.payments == [payment]
 
 
-def test_add_payment_receipt_not_found(
-    receipt_service: ReceiptService,
-    mock_receipt_repository: Mock,
-) -> None:
-    """Test adding a payment to a non-existent receipt."""
+def test_add_payment_exact_amount_closes_receipt() -> None:
+    """Test that paying exactly the total is enough."""
     # Arrange
-    receipt_id = uuid.uuid4()
-    amount = 100.0
-    currency_name = "GEL"
-
-    # Mock receipt not found
-    mock_receipt_repository.get.return_value = None
+    receipt = Receipt(shift_id=uuid.uuid4(), total=27.3)
 
     # Act
-    result = receipt_service.add_payment(receipt_id, amount, currency_name)
+    payment = receipt.settle(10.0, Currency.EUR, 2.73)
 
     # Assert
-    assert result is None
-    mock_receipt_repository.get.assert_called_once()
+    assert payment.status == PaymentStatus.COMPLETED
+    assert receipt.status == ReceiptStatus.CLOSED
 
 
 def test_add_payment_closed_receipt(
     receipt_service: ReceiptService,
     mock_receipt_repository: Mock,
+    mock_exchange_service: Mock,
 ) -> None:
     """Test adding a payment to a closed receipt."""
     # Arrange
-    receipt_id = uuid.uuid4()
-    amount = 100.0
-    currency_name = "GEL"
-
-    # Mock closed receipt
-    receipt = Receipt(
-        shift_id=uuid.uuid4(),
-        id=receipt_id,
-        status=ReceiptStatus.CLOSED,
-    )
-    mock_receipt_repository.get.return_value = receipt
+    mock_exchange_service.get_exchange_rate.return_value = 1.0
+    mock_receipt_repository.add_payment.return_value = None
 
     # Act
-    result = receipt_service.add_payment(receipt_id, amount, currency_name)
+    result = receipt_service.add_payment(uuid.uuid4(), 100.0, "GEL")
 
     # Assert
     assert result is None
-    mock_receipt_repository.get.assert_called_once()
+    mock_receipt_repository.add_payment.assert_called_once()
 
 
 def test_add_payment_invalid_currency(
@@ -657,25 +550,12 @@ def test_add_payment_invalid_currency(
     mock_receipt_repository: Mock,
 ) -> None:
     """Test adding a payment with invalid currency."""
-    # Arrange
-    receipt_id = uuid.uuid4()
-    amount = 100.0
-    currency_name = "INVALID"  # Invalid currency
-
-    # Mock receipt
-    receipt = Receipt(
-        shift_id=uuid.uuid4(),
-        id=receipt_id,
-        status=ReceiptStatus.OPEN,
-    )
-    mock_receipt_repository.get.return_value = receipt
-
     # Act
-    result = receipt_service.add_payment(receipt_id, amount, currency_name)
+    result = receipt_service.add_payment(uuid.uuid4(), 100.0, "INVALID")
 
     # Assert
     assert result is None
-    mock_receipt_repository.get.assert_called_once()
+    mock_receipt_repository.add_payment.assert_not_called()
 
 
 def test_get_receipts_by_shift(
@@ -725,3 +605,47 @@ def test_get_receipts_by_shift_not_found(
 
     assert str(shift_id) in str(exc_info.value)
     mock_shift_repository.get_by_id.assert_called_once_with(shift_id)
+
+
+def test_scan_product_adds_line_by_code(
+    receipt_service: ReceiptService,
+    mock_receipt_repository: Mock,
+    mock_product_repository: Mock,
+    mock_discount_service: Mock,
+) -> None:
+    """Test that scanning a barcode adds its product at the catalog price."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    product = Product(id=uuid.uuid4(), name="Water", price=1.2)
+    mock_receipt_repository.get.return_value = receipt
+    mock_product_repository.get_by_code.return_value = product
+    mock_discount_service.apply_discounts.side_effect = lambda r: r
+    mock_receipt_repository.update.side_effect = lambda _, r: r
+
+    # Act
+    result = receipt_service.scan_product(receipt.id, "4860001234567", 2)
+
+    # Assert
+    assert result is not None
+    assert [(i.product_id, i.quantity, i.unit_price) for i in result.products] == [
+        (product.id, 2, 1.2)
+    ]
+    mock_product_repository.get_by_code.assert_called_once_with("4860001234567")
+    mock_product_repository.get_by_id.assert_not_called()
+
+
+def test_scan_unknown_code(
+    receipt_service: ReceiptService,
+    mock_receipt_repository: Mock,
+    mock_product_repository: Mock,
+) -> None:
+    """Test that an unknown barcode is reported rather than ignored."""
+    # Arrange
+    receipt = Receipt(shift_id=uuid.uuid4())
+    mock_receipt_repository.get.return_value = receipt
+    mock_product_repository.get_by_code.return_value = None
+
+    # Act / Assert
+    with pytest.raises(ProductCodeNotFoundError):
+        receipt_service.scan_product(receipt.id, "0000000000000")
+    mock_receipt_repository.update.assert_not_called()
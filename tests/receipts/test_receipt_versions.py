@@ -0,0 +1,116 @@
+from typing import List
+from unittest.mock import Mock
+from uuid import UUID
+
+import pytest
+
+from core.models.errors import ReceiptVersionConflictError
+from core.models.receipt import Receipt, ReceiptItem, ReceiptStatus
+from core.models.repositories.campaign_repository import CampaignRepository
+from core.services.discount_service import DiscountService
+from core.services.exchange_rate_service import ExchangeRateService
+from core.services.receipt_service import UPDATE_ATTEMPTS, ReceiptService
+from infra.db.database import Database
+from infra.repositories.payment_sqlite_repository import SQLitePaymentRepository
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
+
+
+class InterleavingReceiptRepository(SQLiteReceiptRepository):
+    """Lets another request store a change right after each read."""
+
+    def __init__(self, db: Database, interleave: int) -> None:
+        super().__init__(db)
+        self.interleave = interleave
+        self.reads = 0
+        self.other_request = SQLiteReceiptRepository(db)
+
+    def get(self, receipt_id: UUID) -> Receipt:
+        receipt = super().get(receipt_id)
+        self.reads += 1
+        if self.reads <= self.interleave:
+            other = self.other_request.get(receipt_id)
+            other.products.append(ReceiptItem(other.products[0].product_id, 1, 1.0))
+            self.other_request.update(receipt_id, other)
+        return receipt
+
+
+def _service(db: Database, receipts: SQLiteReceiptRepository) -> ReceiptService:
+    products = SQLiteProductRepository(db)
+    campaigns = Mock(spec=CampaignRepository)
+    campaigns.get_active.return_value = []
+    campaigns.version.return_value = 0
+    return ReceiptService(
+        receipts,
+        products,
+        SQLiteShiftRepository(db),
+        DiscountService(campaigns, products),
+        Mock(spec=ExchangeRateService),
+        SQLitePaymentRepository(db),
+    )
+
+
+def _receipt_with_line(db: Database) -> Receipt:
+    product = SQLiteProductRepository(db).create("Tea", 1.0)
+    receipts = SQLiteReceiptRepository(db)
+    receipt = receipts.create(SQLiteShiftRepository(db).create().id)
+    receipt.add_item(ReceiptItem(product_id=product.id, quantity=1, unit_price=1.0))
+    receipt.recalculate_totals()
+    return receipts.update(receipt.id, receipt)
+
+
+def test_stale_update_is_refused(db: Database) -> None:
+    """Test that a write based on an old version changes nothing."""
+    # Arrange
+    repository = SQLiteReceiptRepository(db)
+    receipt = _receipt_with_line(db)
+    first, second = repository.get(receipt.id), repository.get(receipt.id)
+    first.products[0].set_quantity(5)
+    first.recalculate_totals()
+    repository.update(receipt.id, first)
+
+    # Act
+    second.products[0].set_quantity(9)
+    second.recalculate_totals()
+    with pytest.raises(ReceiptVersionConflictError):
+        repository.update(receipt.id, second)
+    with pytest.raises(ReceiptVersionConflictError):
+        repository.update_status(receipt.id, ReceiptStatus.CLOSED, second.version)
+
+    # Assert
+    stored = repository.get(receipt.id)
+    assert stored.products[0].quantity == 5
+    assert stored.status == ReceiptStatus.OPEN
+    assert stored.version == first.version == receipt.version + 1
+
+
+def test_service_retries_after_conflict(db: Database) -> None:
+    """Test that a scan racing another write is reapplied, not lost."""
+    # Arrange
+    receipt = _receipt_with_line(db)
+    receipts = InterleavingReceiptRepository(db, interleave=UPDATE_ATTEMPTS - 1)
+    service = _service(db, receipts)
+
+    # Act
+    result = service.add_product(receipt.id, receipt.products[0].product_id, 2)
+
+    # Assert
+    assert result is not None
+    assert receipts.reads == UPDATE_ATTEMPTS
+    quantities: List[int] = [item.quantity for item in result.products]
+    # Both racing writes landed, and then ours on top of them
+    assert quantities == [1 + 2, 1, 1]
+
+
+def test_service_gives_up_after_bounded_retries(db: Database) -> None:
+    """Test that endless contention is reported instead of retried forever."""
+    # Arrange
+    receipt = _receipt_with_line(db)
+    receipts = InterleavingReceiptRepository(db, interleave=UPDATE_ATTEMPTS)
+    service = _service(db, receipts)
+
+    # Act / Assert
+    with pytest.raises(ReceiptVersionConflictError):
+        service.add_product(receipt.id, receipt.products[0].product_id, 2)
+    assert receipts.reads == UPDATE_ATTEMPTS
@@ -0,0 +1,213 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Iterator, List, Optional
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from starlette import status
+
+from core.models.report import SalesReport
+from core.services.report_service import ReportService
+from infra.api.app import ROUTE_DEADLINES, app
+from infra.db.database import Database
+from infra.db.deadline import (
+    QueryTimeoutError,
+    deadline,
+    each_with_deadline,
+    remaining,
+)
+from runner.dependencies import get_report_service
+
+# Counts forever; only ever run under a deadline
+RUNAWAY = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n)"
+    " SELECT COUNT(*) FROM n"
+)
+
+
+@pytest.fixture
+def mock_report_service() -> Mock:
+    """Return a mock report service."""
+    return Mock(spec=ReportService)
+
+
+@pytest.fixture
+def app_client(mock_report_service: Mock) -> Generator[TestClient, None, None]:
+    """The application, with its route deadlines, over a mocked service."""
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_report_service] = lambda: mock_report_service
+    yield TestClient(app)
+    app.dependency_overrides = previous
+
+
+def test_runaway_query_stops_at_deadline(db: Database) -> None:
+    """Test that a query running past the deadline is interrupted."""
+    # Arrange
+    started = time.monotonic()
+
+    # Act
+    with pytest.raises(QueryTimeoutError) as error:
+        with deadline(0.05), db.get_connection() as conn:
+            conn.execute(RUNAWAY).fetchone()
+
+    # Assert
+    assert error.value.started
+    assert time.monotonic() - started < 1.0
+
+
+def test_runaway_report_read_stops_at_deadline(db: Database) -> None:
+    """Test that report connections honor the deadline too."""
+    with pytest.raises(QueryTimeoutError):
+        with deadline(0.05), db.read_only() as conn:
+            conn.execute(RUNAWAY).fetchone()
+
+
+def test_expired_deadline_refuses_to_start(db: Database) -> None:
+    """Test that no query starts once the deadline has passed."""
+    with deadline(0.0):
+        with pytest.raises(QueryTimeoutError) as error:
+            with db.get_connection():
+                pass
+
+    assert not error.value.started
+
+
+def test_queries_within_deadline_run_normally(db: Database) -> None:
+    """Test that a deadline does not disturb queries that finish in time."""
+    with deadline(5.0), db.get_connection() as conn:
+        count = conn.execute(RUNAWAY.replace("FROM n)", "FROM n LIMIT 9999)"))
+        assert count.fetchone()[0] == 9_999
+    assert remaining() is None
+
+
+def test_nested_deadline_keeps_the_earliest() -> None:
+    """Test that an inner block cannot extend the deadline it runs under."""
+    with deadline(0.5):
+        with deadline(60.0):
+            inner = remaining()
+
+    assert inner is not None and inner <= 0.5
+
+
+def test_each_item_gets_its_own_deadline() -> None:
+    """Test that a stream is bounded per item, past the deadline around it."""
+
+    # Arrange
+    def slow_items() -> Iterator[Optional[float]]:
+        for _ in range(4):
+            time.sleep(0.03)
+            yield remaining()
+
+    # Act
+    with deadline(0.05):
+        budgets = list(each_with_deadline(slow_items(), 1.0))
+        after = remaining()
+
+    # Assert
+    assert all(b is not None and 0.9 < b <= 1.0 for b in budgets)
+    assert after == 0.0
+
+
+def test_deadline_follows_copied_context(db: Database) -> None:
+    """Test that work handed to another thread keeps the request deadline."""
+
+    # Arrange
+    def runaway() -> None:
+        with db.get_connection() as conn:
+            conn.execute(RUNAWAY).fetchone()
+
+    # Act
+    with deadline(0.05), ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(contextvars.copy_context().run, runaway)
+
+        # Assert
+        with pytest.raises(QueryTimeoutError):
+            future.result(timeout=5)
+
+
+def test_report_routes_get_the_report_deadline(
+    app_client: TestClient, mock_report_service: Mock
+) -> None:
+    """Test that report routes run under the reports route deadline."""
+    # Arrange
+    budgets: List[Optional[float]] = []
+
+    def report() -> SalesReport:
+        budgets.append(remaining())
+        return SalesReport(0, 0, {}, 0.0)
+
+    mock_report_service.generate_sales_report.side_effect = report
+
+    # Act
+    response = app_client.get("/sales")
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert budgets[0] is not None
+    assert ROUTE_DEADLINES["checkout"] < budgets[0] <= ROUTE_DEADLINES["reports"]
+
+
+def test_deadline_ends_with_the_request(mock_report_service: Mock) -> None:
+    """Test that sequential requests from one task do not share a deadline."""
+    # Arrange
+    budgets: List[Optional[float]] = []
+    between: List[Optional[float]] = []
+
+    def report() -> SalesReport:
+        budgets.append(remaining())
+        return SalesReport(0, 0, {}, 0.0)
+
+    mock_report_service.generate_sales_report.side_effect = report
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_report_service] = lambda: mock_report_service
+
+    async def requests() -> List[int]:
+        # In process, as the load test runs it: every request in this task
+        transport = httpx.ASGITransport(app=app)
+        statuses = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://pos") as c:
+            for _ in range(3):
+                statuses.append((await c.get("/sales")).status_code)
+                between.append(remaining())
+        return statuses
+
+    # Act
+    try:
+        statuses = asyncio.run(requests())
+    finally:
+        app.dependency_overrides = previous
+
+    # Assert
+    assert statuses == [status.HTTP_200_OK] * 3
+    assert between == [None, None, None]
+    assert all(b is not None for b in budgets)
+
+
+@pytest.mark.parametrize(
+    "started, status_code, error_code",
+    [
+        (True, status.HTTP_504_GATEWAY_TIMEOUT, "QUERY_TIMEOUT"),
+        (False, status.HTTP_503_SERVICE_UNAVAILABLE, "DEADLINE_EXCEEDED"),
+    ],
+)
+def test_query_timeout_responses(
+    app_client: TestClient,
+    mock_report_service: Mock,
+    started: bool,
+    status_code: int,
+    error_code: str,
+) -> None:
+    """Test that query timeouts are mapped to 504, or 503 if never started."""
+    # Arrange
+    mock_report_service.generate_sales_report.side_effect = QueryTimeoutError(started)
+
+    # Act
+    response = app_client.get("/sales")
+
+    # Assert
+    assert response.status_code == status_code
+    assert response.json()["detail"]["error_code"] == error_code
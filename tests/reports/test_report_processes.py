@@ -0,0 +1,173 @@
+import sqlite3
+import threading
+import time
+from concurrent.futures import CancelledError, Future
+from typing import Any, Generator
+from unittest.mock import Mock
+from uuid import UUID, uuid4
+
+import pytest
+
+from core.models.errors import ReportTimeoutError
+from core.models.receipt import Currency, ReceiptStatus
+from infra.db.database import Database
+from infra.repositories import report_process_repository as workers
+from infra.repositories.report_process_repository import (
+    ProcessReportRepository,
+    ReportJob,
+)
+from infra.repositories.report_sqlite_repository import SQLiteReportRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
+
+ITEMS = 20_000
+
+
+def _seed(db: Database) -> UUID:
+    """One closed shift's worth of sales, large enough to interrupt."""
+    shift_id, receipt_id, product_id = uuid4(), uuid4(), uuid4()
+    with db.transaction() as conn:
+        conn.execute(
+            "INSERT INTO shifts (id, status, created_at) VALUES (?, 'open', 'now')",
+            (shift_id.bytes,),
+        )
+        conn.execute(
+            "INSERT INTO products (id, name, price) VALUES (?, 'Tea', 150)",
+            (product_id.bytes,),
+        )
+        conn.execute(
+            "INSERT INTO receipts (id, shift_id, status, subtotal, total)"
+            " VALUES (?, ?, ?, 150, 150)",
+            (receipt_id.bytes, shift_id.bytes, ReceiptStatus.CLOSED.value),
+        )
+        conn.executemany(
+            "INSERT INTO receipt_items (id, receipt_id, product_id, quantity,"
+            " unit_price, total_price, final_price) VALUES (?, ?, ?, 1, 150, 150, 150)",
+            ((uuid4().bytes, receipt_id.bytes, product_id.bytes) for _ in range(ITEMS)),
+        )
+        conn.execute(
+            "INSERT INTO payments (id, receipt_id, payment_amount, currency,"
+            " total_in_gel, exchange_rate, status)"
+            " VALUES (?, ?, 3000000, ?, 3000000, 1.0, 'completed')",
+            (uuid4().bytes, receipt_id.bytes, Currency.GEL.value),
+        )
+    return shift_id
+
+
+@pytest.fixture
+def worker(db: Database, monkeypatch: pytest.MonkeyPatch) -> Generator[Any, None, None]:
+    """This process set up as a report worker, with one cancellation flag."""
+    monkeypatch.setattr(workers, "_connection", None)
+    monkeypatch.setattr(workers, "_cancelled", None)
+    flags = bytearray(1)
+    workers._start_worker(db.db_path, flags)
+    yield flags
+    assert workers._connection is not None
+    workers._connection.close()
+
+
+def test_reports_from_worker_processes(db: Database) -> None:
+    """Test that worker processes return the same reports as in-process."""
+    # Arrange
+    shift_id = _seed(db)
+    shifts = SQLiteShiftRepository(db)
+    local = SQLiteReportRepository(db, None, shifts)  # type: ignore[arg-type]
+    remote = ProcessReportRepository(db.db_path, shifts, processes=1)
+
+    # Act
+    try:
+        remote.warm_up()
+        shift_report = remote.generate_shift_report(shift_id)
+        sales_report = remote.generate_sales_report()
+    finally:
+        remote.close()
+
+    # Assert
+    assert shift_report == local.generate_shift_report(shift_id)
+    assert sales_report == local.generate_sales_report()
+    assert shift_report.items_sold[0].quantity == ITEMS
+
+
+def test_worker_stops_at_deadline(db: Database, worker: Any) -> None:
+    """Test that a worker interrupts a report that runs out of time."""
+    # Arrange
+    shift_id = _seed(db)
+
+    # Act & Assert
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        workers._run_report("shift", 0, 0.0, shift_id)
+    assert workers._run_report("shift", 0, 60.0, shift_id).receipt_count == 1
+
+
+def test_worker_stops_when_flagged(db: Database, worker: Any) -> None:
+    """Test that raising a report's flag interrupts it in the worker."""
+    # Arrange
+    _seed(db)
+    worker[0] = 1
+
+    # Act & Assert
+    with pytest.raises(sqlite3.OperationalError, match="interrupted"):
+        workers._run_report("sales", 0, 60.0)
+
+
+def test_job_timeout_cancels_report() -> None:
+    """Test that a report not done in time is cancelled and reported as 504."""
+    # Arrange
+    future: Future[Any] = Future()
+    interrupted = []
+    job = ReportJob("sales", future, lambda: interrupted.append(True))
+    future.set_running_or_notify_cancel()
+
+    # Act
+    with pytest.raises(ReportTimeoutError) as error:
+        job.result(timeout=0.01)
+
+    # Assert
+    assert error.value.status_code == 504
+    assert interrupted == [True]
+    assert job.cancel_requested
+
+
+def test_interrupted_job_after_cancel() -> None:
+    """Test that a report interrupted on request raises CancelledError."""
+    # Arrange
+    future: Future[Any] = Future()
+    job = ReportJob("sales", future, lambda: None)
+    future.set_running_or_notify_cancel()
+
+    # Act
+    job.cancel()
+    future.set_exception(sqlite3.OperationalError("interrupted"))
+
+    # Assert
+    with pytest.raises(CancelledError):
+        job.result()
+
+
+def test_slot_wait_counts_against_the_report_timeout(db: Database) -> None:
+    """Test that a report waiting for a slot gets only the time left."""
+    # Arrange
+    repository = ProcessReportRepository(
+        db.db_path, SQLiteShiftRepository(db), timeout=0.3
+    )
+    repository.close()
+    future: Future[Any] = Future()
+    repository._executor = Mock()
+    repository._executor.submit.return_value = future
+    # Finishes late, so a job waiting past its deadline fails rather than hangs
+    late = threading.Timer(1.0, future.set_result, (None,))
+    late.start()
+    slots = [repository._free_slots.get() for _ in range(workers.MAX_PENDING_REPORTS)]
+    threading.Timer(0.2, repository._release, (slots[0],)).start()
+    started = time.monotonic()
+
+    # Act
+    with pytest.raises(ReportTimeoutError):
+        repository.submit("sales").result()
+
+    # Assert
+    elapsed = time.monotonic() - started
+    late.cancel()
+    assert future.cancelled()
+    assert 0.2 <= elapsed < 0.4
+    worker_timeout = repository._executor.submit.call_args.args[3]
+    assert worker_timeout <= 0.1
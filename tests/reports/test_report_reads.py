@@ -0,0 +1,77 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List
+from uuid import uuid4
+
+import pytest
+
+from infra.db.contention import ContentionPolicy
+from infra.db.database import Database
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+
+
+def test_database_uses_wal(db: Database) -> None:
+    """Test that the database is switched to WAL."""
+    with db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_read_only_connection_cannot_write(db: Database) -> None:
+    """Test that report connections are opened read-only."""
+    with db.read_only() as conn:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("DELETE FROM receipts")
+
+
+def test_open_report_read_does_not_block_writes(tmp_path: Path) -> None:
+    """Test that a write commits while a report holds a read snapshot."""
+    # Arrange
+    no_waiting = ContentionPolicy(busy_timeout=0, retries=0)
+    db = Database(str(tmp_path / "pos.db"), contention=no_waiting)
+    receipts = SQLiteReceiptRepository(db)
+
+    with db.read_only() as conn:
+        conn.execute("BEGIN")
+        before = conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+
+        # Act
+        receipts.create(uuid4())
+        during = conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+
+    # Assert
+    with db.read_only() as conn:
+        after = conn.execute("SELECT COUNT(*) FROM receipts").fetchone()[0]
+    assert (before, during, after) == (0, 0, 1)
+
+
+def test_read_pool_limits_concurrent_readers(tmp_path: Path) -> None:
+    """Test that readers past the pool size wait and connections are reused."""
+    # Arrange
+    db = Database(str(tmp_path / "pos.db"), readers=2)
+    active: List[int] = [0]
+    peak: List[int] = [0]
+    connections = set()
+    guard = threading.Lock()
+
+    def report() -> None:
+        with db.read_only() as conn:
+            with guard:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                connections.add(id(conn))
+            time.sleep(0.02)
+            with guard:
+                active[0] -= 1
+
+    # Act
+    threads = [threading.Thread(target=report) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert peak[0] == 2
+    assert len(connections) == 2
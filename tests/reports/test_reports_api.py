@@ -18,6 +18,7 @@ def mock_db() -> Mock:
     mock_connection.__enter__.return_value = mock_connection
     mock_connection.cursor.return_value = mock_cursor
     mock_db.get_connection.return_value = mock_connection
+    mock_db.read_only.return_value = mock_connection
     return mock_db
 
 
@@ -44,12 +45,14 @@ def report_repository(
 
 
 def test_generate_shift_report_no_receipts(
-    report_repository: SQLiteReportRepository, mock_receipt_repository: Mock
+    report_repository: SQLiteReportRepository, mock_db: Mock
 ) -> None:
     """Test generating a shift report with no receipts."""
     # Arrange
     shift_id = uuid.uuid4()
-    mock_receipt_repository.get_receipts_by_shift.return_value = []
+    mock_cursor = mock_db.get_connection().__enter__().cursor()
+    mock_cursor.fetchone.return_value = {"receipt_count": 0}
+    mock_cursor.fetchall.return_value = []
 
     # Act & Assert
     shift_report = report_repository.generate_shift_report(shift_id)
@@ -69,12 +72,12 @@ def test_generate_sales_report(
     mock_cursor.fetchone.side_effect = [
         {"total_items": 100},  # Total items sold
         {"receipt_count": 30},  # Total receipts
-        {"total_gel": 2500.0},  # Total revenue in GEL
+        {"total_gel": 250000},  # Total revenue in GEL
     ]
 
     mock_cursor.fetchall.return_value = [
-        {"currency": "GEL", "total_amount": 2000.0},
-        {"currency": "USD", "total_amount": 500.0},
+        {"currency": "GEL", "total_amount": 200000},
+        {"currency": "USD", "total_amount": 50000},
     ]
 
     # Act
@@ -7,13 +7,16 @@ import pytest
 from core.models.receipt import (
     Currency,
     ItemSold,
+    ReceiptItem,
     RevenueByCurrency,
 )
 from core.models.report import SalesReport, ShiftReport
 from infra.api.schemas.shift import ShiftUpdate
 from infra.db.database import Database
+from infra.repositories.product_sqlite_repository import SQLiteProductRepository
 from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
 from infra.repositories.report_sqlite_repository import SQLiteReportRepository
+from infra.repositories.shift_sqlite_repository import SQLiteShiftRepository
 
 # Instead of importing the fixture, create your own mock function
 # from tests.receipts.test_receipt_service import mock_shift_repository
@@ -28,6 +31,7 @@ def mock_db() -> Mock:
     mock_connection.__enter__.return_value = mock_connection
     mock_connection.cursor.return_value = mock_cursor
     mock_db.get_connection.return_value = mock_connection
+    mock_db.read_only.return_value = mock_connection
     return mock_db
 
 
@@ -56,12 +60,14 @@ def report_repository(
 
 
 def test_generate_shift_report_no_receipts(
-    report_repository: SQLiteReportRepository, mock_receipt_repository: Mock
+    report_repository: SQLiteReportRepository, mock_db: Mock
 ) -> None:
     """Test generating a shift report with no receipts."""
     # Arrange
     shift_id = uuid.uuid4()
-    mock_receipt_repository.get_receipts_by_shift.return_value = []
+    mock_cursor = mock_db.get_connection().__enter__().cursor()
+    mock_cursor.fetchone.return_value = {"receipt_count": 0}
+    mock_cursor.fetchall.return_value = []
 
     report = report_repository.generate_shift_report(shift_id)
 
@@ -81,12 +87,12 @@ def test_generate_sales_report(
     mock_cursor.fetchone.side_effect = [
         {"total_items": 100},  # Total items sold
         {"receipt_count": 30},  # Total receipts
-        {"total_gel": 2500.0},  # Total revenue in GEL
+        {"total_gel": 250000},  # Total revenue in GEL
     ]
 
     mock_cursor.fetchall.return_value = [
-        {"currency": "GEL", "total_amount": 2000.0},
-        {"currency": "USD", "total_amount": 500.0},
+        {"currency": "GEL", "total_amount": 200000},
+        {"currency": "USD", "total_amount": 50000},
     ]
 
     # Act
@@ -173,3 +179,32 @@ def test_generate_z_report(
             assert z_report.receipt_count == 5
             assert len(z_report.items_sold) == 2
             assert len(z_report.revenue_by_currency) == 2
+
+
+@pytest.mark.parametrize("receipt_count", [1, 10])
+def test_generate_shift_report_query_budget(db: Database, receipt_count: int) -> None:
+    """Test that the X-report runs a fixed number of queries."""
+    # Arrange
+    receipts = SQLiteReceiptRepository(db)
+    shifts = SQLiteShiftRepository(db)
+    product = SQLiteProductRepository(db).create("Bread", 1.5)
+    shift_id = shifts.create().id
+    for _ in range(receipt_count):
+        receipt = receipts.create(shift_id)
+        receipt.products.append(
+            ReceiptItem(product_id=product.id, quantity=2, unit_price=product.price)
+        )
+        receipt.recalculate_totals()
+        receipts.update(receipt.id, receipt)
+    report_repository = SQLiteReportRepository(db, receipts, shifts)
+
+    # Act
+    with db.count_queries() as queries:
+        report = report_repository.generate_shift_report(shift_id)
+
+    # Assert
+    assert report.receipt_count == receipt_count
+    assert report.items_sold == [
+        ItemSold(product_id=product.id, quantity=2 * receipt_count)
+    ]
+    assert queries.count <= 3
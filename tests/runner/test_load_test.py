@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from pathlib import Path
+
+from infra.api.app import app
+from runner.load_test import STEPS, LoadTestConfig, percentile, run_load_test
+
+
+def test_percentile_nearest_rank() -> None:
+    """Test that percentiles use the nearest-rank method."""
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 50) == 0.0
+
+
+def test_run_load_test_in_process(tmp_path: Path) -> None:
+    """Test a small in-process run records every step of the checkout flow."""
+    # Arrange
+    logging.getLogger().setLevel(logging.WARNING)
+    config = LoadTestConfig(
+        lanes=2,
+        receipts_per_lane=2,
+        items_per_receipt=2,
+        catalog_size=5,
+        campaign_count=3,
+        db_path=str(tmp_path / "load.db"),
+    )
+
+    # Act
+    result = asyncio.run(run_load_test(config))
+
+    # Assert
+    assert set(result.steps) == set(STEPS)
+    assert len(result.steps["open_shift"].latencies) == 2
+    assert len(result.steps["create_receipt"].latencies) == 4
+    assert len(result.steps["scan"].latencies) == 8
+    assert len(result.steps["z_report"].latencies) == 2
+    assert result.to_dict()["requests_per_s"] > 0
+    assert app.dependency_overrides == {}
@@ -0,0 +1,77 @@
+import sqlite3
+from pathlib import Path
+
+from core.models.receipt import ReceiptStatus
+from infra.db.database import Database, deserialize_id
+from infra.repositories.receipt_sqlite_repository import SQLiteReceiptRepository
+from runner.seed import SeedConfig, seed_store
+
+
+def _small_config(seed: int = 7) -> SeedConfig:
+    return SeedConfig(
+        products=50,
+        campaigns=30,
+        days=2,
+        shifts_per_day=2,
+        receipts_per_shift=10,
+        batch_size=16,
+        seed=seed,
+    )
+
+
+def _dump(db_path: Path) -> list[str]:
+    with sqlite3.connect(db_path) as conn:
+        return list(conn.iterdump())
+
+
+def test_seed_store_counts(tmp_path: Path) -> None:
+    """Test that the seeder writes the configured number of rows."""
+    # Arrange
+    db_path = tmp_path / "seed.db"
+
+    # Act
+    summary = seed_store(str(db_path), _small_config())
+
+    # Assert
+    assert summary.shifts == 4
+    assert summary.receipts == 40
+    assert summary.payments == 40
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 50
+        assert conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0] == 30
+        types = {row[0] for row in conn.execute("SELECT campaign_type FROM campaigns")}
+        assert types == {"discount", "buy_n_get_n", "combo"}
+        items = conn.execute("SELECT COUNT(*) FROM receipt_items").fetchone()[0]
+        assert items == summary.receipt_items
+
+
+def test_seed_store_is_deterministic(tmp_path: Path) -> None:
+    """Test that the same seed produces identical databases."""
+    # Act
+    seed_store(str(tmp_path / "a.db"), _small_config(seed=1))
+    seed_store(str(tmp_path / "b.db"), _small_config(seed=1))
+    seed_store(str(tmp_path / "c.db"), _small_config(seed=2))
+
+    # Assert
+    assert _dump(tmp_path / "a.db") == _dump(tmp_path / "b.db")
+    assert _dump(tmp_path / "a.db") != _dump(tmp_path / "c.db")
+
+
+def test_seeded_receipts_load_through_repository(tmp_path: Path) -> None:
+    """Test that seeded rows match the format the repositories read."""
+    # Arrange
+    db_path = tmp_path / "seed.db"
+    seed_store(str(db_path), _small_config())
+    with sqlite3.connect(db_path) as conn:
+        receipt_id = conn.execute("SELECT id FROM receipts LIMIT 1").fetchone()[0]
+
+    # Act
+    receipt = SQLiteReceiptRepository(Database(str(db_path))).get(
+        deserialize_id(receipt_id)
+    )
+
+    # Assert
+    assert receipt.status == ReceiptStatus.CLOSED
+    assert receipt.products
+    assert len(receipt.payments) == 1
+    assert receipt.total == round(receipt.subtotal - receipt.discount_amount, 2)
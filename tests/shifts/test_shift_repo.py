@@ -46,7 +46,7 @@ def test_get_shift_by_id(
         mock_db.get_connection.return_value.__enter__.return_value.cursor.return_value
     )
     mock_cursor.fetchone.return_value = {
-        "id": str(shift_id),
+        "id": shift_id.bytes,
         "status": ShiftStatus.OPEN.value,
         "created_at": created_at.isoformat(),
         "closed_at": None,
@@ -63,7 +63,7 @@ def test_get_shift_by_id(
 
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
-        "SELECT * FROM shifts WHERE id = ?", (str(shift_id),)
+        "SELECT * FROM shifts WHERE id = ?", (shift_id.bytes,)
     )
 
 
@@ -88,7 +88,7 @@ def test_get_shift_by_id_not_found(
 
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
-        "SELECT * FROM shifts WHERE id = ?", (str(shift_id),)
+        "SELECT * FROM shifts WHERE id = ?", (shift_id.bytes,)
     )
 
 
@@ -138,7 +138,7 @@ def test_update_status_open_to_closed(
     # Check DB calls
     mock_cursor.execute.assert_called_once_with(
         "UPDATE shifts SET status = ?, closed_at = ? WHERE id = ?",
-        (ShiftStatus.CLOSED.value, closed_at, str(shift_id)),
+        (ShiftStatus.CLOSED.value, closed_at, shift_id.bytes),
     )
     mock_db.get_connection.return_value.__enter__.return_value.commit.assert_called_once()
 